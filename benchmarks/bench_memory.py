@@ -0,0 +1,38 @@
+# Memory held by parsed battle logs, with and without the ROYALEAPI_SLOTS build option
+# Run with: python -m benchmarks.bench_memory [battle count]
+import os
+import subprocess
+import sys
+import tracemalloc
+
+from benchmarks import fixtures
+
+
+def measure(count: int) -> int:
+    from royaleapi.models import Battle
+    payload = [fixtures.battle(i) for i in range(count)]
+    tracemalloc.start()
+    battles = Battle.de_list(payload, None)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(battles) == count
+    return size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    results = {}
+    for use_slots in ("0", "1"):  # The option is read at import time, so each run needs its own process
+        env = {**os.environ, "ROYALEAPI_SLOTS": use_slots}
+        output = subprocess.run([sys.executable, "-c", f"from benchmarks.bench_memory import measure; "
+                                                       f"print(measure({count}))"],
+                                env=env, stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+        results[use_slots] = int(output)
+    print(f"{count} battles ({count * 2} participants, {count * 16} cards)")
+    print(f"{'__dict__ models':<20}{results['0'] / 2 ** 20:>10.1f} MiB{results['0'] / count:>10.0f} B/battle")
+    print(f"{'__slots__ models':<20}{results['1'] / 2 ** 20:>10.1f} MiB{results['1'] / count:>10.0f} B/battle")
+    print(f"reduction: {1 - results['1'] / results['0']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
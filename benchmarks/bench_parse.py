@@ -0,0 +1,54 @@
+# Model parsing speed of the compiled deserializers against the older parsing paths
+# Run with: python -m benchmarks.bench_parse
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+from royaleapi import utils
+from royaleapi.models import base, Battle, Clan, Player
+from benchmarks import fixtures
+from benchmarks.timer import bench
+
+CASES = {
+    "Player.de_json (98 cards)": (lambda data: Player.de_json(data, None), fixtures.player()),
+    "Clan.de_json (50 members)": (lambda data: Clan.de_json(data, None), fixtures.clan()),
+    "Battle.de_list (25 battles)": (lambda data: Battle.de_list(data, None), fixtures.battle_log()),
+    "Player.de_list (200 leaderboard)": (lambda data: Player.de_list(data, None), fixtures.leaderboard()),
+}
+
+
+def _init_deserialize(cls: type, data: Dict[str, Any], client: Any, aliases: Dict[str, str] = None) -> Any:
+    # How models were built before the deserializers were compiled: rename into a new dict, then cls(**data)
+    aliases = cls._aliases if aliases is None else aliases
+    data = {aliases.get(k, k): v for k, v in base.CRObject.de_json(data, client).items() if k not in cls._ignored_keys}
+    if "client" in cls.__dataclass_fields__:
+        data["client"] = client
+    return cls(**data)
+
+
+@contextmanager
+def legacy_parsing(use_regex: bool) -> Iterator[None]:
+    compiled = base.CRObject.__dict__["_deserialize"]
+    base.CRObject._deserialize = classmethod(_init_deserialize)
+    if use_regex:
+        base.camel_to_snake = utils._camel_to_snake
+    try:
+        yield
+    finally:
+        base.CRObject._deserialize = compiled
+        base.camel_to_snake = utils.camel_to_snake
+
+
+def main() -> None:
+    print(f"{'case':<36}{'regex + __init__':>18}{'table + __init__':>18}{'compiled':>12}{'speedup':>9}")
+    for name, (case, payload) in CASES.items():
+        with legacy_parsing(use_regex=True):
+            regex_time = bench(lambda: case(payload))
+        with legacy_parsing(use_regex=False):
+            table_time = bench(lambda: case(payload))
+        compiled_time = bench(lambda: case(payload))
+        print(f"{name:<36}{regex_time * 1e6:>15.1f} us{table_time * 1e6:>15.1f} us{compiled_time * 1e6:>9.1f} us"
+              f"{regex_time / compiled_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
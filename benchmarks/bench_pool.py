@@ -0,0 +1,43 @@
+# Requests per second from many threads sharing one client, at several connection pool sizes
+# Run with: python -m benchmarks.bench_pool [threads] [requests per thread]
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from royaleapi import RoyaleAPIClient
+from benchmarks import fixtures
+from benchmarks.server import StandInServer
+
+POOL_SIZES = (1, 4, 8, 16, 32)
+
+
+def run(url: str, threads: int, count: int, pool_size: int, thread_safe: bool) -> float:
+    with RoyaleAPIClient("key", api_base_url=url, max_connections_per_host=pool_size,
+                         thread_safe=thread_safe) as client:
+        def work(n: int) -> None:
+            for i in range(count):  # A small response, and a different tag each time so no lookups are shared
+                client.get_clan_tracking(fixtures.tag(n * count + i), use_cache=False)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            list(executor.map(work, range(threads)))
+        return threads * count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print(f"{threads} threads, {count} requests each, 2 ms server latency")
+    print(f"{'pool size':<12}{'mode':<14}{'requests/s':>12}{'connections':>14}")
+    with StandInServer(latency=0.002) as server:
+        for pool_size in POOL_SIZES:
+            for thread_safe in (False, True):
+                before = server.stats()["connections"]
+                rate = run(server.url, threads, count, pool_size, thread_safe)
+                connections = server.stats()["connections"] - before - 1  # The stats request has its own
+                mode = "thread-safe" if thread_safe else "default"
+                print(f"{pool_size:<12}{mode:<14}{rate:>12.0f}{connections:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Synthetic payloads shaped like RoyaleAPI responses, sized like the big real-world ones
+from typing import List, Dict, Any
+
+from royaleapi.constants import VALID_TAG_CHARS
+
+CARD_COUNT = 98
+RARITIES = ("Common", "Rare", "Epic", "Legendary")
+CARD_TYPES = ("Troop", "Spell", "Building")
+ROLES = ("leader", "coLeader", "elder", "member")
+
+
+def tag(n: int, length: int = 8) -> str:
+    chars = []
+    for _ in range(length):
+        n, i = divmod(n, len(VALID_TAG_CHARS))
+        chars.append(VALID_TAG_CHARS[i])
+    return "".join(chars)
+
+
+def card(n: int, owned: bool = True) -> Dict[str, Any]:
+    data = {
+        "name": f"Card {n}",
+        "rarity": RARITIES[n % len(RARITIES)],
+        "icon": f"https://royaleapi.github.io/cr-api-assets/cards-150/card-{n}.png",
+        "key": f"card-{n}",
+        "elixir": n % 9 + 1,
+        "type": CARD_TYPES[n % len(CARD_TYPES)],
+        "arena": n % 13,
+        "description": f"Description of card {n}, which is usually a full sentence or two long.",
+        "id": 26000000 + n
+    }
+    if owned:
+        data.update({
+            "level": 9,
+            "maxLevel": 13,
+            "count": 250,
+            "requiredForUpgrade": 800,
+            "leftToUpgrade": 550,
+            "minLevel": 1,
+            "displayLevel": 9,
+            "starLevel": 1
+        })
+    return data
+
+
+def deck(n: int, owned: bool = True) -> List[Dict[str, Any]]:
+    return [card((n + i * 11) % CARD_COUNT, owned) for i in range(8)]
+
+
+def arena() -> Dict[str, Any]:
+    return {"name": "Legendary Arena", "arena": "League 2", "arenaID": 54000013, "trophyLimit": 4300}
+
+
+def badge() -> Dict[str, Any]:
+    return {"name": "Flame_02", "category": "01_Symbol", "id": 16000012,
+            "image": "https://royaleapi.github.io/cr-api-assets/badges/Flame_02.png"}
+
+
+def player(n: int = 0) -> Dict[str, Any]:
+    return {
+        "tag": tag(n),
+        "name": f"Player {n}",
+        "trophies": 5400 + n,
+        "arena": arena(),
+        "rank": None,
+        "clan": {"tag": tag(n, 6), "name": "Clan", "role": "elder", "donations": 320, "donationsReceived": 240,
+                 "donationsDelta": 80, "badge": badge()},
+        "stats": {"clanCardsCollected": 250000, "tournamentCardsWon": 1200, "maxTrophies": 5600,
+                  "threeCrownWins": 1800, "cardsFound": CARD_COUNT, "favoriteCard": card(n % CARD_COUNT, False),
+                  "totalDonations": 80000, "challengeMaxWins": 12, "challengeCardsWon": 30000, "level": 13},
+        "games": {"total": 9000, "tournamentGames": 400, "wins": 4500, "warDayWins": 120, "winsPercent": 0.5,
+                  "losses": 4000, "lossesPercent": 0.44, "draws": 500, "drawsPercent": 0.06},
+        "leagueStatistics": {
+            "currentSeason": {"trophies": 5400, "bestTrophies": 5500},
+            "previousSeason": {"id": "2019-03", "trophies": 5300, "bestTrophies": 5450},
+            "bestSeason": {"id": "2018-11", "trophies": 5600}
+        },
+        "deckLink": "https://link.clashroyale.com/deck/en?deck=26000000;26000001",
+        "currentDeck": deck(n),
+        "cards": [card(i) for i in range(CARD_COUNT)],
+        "achievements": [{"name": f"Achievement {i}", "stars": 3, "value": 1000 + i, "target": 1000, "info": "Do it"}
+                         for i in range(16)]
+    }
+
+
+def member(n: int) -> Dict[str, Any]:
+    return {
+        "name": f"Member {n}",
+        "tag": tag(n),
+        "rank": n + 1,
+        "previousRank": n + 2,
+        "role": ROLES[min(n, len(ROLES) - 1)],
+        "expLevel": 13,
+        "trophies": 5400 - n,
+        "clanChestPoints": 0,
+        "arena": arena(),
+        "donations": 300 - n,
+        "donationsReceived": 200,
+        "donationsDelta": 100 - n,
+        "donationsPercent": 2.1
+    }
+
+
+def clan(n: int = 0, members: int = 50) -> Dict[str, Any]:
+    return {
+        "tag": tag(n, 6),
+        "name": f"Clan {n}",
+        "description": "Active war clan, donate and be nice.",
+        "type": "invite only",
+        "score": 52000,
+        "memberCount": members,
+        "requiredScore": 5000,
+        "donations": 12000,
+        "warTrophies": 2800,
+        "badge": badge(),
+        "location": {"name": "International", "isCountry": False, "code": "_INT"},
+        "members": [member(i) for i in range(members)],
+        "tracking": {"active": True, "available": True, "snapshotCount": 120, "legible": True}
+    }
+
+
+def battle_player(n: int) -> Dict[str, Any]:
+    return {
+        "tag": tag(n),
+        "name": f"Player {n}",
+        "crownsEarned": n % 4,
+        "startTrophies": 5400,
+        "trophyChange": 30 if n % 2 else -30,
+        "clan": {"tag": tag(n, 6), "name": "Clan", "badge": badge()},
+        "deckLink": "https://link.clashroyale.com/deck/en?deck=26000000;26000001",
+        "deck": deck(n)
+    }
+
+
+def battle(n: int) -> Dict[str, Any]:
+    return {
+        "type": "PvP",
+        "challengeType": None,
+        "mode": {"name": "Ladder", "deck": "Own", "cardLevels": "Ladder", "overtimeSeconds": 180,
+                 "players": "Player vs Player", "sameDeck": False, "id": 72000006},
+        "winCountBefore": None,
+        "utcTime": 1550000000 + n * 300,
+        "deckType": "Collection",
+        "teamSize": 1,
+        "winner": 1 if n % 2 else -1,
+        "teamCrowns": 2 if n % 2 else 0,
+        "opponentCrowns": 0 if n % 2 else 1,
+        "team": [battle_player(2 * n)],
+        "opponent": [battle_player(2 * n + 1)],
+        "arena": arena()
+    }
+
+
+def battle_log(count: int = 25) -> List[Dict[str, Any]]:
+    return [battle(i) for i in range(count)]
+
+
+def leaderboard(count: int = 200) -> List[Dict[str, Any]]:
+    return [member(i) for i in range(count)]
+
+
+def tournament(n: int = 0, players: int = 0) -> Dict[str, Any]:
+    data = {
+        "tag": tag(n),
+        "name": f"Tournament {n}",
+        "open": True,
+        "maxPlayers": 1000,
+        "currentPlayers": players,
+        "status": "inProgress",
+        "createTime": 1550000000,
+        "prepTime": 3600,
+        "startTime": 1550003600,
+        "endTime": None,
+        "duration": 7200
+    }
+    if players:
+        data.update({"description": "Open for everyone", "updatedAt": 1550004000,
+                     "members": [{"tag": tag(i), "name": f"Player {i}", "score": 100 - i, "rank": i + 1,
+                                  "clan": {"tag": tag(i, 6), "name": "Clan", "badge": badge()}}
+                                 for i in range(players)]})
+    return data
@@ -0,0 +1,146 @@
+# Local stand-in for the RoyaleAPI server, serving the fixtures over HTTP/1.1 keep-alive from its own process
+# so that it does not compete with the benchmarked client for the GIL
+import gzip
+import hashlib
+import json
+import multiprocessing
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Callable, Dict, Any, Optional
+from urllib.parse import urlparse, unquote
+
+from benchmarks import fixtures
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _route(parts: list) -> Optional[Callable[[], Any]]:
+    # Returns a function building the body for the path, or None for an unknown path
+    def each(build: Callable[[str], Any]) -> Callable[[], Any]:
+        tags = parts[1].split(",")
+        return lambda: build(tags[0]) if len(tags) == 1 else [build(tag) for tag in tags]
+
+    if parts[0] == "version":
+        return lambda: "5.0.0"
+    if parts[0] == "player" and len(parts) == 2:
+        return each(lambda tag: dict(fixtures.player(), tag=tag))
+    if parts[0] == "player" and parts[-1] == "battle":
+        return fixtures.battle_log
+    if parts[0] == "clan" and len(parts) == 2:
+        return each(lambda tag: dict(fixtures.clan(), tag=tag))
+    if parts[0] == "clan" and parts[-1] == "tracking":
+        return each(lambda tag: {"tag": tag, "active": True, "available": True, "snapshotCount": 3})
+    if parts[0] == "clan" and parts[-1] == "battle":
+        return fixtures.battle_log
+    if parts[0] == "top" and parts[1] == "player":
+        return fixtures.leaderboard
+    if parts[0] == "tournament" and parts[1] == "known":
+        return lambda: [fixtures.tournament(i) for i in range(100)]
+    if parts[0] == "popular" and parts[1] == "player":
+        return fixtures.leaderboard
+    return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    disable_nagle_algorithm = True  # Headers and body are written separately, which would wait for delayed ACKs
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stats["connections"] += 1
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        path = unquote(urlparse(self.path).path).strip("/")
+        if path == "_stats":
+            self._send(json.dumps(self.server.stats).encode())
+            return
+        self.server.stats["requests"] += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = self.server.body(path)
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.stats["not_modified"] += 1
+            self._send(b"", status=304, etag=etag)
+            return
+        accepted = self.headers.get("Accept-Encoding", "")
+        encoding = "br" if "br" in accepted and brotli else "gzip" if "gzip" in accepted else None
+        if encoding:
+            body = self.server.compressed(path, encoding)
+        self._send(body, etag=etag, encoding=encoding)
+
+    def _send(self, body: bytes, status: int = 200, etag: str = None, encoding: str = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stats["bytes_sent"] += len(body)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.stats = {"requests": 0, "connections": 0, "not_modified": 0, "bytes_sent": 0}
+        self._bodies: Dict[str, bytes] = {}
+        self._compressed: Dict[tuple, bytes] = {}
+
+    def body(self, path: str) -> bytes:
+        # Bodies are encoded once per path, the server should cost as little as possible
+        if path not in self._bodies:
+            build = _route(path.split("/"))
+            data = build() if build else {"error": True, "status": 404, "message": "Not found"}
+            self._bodies[path] = data.encode() if isinstance(data, str) else json.dumps(data).encode()
+        return self._bodies[path]
+
+    def compressed(self, path: str, encoding: str) -> bytes:
+        if (path, encoding) not in self._compressed:
+            body = self.body(path)
+            # The levels servers use for dynamic responses, the defaults take up to 200 ms for a batch of players
+            self._compressed[path, encoding] = (brotli.compress(body, quality=5) if encoding == "br"
+                                                else gzip.compress(body, compresslevel=6))
+        return self._compressed[path, encoding]
+
+
+def _serve(latency: float, port_queue: multiprocessing.Queue) -> None:
+    server = _Server(latency)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StandInServer:
+    # with StandInServer(latency=0.002) as server: RoyaleAPIClient("key", api_base_url=server.url)
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency  # Seconds added to every response, like a round trip to the real server
+        self.url = None
+        self._process = None
+
+    def __enter__(self) -> "StandInServer":
+        port_queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve, args=(self.latency, port_queue), daemon=True)
+        self._process.start()
+        self.url = f"http://127.0.0.1:{port_queue.get(timeout=30)}/"
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._process.terminate()
+        self._process.join()
+
+    def stats(self) -> Dict[str, int]:
+        from urllib.request import urlopen
+        with urlopen(self.url + "_stats") as response:
+            return json.loads(response.read())
@@ -0,0 +1,112 @@
+# Hammers the caches and a shared client from many threads, and checks that nothing broke
+# Run with: python -m benchmarks.stress_threads [threads] [seconds]
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Any, List
+
+from royaleapi import RoyaleAPIClient
+from royaleapi.cache import BaseCache, MemoryCache, SQLiteCache
+from royaleapi.utils import ExpiringDict
+from benchmarks import fixtures
+from benchmarks.server import StandInServer
+
+KEYS = [f"k{i}" for i in range(64)]  # Few keys, so that the threads keep running into each other
+
+
+def hammer(threads: int, seconds: float, operation: Callable[[random.Random], Any]) -> int:
+    # Runs operation() from every thread until the time is up, the first exception is raised again
+    deadline = time.monotonic() + seconds
+    errors: List[BaseException] = []
+    counts = [0] * threads
+
+    def work(n: int) -> None:
+        rng = random.Random(n)
+        try:
+            while time.monotonic() < deadline and not errors:
+                operation(rng)
+                counts[n] += 1
+        except BaseException as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if errors:
+        raise errors[0]
+    return sum(counts)
+
+
+def cache_operation(cache: ExpiringDict or BaseCache) -> Callable[[random.Random], Any]:
+    def operation(rng: random.Random) -> None:
+        key = rng.choice(KEYS)
+        action = rng.random()
+        if action < 0.4:
+            cache.get(key)
+        elif action < 0.7:
+            cache.set(key, {"value": rng.random()}, rng.choice((None, 0.001, 0.01)))
+        elif action < 0.8:
+            key in cache
+        elif action < 0.9:
+            cache.purge()
+        elif action < 0.95:
+            try:
+                del cache[key]
+            except KeyError:
+                pass
+        elif isinstance(cache, ExpiringDict):
+            list(cache.items())
+    return operation
+
+
+def check_expiring_dict(d: ExpiringDict) -> None:
+    assert d.capacity is None or len(d) <= d.capacity, "capacity exceeded"
+    heap = {(key, expiry_time) for expiry_time, _, key in d._expiry_heap}
+    for key, (_, expiry_time) in list(dict.items(d)):
+        assert (key, expiry_time) in heap, f"{key} can never be purged"
+
+
+def stress_client(url: str, threads: int, seconds: float) -> None:
+    tags = [fixtures.tag(n) for n in range(16)]
+    with RoyaleAPIClient("key", api_base_url=url, use_cache=True, dynamic_cache_time=1, dynamic_cache_capacity=8,
+                         stale_while_revalidate=1, refresh_ahead=0.5, cache_models=True, thread_safe=True) as client:
+        def operation(rng: random.Random) -> None:
+            if rng.random() < 0.5:
+                tag = rng.choice(tags)
+                assert client.get_clan(tag).tag == tag
+            else:
+                requested = rng.sample(tags, rng.randint(2, 10))
+                assert [player.tag for player in client.get_player(requested)] == requested
+
+        calls = hammer(threads, seconds, operation)
+        print(f"{'client':<24}{calls:>10} calls")
+
+
+def main() -> None:
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    print(f"{threads} threads, {seconds:g} s each")
+    d = ExpiringDict(timeout=1, capacity=32)
+    print(f"{'ExpiringDict':<24}{hammer(threads, seconds, cache_operation(d)):>10} operations")
+    check_expiring_dict(d)
+    memory_cache = MemoryCache("dynamic", timeout=1, capacity=32)
+    print(f"{'MemoryCache':<24}{hammer(threads, seconds, cache_operation(memory_cache)):>10} operations")
+    check_expiring_dict(memory_cache._data)
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_cache = SQLiteCache("dynamic", timeout=1, capacity=32, purge_interval=0,
+                                   path=os.path.join(directory, "cache.sqlite3"))
+        print(f"{'SQLiteCache':<24}{hammer(threads, seconds, cache_operation(sqlite_cache)):>10} operations")
+    with StandInServer(latency=0.005) as server:
+        stress_client(server.url, threads, seconds)
+        stats = server.stats()
+        print(f"{'server':<24}{stats['requests']:>10} requests, {stats['connections']} connections")
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+# The hot paths of the package, timed on the same fixtures every run and saved as JSON so that versions can be compared
+# Run with: python -m benchmarks.suite [--output new.json] [--compare old.json] [--filter parse/]
+# Another version is timed by putting it first on the path: --package-path ../clashroyaleapi-0.2.2
+import argparse
+import importlib
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.timer import bench
+
+CAPACITIES = (128, 4096, 65536)
+TAGS = 7  # A full batch request
+
+# Name -> setup(env) returning the function to time. Names must stay the same between versions, a case whose
+# setup fails, because the version does not have what it needs, is reported as skipped
+CASES: Dict[str, Callable[[Dict[str, Any]], Callable[[], Any]]] = {}
+
+
+def case(name: str) -> Callable[[Callable[[Dict[str, Any]], Callable[[], Any]]], Any]:
+    def register(setup: Callable[[Dict[str, Any]], Callable[[], Any]]) -> Any:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _model(name: str) -> Any:
+    return getattr(importlib.import_module("royaleapi.models"), name)
+
+
+def _parse_case(model: str, method: str, payload: Callable[[], Any]) -> Callable[[Dict[str, Any]], Callable[[], Any]]:
+    def setup(env: Dict[str, Any]) -> Callable[[], Any]:
+        build, data = getattr(_model(model), method), payload()
+        return lambda: build(data, None)
+    return setup
+
+
+def _serialize_case(model: str, method: str, payload: Callable[[], Any],
+                    serialize: str) -> Callable[[Dict[str, Any]], Callable[[], Any]]:
+    def setup(env: Dict[str, Any]) -> Callable[[], Any]:
+        objs = getattr(_model(model), method)(payload(), None)
+        objs = objs if isinstance(objs, list) else [objs]
+        return lambda: [getattr(obj, serialize)() for obj in objs]
+    return setup
+
+
+def _register_model_cases() -> None:
+    from benchmarks import fixtures
+    payloads = (("Player", "de_json", fixtures.player, "98 cards"), ("Clan", "de_json", fixtures.clan, "50 members"),
+                ("Battle", "de_list", fixtures.battle_log, "25 battles"),
+                ("Player", "de_list", fixtures.leaderboard, "200 leaderboard"))
+    for model, method, payload, size in payloads:
+        case(f"parse/{model}.{method} ({size})")(_parse_case(model, method, payload))
+    for model, method, payload, size in payloads[:3]:
+        for serialize in ("to_dict", "stringify"):
+            case(f"serialize/{model}.{serialize} ({size})")(_serialize_case(model, method, payload, serialize))
+
+    def columns(env: Dict[str, Any]) -> Callable[[], Any]:
+        battle_columns, data = importlib.import_module("royaleapi.columnar").BattleColumns, fixtures.battle_log()
+        return lambda: battle_columns(data).to_numpy()
+    case("parse/BattleColumns.to_numpy (25 battles)")(columns)
+
+    def deck_models(env: Dict[str, Any]) -> Callable[[], Any]:
+        decks = _model("Deck").de_list([{"cards": fixtures.deck(n), "decklink": "", "popularity": n}
+                                        for n in range(200)], None)
+        return lambda: [(deck.average_elixir(), deck == decks[0]) for deck in decks]
+    case("analytics/Deck.average_elixir and == (200 decks)")(deck_models)
+
+    def deck_set(env: Dict[str, Any]) -> Callable[[], Any]:
+        decks = importlib.import_module("royaleapi.decks")
+        battles = importlib.import_module("royaleapi.columnar").BattleColumns(fixtures.battle_log(2000))
+
+        def run() -> None:
+            deck_set = decks.DeckSet.from_battles(battles)
+            deck_set.average_elixir(), deck_set.similarity(0), deck_set.groups(), decks.card_stats(battles)
+        return run
+    case("analytics/DeckSet and card_stats (2000 battles)")(deck_set)
+
+
+def _expiring_dict(capacity: int) -> Any:
+    d = importlib.import_module("royaleapi.utils").ExpiringDict(timeout=3600, capacity=capacity)
+    for i in range(capacity):
+        d[i] = {"value": i}
+    return d
+
+
+def _register_cache_cases() -> None:
+    for capacity in CAPACITIES:
+        def get(env: Dict[str, Any], capacity: int = capacity) -> Callable[[], Any]:
+            d, keys = _expiring_dict(capacity), itertools.cycle(range(capacity))
+            return lambda: d[next(keys)]
+
+        def set_full(env: Dict[str, Any], capacity: int = capacity) -> Callable[[], Any]:
+            d, keys = _expiring_dict(capacity), itertools.count(capacity)  # Every set evicts the oldest entry
+            return lambda: d.__setitem__(next(keys), {"value": 0})
+
+        def purge(env: Dict[str, Any], capacity: int = capacity) -> Callable[[], Any]:
+            return _expiring_dict(capacity).purge
+
+        def fill_and_expire(env: Dict[str, Any], capacity: int = capacity) -> Callable[[], Any]:
+            d = _expiring_dict(capacity)
+            d.timeout = 1e-9  # Expired as soon as they are set
+
+            def run() -> None:
+                for i in range(capacity):
+                    d[i] = i
+                d.purge()
+            return run
+
+        case(f"cache/ExpiringDict get (capacity {capacity})")(get)
+        case(f"cache/ExpiringDict set when full (capacity {capacity})")(set_full)
+        case(f"cache/ExpiringDict purge, none expired (capacity {capacity})")(purge)
+        case(f"cache/ExpiringDict fill and purge all expired (capacity {capacity})")(fill_and_expire)
+
+
+def _client_calls(client: Any, tags: List[str]) -> Dict[str, Callable[[], Any]]:
+    return {"get_player (1 tag)": lambda: client.get_player(tags[0], use_cache=False),
+            f"get_player ({TAGS} tags)": lambda: client.get_player(tags, use_cache=False),
+            "get_clan (50 members)": lambda: client.get_clan(tags[0], use_cache=False),
+            "get_clan_battles (25 battles)": lambda: client.get_clan_battles(tags[0], use_cache=False),
+            "get_top_players (200 players)": lambda: client.get_top_players(use_cache=False),
+            "get_player (cached)": lambda: client.get_player(tags[0])}
+
+
+def _register_client_cases() -> None:
+    # Against the stand-in server over local HTTP, and through the replay transport with no I/O at all
+    for name in _client_calls(None, []):
+        def server(env: Dict[str, Any], name: str = name) -> Callable[[], Any]:
+            client = importlib.import_module("royaleapi").RoyaleAPIClient("key", api_base_url=env["url"],
+                                                                          use_cache=True)
+            env["cleanup"].append(client.close)
+            return _client_calls(client, env["tags"])[name]
+
+        def replay(env: Dict[str, Any], name: str = name) -> Callable[[], Any]:
+            transport = importlib.import_module("royaleapi.transport").ReplayTransport(env["store"])
+            client = importlib.import_module("royaleapi").RoyaleAPIClient("key", use_cache=True, transport=transport)
+            env["cleanup"].append(client.close)
+            return _client_calls(client, env["tags"])[name]
+
+        case(f"client/{name}")(server)
+        case(f"replay/{name}")(replay)
+
+
+def _save_fixtures(directory: str, tags: List[str]) -> Optional[str]:
+    # The responses of the stand-in server for the replay cases, None if the version has no replay transport
+    from benchmarks import fixtures
+    try:
+        store = importlib.import_module("royaleapi.transport").FixtureStore(directory)
+    except (ImportError, AttributeError):
+        return None
+    battle_type = importlib.import_module("royaleapi.constants").ClanBattleType.CLANMATE
+    for tag in tags:
+        store.save(f"player/{tag}", dict(fixtures.player(), tag=tag))
+        store.save(f"clan/{tag}", dict(fixtures.clan(), tag=tag))
+        store.save(f"clan/{tag}/battle", fixtures.battle_log(), {"type": battle_type})
+    store.save("top/player", fixtures.leaderboard())
+    return directory
+
+
+def _version() -> Dict[str, Any]:
+    royaleapi = importlib.import_module("royaleapi")
+    path = os.path.dirname(os.path.dirname(os.path.abspath(royaleapi.__file__)))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=path, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, universal_newlines=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"royaleapi": getattr(royaleapi, "__version__", None), "commit": commit, "path": path,
+            "python": platform.python_version(), "implementation": platform.python_implementation(),
+            "platform": platform.platform(), "created": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+
+
+def run(names: List[str], repeat: int) -> Dict[str, Any]:
+    from benchmarks import fixtures
+    from benchmarks.server import StandInServer
+    results, skipped = {}, {}
+    env = {"tags": [fixtures.tag(n) for n in range(TAGS)], "cleanup": []}
+    with tempfile.TemporaryDirectory() as directory, StandInServer() as server:
+        env["url"] = server.url
+        env["store"] = _save_fixtures(directory, env["tags"])
+        for name in names:
+            try:
+                func = CASES[name](env)
+                func()  # Also warms up the caches and the connection
+            except Exception as e:
+                skipped[name] = f"{type(e).__name__}: {e}"
+                print(f"{name:<64}{'skipped':>14}")
+                continue
+            results[name] = bench(func, repeat=repeat)
+            print(f"{name:<64}{results[name] * 1e6:>11.1f} us")
+        for cleanup in env["cleanup"]:
+            cleanup()
+    return {**_version(), "repeat": repeat, "results": results, "skipped": skipped}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    # Prints the change of every case timed in both runs, and returns the ones slower by more than threshold
+    print(f"\n{'case':<64}{'baseline':>14}{'current':>14}{'change':>9}")
+    regressions = []
+    for name, seconds in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = seconds / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<64}{before * 1e6:>11.1f} us{seconds * 1e6:>11.1f} us{change:>+9.0%}{flag}")
+    print(f"\nbaseline: {baseline.get('royaleapi')} {baseline.get('commit')}, "
+          f"current: {current.get('royaleapi')} {current.get('commit')}, {len(regressions)} regression(s)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Times the hot paths of royaleapi")
+    parser.add_argument("--output", help="file to save the results to as JSON")
+    parser.add_argument("--compare", help="results of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown reported as a regression")
+    parser.add_argument("--filter", default="", help="only run the cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the best one counts")
+    parser.add_argument("--package-path", help="directory to import royaleapi from, to time another version")
+    args = parser.parse_args()
+    if args.package_path:
+        sys.path.insert(0, os.path.abspath(args.package_path))
+    _register_model_cases()
+    _register_cache_cases()
+    _register_client_cases()
+    current = run([name for name in CASES if args.filter in name], args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(json.load(f), current, args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+import timeit
+from typing import Callable, Any
+
+
+def bench(func: Callable[[], Any], number: int = 0, repeat: int = 5) -> float:
+    # Best time per call out of repeat runs, which is the least noisy estimate
+    timer = timeit.Timer(func)
+    if not number:
+        number = max(1, timer.autorange()[0] // 2)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
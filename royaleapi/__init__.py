@@ -1,4 +1,6 @@
+from .async_client import AsyncRoyaleAPIClient
 from .client import RoyaleAPIClient
 from .version import __version__
 
-__all__ = ["RoyaleAPIClient", "constants", "error", "models", "utils"]
+__all__ = ["AsyncRoyaleAPIClient", "RoyaleAPIClient", "bulk", "cache", "columnar", "constants", "decks", "error",
+           "metrics", "models", "ratelimit", "retry", "utils"]
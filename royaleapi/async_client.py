@@ -0,0 +1,510 @@
+import asyncio
+import time
+from itertools import chain, islice
+from types import TracebackType
+from typing import AsyncIterator, Awaitable, List, Dict, Iterable, Optional, Any, Type, Callable
+
+from royaleapi.bulk import TAG_ERRORS, BulkProgress, BulkResult, BulkTracker, chunk_tags, split_valid
+from royaleapi.client import BaseRoyaleAPIClient, _StreamRecord
+from royaleapi.columnar import BattleColumns
+from royaleapi.constants import ClanBattleType
+from royaleapi.error import RoyaleAPIError, RequestTimeout
+from royaleapi.models import Battle, ChestCycle, Clan, ClanTracking, ClanWar, Deck, Player, ServerStatus, Tournament
+from royaleapi.transport import AiohttpTransport
+from royaleapi.utils import validate_tag, JSONArrayParser
+
+
+class AsyncRoyaleAPIClient(BaseRoyaleAPIClient):
+    # Mirrors RoyaleAPIClient, but every get_* method is a coroutine
+    _semaphore: Optional[asyncio.Semaphore] = None  # Bounds how many batches of a split tag list run at once
+
+    def _create_transport(self) -> AiohttpTransport:
+        return AiohttpTransport(limit=self.max_connections, limit_per_host=self.max_connections_per_host,
+                                keep_alive=self.keep_alive)
+
+    async def __aenter__(self) -> "AsyncRoyaleAPIClient":
+        return self
+
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
+                        exc_tb: Optional[TracebackType]) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await self.transport.close()
+
+    def _refresh_in_background(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing or key in self._in_flight:
+            return
+
+        def done(task: asyncio.Future) -> None:
+            self._refreshing.pop(key, None)
+            if not task.cancelled():
+                task.exception()  # Retrieved so that it is not logged, the data is fetched again on the next lookup
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+        self._refreshing[key].add_done_callback(done)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def _request(self, endpoint: str, params: Optional[Dict[Any, Any]] = None, return_text: bool = False,
+                       timeout: Optional[int] = None, cache_key: Optional[str] = None,
+                       cache_type: str = "dynamic") -> Dict or List[Dict]:
+        def send() -> Awaitable[Dict or List[Dict]]:
+            return self._send(endpoint, params, return_text, timeout, cache_key, cache_type)
+
+        return await (send() if self.retry_policy is None else self.retry_policy.call_async(send, endpoint))
+
+    async def _send(self, endpoint: str, params: Optional[Dict[Any, Any]] = None, return_text: bool = False,
+                    timeout: Optional[int] = None, cache_key: Optional[str] = None,
+                    cache_type: str = "dynamic") -> Dict or List[Dict]:
+        validators = self._get_validators(cache_key, cache_type)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        started = time.perf_counter()
+        try:
+            response = await self.transport.get(self._url(endpoint), self._params(params),
+                                                self._request_headers(validators), timeout)
+        except RequestTimeout as e:
+            self._record_request(endpoint, started, error=e)
+            raise
+        received = time.perf_counter()
+        if response.status == 304 and validators is not None:
+            self._record_request(endpoint, started, received, response.headers, not_modified=True)
+            return self._not_modified(cache_key, cache_type, validators)
+        try:
+            data = self._handle_response(response.content, response.headers, return_text)
+        except RoyaleAPIError as e:
+            self._record_request(endpoint, started, received, response.headers, response.content, e)
+            raise
+        self._record_request(endpoint, started, received, response.headers, response.content)
+        self._save_validators(cache_key, cache_type, response.headers, data)
+        return data
+
+    async def _stream(self, endpoint: str, params: Optional[Dict[Any, Any]] = None,
+                      timeout: Optional[int] = None) -> AsyncIterator[Dict]:
+        parser = JSONArrayParser(self._parse)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+        stream = _StreamRecord(self, endpoint)
+        try:
+            async with self.transport.stream(self._url(endpoint), self._params(params), self._headers,
+                                             timeout) as response:
+                stream.received(response.headers)
+                if response.status >= 400:  # Error bodies are small and read whole
+                    data = self._handle_response(await response.read(), response.headers)
+                    for obj in ([data] if isinstance(data, dict) else data):
+                        yield obj
+                    return
+                async for chunk in response.iter_chunks():
+                    for obj in stream.feed(parser, chunk):
+                        yield obj
+            for obj in stream.feed(parser):
+                yield obj
+        except RoyaleAPIError as e:
+            stream.error = e
+            raise
+        finally:  # Also when the caller stops iterating early
+            stream.done()
+
+    async def _request_with_tags(self, endpoint: str, tags: List[str], params: Optional[Dict[Any, Any]] = None,
+                                 timeout: Optional[int] = None) -> Dict or List[Dict]:
+        chunks = self._chunk_tags(tags)
+        if len(chunks) == 1:
+            return await self._request(endpoint.format(",".join(tags)), params=params, timeout=timeout)
+
+        async def request_chunk(chunk: List[str]) -> Dict or List[Dict]:
+            async with self._get_semaphore():
+                return await self._request(endpoint.format(",".join(chunk)), params=params, timeout=timeout)
+
+        return self._merge_chunks(await asyncio.gather(*(request_chunk(chunk) for chunk in chunks)))
+
+    async def _single_flight(self, keys: List[str], fetch: Callable[[List[int]], Awaitable[List[Any]]]) -> List[Any]:
+        # Same as RoyaleAPIClient._single_flight(), the fetch runs in its own task so that cancelling
+        # one of the waiting tasks, the one that started it included, does not cancel it for the others
+        owned, futures = [], []
+        for i, key in enumerate(keys):
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = asyncio.get_event_loop().create_future()
+                owned.append(i)
+            futures.append(future)
+        if owned:
+            def resolve(task: asyncio.Future) -> None:
+                fetched, error = None, None
+                if not task.cancelled():
+                    try:
+                        fetched = self._check_fetched(task.result(), owned)
+                    except BaseException as e:
+                        error = e
+                for j, i in enumerate(owned):
+                    future = self._in_flight.pop(keys[i])
+                    if task.cancelled():
+                        future.cancel()
+                    elif error is not None:
+                        future.set_exception(error)
+                        future.exception()  # Not logged as never retrieved when only an earlier key is awaited
+                    else:
+                        future.set_result(fetched[j])
+
+            asyncio.ensure_future(fetch(owned)).add_done_callback(resolve)
+        return [await asyncio.shield(future) for future in futures]
+
+    async def _get_methods_base(self, endpoint: str, key: str, use_cache: bool, cache_type: str = "dynamic",
+                                return_text: bool = False, timeout: Optional[int] = None,
+                                **kwargs) -> Dict or List[Dict]:
+        async def fetch(_: List[int]) -> List[Any]:
+            data = await self._request(endpoint, params=kwargs, return_text=return_text, timeout=timeout,
+                                       cache_key=key, cache_type=cache_type)
+            return self._cache_fetched([key], data, cache_type)
+
+        try:
+            data = self._get_cached(key, use_cache, cache_type)
+        except KeyError:
+            data = (await self._single_flight([key], fetch))[0]
+        else:
+            self._revalidate(key, cache_type, lambda: self._single_flight([key], fetch))
+        return data
+
+    async def _get_methods_with_tags_base(self, endpoint: str, tags: List[str], keys: List[str],
+                                          use_cache: bool, cache_type: str = "dynamic",
+                                          timeout: Optional[int] = None, **kwargs) -> Dict or List[Dict]:
+        async def fetch(tags_to_fetch: List[str], keys_to_fetch: List[str]) -> List[Any]:
+            if len(tags_to_fetch) == 1:  # Only the response for a single tag can be requested conditionally
+                data = await self._request(endpoint.format(tags_to_fetch[0]), params=kwargs, timeout=timeout,
+                                           cache_key=keys_to_fetch[0], cache_type=cache_type)
+            else:
+                data = await self._request_with_tags(endpoint, tags_to_fetch, params=kwargs, timeout=timeout)
+            return self._cache_fetched(keys_to_fetch, data, cache_type)
+
+        def refresh(tag: str, key: str) -> Callable[[], Awaitable[List[Any]]]:
+            return lambda: self._single_flight([key], lambda _: fetch([tag], [key]))
+
+        found, missing_tags, missing_keys = self._get_cached_partially(tags, keys, use_cache, cache_type)
+        if self._fetched_at is not None:
+            for tag, key in zip(tags, keys):
+                if key in found:
+                    self._revalidate(key, cache_type, refresh(tag, key))
+        fetched = None
+        if missing_tags:
+            fetched = await self._single_flight(missing_keys, lambda indexes: fetch(
+                [missing_tags[i] for i in indexes], [missing_keys[i] for i in indexes]))
+            fetched = fetched[0] if len(fetched) == 1 else fetched
+        return self._merge_cached(keys, found, missing_keys, fetched)
+
+    async def _iter_methods_base(self, endpoint: str, key: str, use_cache: bool, de_json: Callable[[Dict, Any], Any],
+                                 timeout: Optional[int] = None, **kwargs) -> AsyncIterator[Any]:
+        # Streamed responses are not cached, as that would mean holding all of them in memory
+        try:
+            data = self._get_cached(key, use_cache)
+        except KeyError:
+            async for obj in self._stream(endpoint, params=kwargs, timeout=timeout):
+                yield self._build_streamed(de_json, obj)
+            return
+        for obj in ([data] if isinstance(data, dict) else data):
+            yield self._build_streamed(de_json, obj)
+
+    @staticmethod
+    async def _get_chunk(get: Callable[[List[str]], Awaitable[List[Any]]], chunk: List[str]) -> List[BulkResult]:
+        given, valid, results = split_valid(chunk)
+        if not valid:
+            return results
+        try:
+            return results + [BulkResult(tag, obj, None) for tag, obj in zip(given, await get(valid))]
+        except RoyaleAPIError as e:
+            if len(valid) == 1 or not isinstance(e, TAG_ERRORS):
+                return results + [BulkResult(tag, None, e) for tag in given]
+        for tag, valid_tag in zip(given, valid):  # Only the tags causing the error are reported with it
+            try:
+                results.append(BulkResult(tag, (await get([valid_tag]))[0], None))
+            except RoyaleAPIError as e:
+                results.append(BulkResult(tag, None, e))
+        return results
+
+    async def _get_many(self, get: Callable[[List[str]], Awaitable[List[Any]]], tags: Iterable[str],
+                        concurrency: Optional[int],
+                        on_progress: Optional[Callable[[BulkProgress], Any]]) -> AsyncIterator[BulkResult]:
+        # At most concurrency batches are in flight, the tags are never all read into memory
+        concurrency = concurrency or self.max_workers
+        assert concurrency > 0
+        tracker = BulkTracker(tags, on_progress)
+        chunks = chunk_tags(tags, self.max_tags_per_request)
+        pending = set()
+        try:
+            while True:
+                for chunk in islice(chunks, concurrency - len(pending)):
+                    pending.add(asyncio.ensure_future(self._get_chunk(get, chunk)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for result in tracker.update(task.result()):
+                        yield result
+        finally:  # Also when the caller stops iterating early
+            for task in pending:
+                task.cancel()
+
+    async def get_player(self, player_tags: str or List[str], *args: str, use_cache: bool = True,
+                         timeout: Optional[int] = None) -> Player or List[Player]:
+        tags, given_single_tag = self._tag_check(player_tags, args)
+        keys = [f"p{tag}" for tag in tags]
+        data = await self._get_methods_with_tags_base("player/{}", tags, keys, use_cache, timeout=timeout)
+        return (self._build(Player.de_json, keys[0], data) if given_single_tag
+                else self._build_each(Player.de_json, keys, data))
+
+    def get_players_many(self, player_tags: Iterable[str], use_cache: bool = True, timeout: Optional[int] = None,
+                         concurrency: Optional[int] = None,
+                         on_progress: Optional[Callable[[BulkProgress], Any]] = None) -> AsyncIterator[BulkResult]:
+        return self._get_many(lambda tags: self.get_player(tags, use_cache=use_cache, timeout=timeout),
+                              player_tags, concurrency, on_progress)
+
+    async def get_player_chests(self, player_tags: str or List[str], *args: str, use_cache: bool = True,
+                                timeout: Optional[int] = None) -> ChestCycle or List[ChestCycle]:
+        tags, given_single_tag = self._tag_check(player_tags, args)
+        keys = [f"pc{tag}" for tag in tags]
+        data = await self._get_methods_with_tags_base("player/{}/chests", tags, keys, use_cache, timeout=timeout)
+        return (self._build(ChestCycle.de_json, keys[0], data) if given_single_tag
+                else self._build_each(ChestCycle.de_json, keys, data))
+
+    async def get_player_battles(self, player_tags: str or List[str], *args: str, use_cache: bool = True,
+                                 timeout: Optional[int] = None, columns: bool = False) -> List[Battle] or BattleColumns:
+        tags = self._tag_check(player_tags, args)[0]
+        keys = [f"pb{tag}" for tag in tags]
+        # Different as all battles of diff players are merged into same list if multiple players are provided
+        if len(tags) == 1:
+            data = await self._get_methods_with_tags_base("player/{}/battle", tags, keys, use_cache, timeout=timeout)
+            return BattleColumns(data) if columns else self._build(Battle.de_list, keys[0], data)
+        if self._all_cached(keys, use_cache):
+            data = list(chain(*self._fetch_from_cache(keys)))
+        else:
+            data = self._merge_chunks([await self._request_with_tags("player/{}/battle", tags, timeout=timeout)])
+        return BattleColumns(data) if columns else Battle.de_list(data, self)
+
+    async def get_clan(self, clan_tags: str or List[str], *args: str, use_cache: bool = True,
+                       timeout: Optional[int] = None) -> Clan or List[Clan]:
+        tags, given_single_tag = self._tag_check(clan_tags, args)
+        keys = [f"c{tag}" for tag in tags]
+        data = await self._get_methods_with_tags_base("clan/{}", tags, keys, use_cache, timeout=timeout)
+        return (self._build(Clan.de_json, keys[0], data) if given_single_tag
+                else self._build_each(Clan.de_json, keys, data))
+
+    def get_clans_many(self, clan_tags: Iterable[str], use_cache: bool = True, timeout: Optional[int] = None,
+                       concurrency: Optional[int] = None,
+                       on_progress: Optional[Callable[[BulkProgress], Any]] = None) -> AsyncIterator[BulkResult]:
+        return self._get_many(lambda tags: self.get_clan(tags, use_cache=use_cache, timeout=timeout),
+                              clan_tags, concurrency, on_progress)
+
+    async def get_clan_battles(self, clan_tag: str, battle_type: str = ClanBattleType.CLANMATE, use_cache: bool = True,
+                               timeout: Optional[int] = None, columns: bool = False) -> List[Battle] or BattleColumns:
+        if battle_type not in (ClanBattleType.ALL, ClanBattleType.CLANMATE, ClanBattleType.WAR):
+            raise ValueError("Invalid battle type")
+        tag = validate_tag(clan_tag)
+        key = f"cb{battle_type[0].lower()}{tag}"
+        data = await self._get_methods_with_tags_base("clan/{}/battle", [tag], [key], use_cache,
+                                                      timeout=timeout, type=battle_type)
+        return BattleColumns(data) if columns else self._build(Battle.de_list, key, data)
+
+    def iter_clan_battles(self, clan_tag: str, battle_type: str = ClanBattleType.CLANMATE, use_cache: bool = True,
+                          timeout: Optional[int] = None) -> AsyncIterator[Battle]:
+        if battle_type not in (ClanBattleType.ALL, ClanBattleType.CLANMATE, ClanBattleType.WAR):
+            raise ValueError("Invalid battle type")
+        tag = validate_tag(clan_tag)
+        key = f"cb{battle_type[0].lower()}{tag}"
+        return self._iter_methods_base(f"clan/{tag}/battle", key, use_cache, Battle.de_json,
+                                       timeout=timeout, type=battle_type)
+
+    async def get_clan_war(self, clan_tag: str, use_cache: bool = True, timeout: Optional[int] = None) -> ClanWar:
+        tag = validate_tag(clan_tag)
+        key = f"cw{tag}"
+        data = await self._get_methods_with_tags_base("clan/{}/war", [tag], [key], use_cache, timeout=timeout)
+        return self._build(ClanWar.de_json, key, data)
+
+    async def get_clan_war_log(self, clan_tag: str, use_cache: bool = True,
+                               timeout: Optional[int] = None) -> List[ClanWar]:
+        tag = validate_tag(clan_tag)
+        key = f"cwl{tag}"
+        data = await self._get_methods_with_tags_base("clan/{}/warlog", [tag], [key], use_cache, timeout=timeout)
+        return self._build(ClanWar.de_list, key, data)
+
+    async def get_clan_history(self, clan_tag: str, use_cache: bool = True,
+                               timeout: Optional[int] = None) -> Dict[str, Clan]:
+        tag = validate_tag(clan_tag)
+        key = f"ch{tag}"
+        data = await self._get_methods_with_tags_base("clan/{}/history", [tag], [key], use_cache, timeout=timeout)
+        return self._build(lambda d, client: {k: Clan.de_json(v, client) for k, v in d.items()}, key, data)
+
+    async def get_clan_tracking(self, clan_tags: str or List[str], *args: str, use_cache: bool = True,
+                                timeout: Optional[int] = None) -> ClanTracking or List[ClanTracking]:
+        tags, given_single_tag = self._tag_check(clan_tags, args)
+        keys = [f"ct{tag}" for tag in tags]
+        data = await self._get_methods_with_tags_base("clan/{}/tracking", tags, keys, use_cache, timeout=timeout)
+        return (self._build(ClanTracking.de_json, keys[0], data) if given_single_tag
+                else self._build_each(ClanTracking.de_json, keys, data))
+
+    async def track_clan(self, clan_tags: str or List[str], *args: str, timeout: Optional[int] = None) -> bool:
+        tags = self._tag_check(clan_tags, args)[0]
+        data = await self._request_with_tags("clan/{}/track", tags, timeout=timeout)
+        return all(d["success"] for d in self._merge_chunks([data]))
+
+    async def search_clans(self, name: Optional[str] = None, min_score: Optional[int] = None,
+                           min_members: Optional[int] = None, max_members: Optional[int] = None,
+                           location_id: Optional[int] = None, use_cache: bool = True,
+                           timeout: Optional[int] = None) -> List[Clan]:
+        assert name is None or len(name) >= 3, "The length of parameter 'name' must be >= 3 if given"
+        assert min_score is None or min_score >= 0, "Parameter 'score' must be a non-negative integer if given"
+        assert min_members is None or 2 <= min_members <= 50, "2 <= parameter 'min_members' <= 50 must be True if given"
+        assert max_members is None or 2 <= max_members <= 50, "2 <= parameter 'max_members' <= 50 must be True if given"
+        if min_members and max_members:
+            assert min_members <= max_members, "Parameter 'min_members' must be <= parameter 'max_members'"
+        assert location_id is None or 57000000 <= location_id <= 57000260, "Parameter 'location_id' is not a valid"
+        assert any([param is not None for param in (name, min_score, min_members, max_members, location_id)]), (
+            "At least one search parameter is required")
+        kwargs = {"name": name, "score": min_score, "minMembers": min_members,
+                  "maxMembers": max_members, "locationId": location_id}
+        key = f"cs?n={name}&ms={min_score}&mim={min_members}&mam={max_members}&li={location_id}"
+        data = await self._get_methods_base("clan/search", key, use_cache, timeout=timeout, **kwargs)
+        return self._build(Clan.de_list, key, data)
+
+    async def get_tournament(self, tournament_tags: str or List[str], *args: str, use_cache: bool = True,
+                             timeout: Optional[int] = None) -> Tournament:
+        tags, given_single_tag = self._tag_check(tournament_tags, args)
+        keys = [f"t{tag}" for tag in tags]
+        data = await self._get_methods_with_tags_base("tournament/{}", tags, keys, use_cache, timeout=timeout)
+        return (self._build(Tournament.de_json, keys[0], data) if given_single_tag
+                else self._build_each(Tournament.de_json, keys, data))
+
+    async def get_known_tournaments(self, filter_1k: bool = False, filter_open: bool = False, filter_full: bool = False,
+                                    filter_in_prep: bool = False, filter_joinable: bool = False, use_cache: bool = True,
+                                    timeout: Optional[int] = None) -> List[Tournament]:
+        kwargs = {
+            "1k": int(filter_1k),
+            "open": int(filter_open),
+            "full": int(filter_full),
+            "inprep": int(filter_in_prep),
+            "joinable": int(filter_joinable)
+        }
+        key = f"tk?1k={filter_1k}&o={filter_open}&f={filter_full}&p={filter_in_prep}&j={filter_joinable}"
+        data = await self._get_methods_base("tournament/known", key, use_cache, timeout=timeout, **kwargs)
+        return self._build(Tournament.de_list, key, data)
+
+    def iter_known_tournaments(self, filter_1k: bool = False, filter_open: bool = False, filter_full: bool = False,
+                               filter_in_prep: bool = False, filter_joinable: bool = False, use_cache: bool = True,
+                               timeout: Optional[int] = None) -> AsyncIterator[Tournament]:
+        kwargs = {
+            "1k": int(filter_1k),
+            "open": int(filter_open),
+            "full": int(filter_full),
+            "inprep": int(filter_in_prep),
+            "joinable": int(filter_joinable)
+        }
+        key = f"tk?1k={filter_1k}&o={filter_open}&f={filter_full}&p={filter_in_prep}&j={filter_joinable}"
+        return self._iter_methods_base("tournament/known", key, use_cache, Tournament.de_json, timeout=timeout,
+                                       **kwargs)
+
+    async def search_tournaments(self, name: str, use_cache: bool = True,
+                                 timeout: Optional[int] = None) -> List[Tournament]:
+        assert name, "Parameter 'name' cannot be empty"
+        key = f"ts?n={name}"
+        data = await self._get_methods_base("tournament/search", key, use_cache, timeout=timeout, name=name)
+        return self._build(Tournament.de_list, key, data)
+
+    async def get_top_players(self, location_key: str = None, use_cache: bool = True,
+                              timeout: Optional[int] = None) -> List[Player]:
+        assert location_key is None or len(location_key) == 2, "Parameter 'location_key' is not valid"  # Countries only
+        endpoint = "top/player"
+        if location_key:
+            endpoint += "/" + location_key
+        key = f"tp?lk={location_key}"
+        data = await self._get_methods_base(endpoint, key, use_cache, timeout=timeout)
+        return self._build(Player.de_list, key, data)
+
+    def iter_top_players(self, location_key: str = None, use_cache: bool = True,
+                         timeout: Optional[int] = None) -> AsyncIterator[Player]:
+        assert location_key is None or len(location_key) == 2, "Parameter 'location_key' is not valid"  # Countries only
+        endpoint = "top/player"
+        if location_key:
+            endpoint += "/" + location_key
+        key = f"tp?lk={location_key}"
+        return self._iter_methods_base(endpoint, key, use_cache, Player.de_json, timeout=timeout)
+
+    async def get_top_clans(self, location_key: str = None, use_cache: bool = True,
+                            timeout: Optional[int] = None) -> List[Clan]:
+        assert (location_key is None or location_key.isalpha() and
+                len(location_key) == 2 or location_key.startswith("_")), "Parameter 'location_key' is not valid"
+        endpoint = "top/clan"
+        if location_key:
+            endpoint += "/" + location_key
+        key = f"tc?lk={location_key}"
+        data = await self._get_methods_base(endpoint, key, use_cache, timeout=timeout)
+        return self._build(Clan.de_list, key, data)
+
+    async def get_top_war_clans(self, location_key: str = None, use_cache: bool = True,
+                                timeout: Optional[int] = None) -> List[Clan]:
+        assert location_key is None or len(location_key) == 2 or location_key.startswith("_"), (
+            "Parameter 'location_key' is not valid")
+        endpoint = "top/war"
+        if location_key:
+            endpoint += "/" + location_key
+        key = f"tw?lk={location_key}"
+        data = await self._get_methods_base(endpoint, key, use_cache, timeout=timeout)
+        return self._build(Clan.de_list, key, data)
+
+    async def get_popular_players(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Player]:
+        key = "pp"
+        data = await self._get_methods_base("popular/player", key, use_cache, timeout=timeout)
+        return self._build(Player.de_list, key, data)
+
+    def iter_popular_players(self, use_cache: bool = True, timeout: Optional[int] = None) -> AsyncIterator[Player]:
+        return self._iter_methods_base("popular/player", "pp", use_cache, Player.de_json, timeout=timeout)
+
+    async def get_popular_clans(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Clan]:
+        key = "pc"
+        data = await self._get_methods_base("popular/clan", key, use_cache, timeout=timeout)
+        return self._build(Clan.de_list, key, data)
+
+    def iter_popular_clans(self, use_cache: bool = True, timeout: Optional[int] = None) -> AsyncIterator[Clan]:
+        return self._iter_methods_base("popular/clan", "pc", use_cache, Clan.de_json, timeout=timeout)
+
+    async def get_popular_tournaments(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Tournament]:
+        key = "pt"
+        data = await self._get_methods_base("popular/tournament", key, use_cache, timeout=timeout)
+        return self._build(Tournament.de_list, key, data)
+
+    def iter_popular_tournaments(self, use_cache: bool = True,
+                                 timeout: Optional[int] = None) -> AsyncIterator[Tournament]:
+        return self._iter_methods_base("popular/tournament", "pt", use_cache, Tournament.de_json, timeout=timeout)
+
+    async def get_popular_decks(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Deck]:
+        key = "pd"
+        data = await self._get_methods_base("popular/deck", key, use_cache, timeout=timeout)
+        return self._build(Deck.de_list, key, data)
+
+    def iter_popular_decks(self, use_cache: bool = True, timeout: Optional[int] = None) -> AsyncIterator[Deck]:
+        return self._iter_methods_base("popular/deck", "pd", use_cache, Deck.de_json, timeout=timeout)
+
+    async def get_version(self, use_cache: bool = True, timeout: Optional[int] = None) -> str:
+        return await self._get_methods_base("version", "v", use_cache, cache_type="server_info",
+                                            return_text=True, timeout=timeout)
+
+    async def get_health(self, use_cache: bool = True, timeout: Optional[int] = None) -> str:
+        return await self._get_methods_base("health", "h", use_cache, cache_type="server_info",
+                                            return_text=True, timeout=timeout)
+
+    async def get_status(self, use_cache: bool = True, timeout: Optional[int] = None) -> ServerStatus:
+        data = await self._get_methods_base("status", "s", use_cache, cache_type="server_info", timeout=timeout)
+        return self._build(ServerStatus.de_json, "s", data, cache_type="server_info")
+
+    async def get_endpoints(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[str]:
+        return await self._get_methods_base("endpoints", "e", use_cache, cache_type="constants", timeout=timeout)
+
+    get_players = get_player
+    get_players_battles = get_player_battles
+    get_players_chests = get_player_chests
+    get_clans = get_clan
+    get_clans_tracking = get_clan_tracking
+    track_clans = track_clan
+    get_tournaments = get_tournament
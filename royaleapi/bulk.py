@@ -0,0 +1,69 @@
+import time
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional, Sized, Tuple
+
+from royaleapi.error import RoyaleAPIError, BadRequest, ClanNotTracked, NotFound
+from royaleapi.utils import validate_tag
+
+# Errors that a single tag of a batch request can cause, the tags of the batch are then requested one by one
+TAG_ERRORS = (BadRequest, ClanNotTracked, NotFound)
+
+
+class BulkResult(NamedTuple):
+    tag: str  # As it was given
+    result: Any  # The model, None if the lookup failed
+    error: Optional[RoyaleAPIError]  # None if the lookup succeeded
+
+
+class BulkProgress(NamedTuple):
+    done: int  # Tags looked up so far, failed ones included
+    failed: int
+    total: Optional[int]  # None if the tags were not given as a sized collection
+    elapsed: float  # Seconds since the first lookup was started
+
+    @property
+    def rate(self) -> float:  # Tags per second
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class BulkTracker:
+    # Counts the results of a get_*_many call as they are yielded, and reports them to on_progress
+    def __init__(self, tags: Iterable[Any], on_progress: Optional[Callable[[BulkProgress], Any]] = None) -> None:
+        self.total = len(tags) if isinstance(tags, Sized) else None
+        self.on_progress = on_progress
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    @property
+    def progress(self) -> BulkProgress:
+        return BulkProgress(self.done, self.failed, self.total, time.monotonic() - self.started)
+
+    def update(self, results: List[BulkResult]) -> List[BulkResult]:
+        self.done += len(results)
+        self.failed += sum(result.error is not None for result in results)
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+        return results
+
+
+def chunk_tags(tags: Iterable[str], size: int) -> Iterator[List[str]]:
+    # Reads the tags lazily, so that a generator of any length can be given
+    tags = iter(tags)
+    chunk = list(islice(tags, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(tags, size))
+
+
+def split_valid(chunk: List[str]) -> Tuple[List[str], List[str], List[BulkResult]]:
+    # The given and validated tags that can be requested, and the results of those that cannot
+    given, valid, invalid = [], [], []
+    for tag in chunk:
+        try:
+            valid.append(validate_tag(tag))
+        except RoyaleAPIError as e:
+            invalid.append(BulkResult(tag, None, e))
+        else:
+            given.append(tag)
+    return given, valid, invalid
@@ -0,0 +1,197 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from typing import Any, Optional
+
+from royaleapi.utils import ExpiringDict
+
+
+class BaseCache(metaclass=ABCMeta):
+    # One instance is created per cache type ("dynamic", "server_info" and "constants") by the client
+    evictions = 0  # Entries dropped because they expired or the capacity was reached, if the backend counts them
+    stores_objects = False  # Lookups return the stored objects themselves instead of copies, see cache_models
+
+    def __init__(self, namespace: str, timeout: int = 300, capacity: Optional[int] = None) -> None:
+        assert timeout > 0 and (isinstance(capacity, int) or capacity is None)
+        self.namespace = namespace
+        self.timeout = timeout
+        self.capacity = capacity
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(namespace={self.namespace!r}, timeout={self.timeout})"
+
+    @abstractmethod
+    def __getitem__(self, key: str) -> Any:  # Raises KeyError if the key is missing or has expired
+        pass
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+    @abstractmethod
+    def __delitem__(self, key: str) -> None:
+        pass
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    @abstractmethod
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        pass
+
+    def get(self, key: str, default: Optional[Any] = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def purge(self) -> None:  # Backends that expire entries by themselves do not need this
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache(BaseCache):
+    # Process-local cache, the default backend
+    stores_objects = True
+
+    def __init__(self, namespace: str, timeout: int = 300, capacity: Optional[int] = None) -> None:
+        super().__init__(namespace, timeout, capacity)
+        self._data = ExpiringDict(timeout=timeout, capacity=capacity)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def evictions(self) -> int:
+        return self._data.evictions
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        self._data.set(key, value, timeout)
+
+    def purge(self) -> None:
+        self._data.purge()
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SQLiteCache(BaseCache):
+    # On-disk cache that can be shared by every process on the same host, values are stored as JSON
+    def __init__(self, namespace: str, timeout: int = 300, capacity: Optional[int] = None,
+                 path: str = "royaleapi_cache.sqlite3", purge_interval: int = 10) -> None:
+        super().__init__(namespace, timeout, capacity)
+        self.path = path
+        self.purge_interval = purge_interval
+        self._last_purge = 0
+        self._local = threading.local()  # sqlite3 connections cannot be shared between threads
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (namespace TEXT NOT NULL, key TEXT NOT NULL, "
+                         "value TEXT NOT NULL, expiry_time REAL NOT NULL, PRIMARY KEY (namespace, key))")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry_time ON cache (namespace, expiry_time)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers in other processes do not block writers
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def __getitem__(self, key: str) -> Any:
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ? AND expiry_time > ?",
+            (self.namespace, key, time.time())).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __delitem__(self, key: str) -> None:
+        with self._connection() as conn:
+            if not conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)).rowcount:
+                raise KeyError(key)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM cache WHERE namespace = ? AND expiry_time > ?",
+                                          (self.namespace, time.time())).fetchone()[0]
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        with self._connection() as conn:
+            conn.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                         (self.namespace, key, json.dumps(value), time.time() + (timeout or self.timeout)))
+
+    def purge(self) -> None:
+        # Expired rows are never returned anyway, so deleting them is only done every purge_interval seconds
+        now = time.time()
+        if now - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = now
+        with self._connection() as conn:
+            self.evictions += conn.execute("DELETE FROM cache WHERE namespace = ? AND expiry_time <= ?",
+                                           (self.namespace, now)).rowcount
+            if self.capacity:
+                self.evictions += conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key IN (SELECT key FROM cache "
+                    "WHERE namespace = ? ORDER BY expiry_time DESC LIMIT -1 OFFSET ?)",
+                    (self.namespace, self.namespace, self.capacity)).rowcount
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+
+class NetworkCache(BaseCache):
+    # Cache in a networked store, takes any client with redis-py style get(key), set(key, value, ex=seconds),
+    # delete(*keys) and scan_iter(match=pattern)
+    def __init__(self, namespace: str, timeout: int = 300, capacity: Optional[int] = None,
+                 client: Any = None, prefix: str = "royaleapi") -> None:
+        super().__init__(namespace, timeout, capacity)  # Capacity is left to the store's own eviction policy
+        if client is None:
+            raise ValueError("A client for the networked store is required")
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{self.namespace}:{key}"
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.client.get(self._key(key))
+        if value is None:
+            raise KeyError(key)
+        return json.loads(value)
+
+    def __delitem__(self, key: str) -> None:
+        self.client.delete(self._key(key))
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        self.client.set(self._key(key), json.dumps(value), ex=timeout or self.timeout)
+
+    def clear(self) -> None:
+        # Scans instead of using KEYS so that the store is not blocked, the keys are deleted in batches
+        batch = []
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", self._key("")) + "*"  # Glob characters of the prefix escaped
+        for key in self.client.scan_iter(match=pattern):
+            batch.append(key)
+            if len(batch) >= 500:
+                self.client.delete(*batch)
+                batch = []
+        if batch:
+            self.client.delete(*batch)
@@ -1,48 +1,118 @@
-import json
-from itertools import chain
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from itertools import chain, islice
 from types import TracebackType
-from typing import List, Tuple, Dict, Optional, Any, Type
-
-import requests
-from requests.exceptions import ConnectTimeout, ReadTimeout, ConnectionError
-
-from royaleapi.constants import ClanBattleType
-from royaleapi.error import RoyaleAPIError, InvalidToken, RequestTimeout, ServerResponseInvalid, error_dict
+from typing import List, Tuple, Dict, Iterable, Iterator, Mapping, Optional, Any, Type, Callable
+from urllib.parse import quote
+
+from royaleapi.bulk import TAG_ERRORS, BulkProgress, BulkResult, BulkTracker, chunk_tags, split_valid
+from royaleapi.cache import BaseCache, MemoryCache
+from royaleapi.columnar import BattleColumns
+from royaleapi.constants import ClanBattleType, HOT_KEY_READS, MAX_TAGS_PER_REQUEST, VALIDATORS_TIMEOUT_FACTOR
+from royaleapi.error import (RoyaleAPIError, InvalidToken, RequestTimeout, ServerResponseInvalid, TooManyRequests,
+                             error_dict)
+from royaleapi.metrics import Metrics, RequestRecord, endpoint_template
 from royaleapi.models import Battle, ChestCycle, Clan, ClanTracking, ClanWar, Deck, Player, ServerStatus, Tournament
-from royaleapi.utils import is_iterable, validate_tag, ExpiringDict
+from royaleapi.models.base import _freeze
+from royaleapi.ratelimit import RateLimiter
+from royaleapi.retry import RetryPolicy
+from royaleapi.transport import AsyncBaseTransport, BaseTransport, RequestsTransport
+from royaleapi.utils import is_iterable, validate_tag, json_loads, ExpiringDict, JSONArrayParser, ACCEPT_ENCODING
 
 
-class RoyaleAPIClient:
+class BaseRoyaleAPIClient(metaclass=ABCMeta):
+    # Everything that does not do I/O lives here so that the sync and async clients behave the same
     def __init__(self, dev_key: str, use_cache: bool = False, dynamic_cache_time: int = 180,
                  dynamic_cache_capacity: int = 128, server_info_cache_time: int = 60,
                  constants_cache_time: int = 86400, headers: Optional[Dict[str, str]] = None,
-                 api_base_url: str = "https://api.royaleapi.com/"):
+                 api_base_url: str = "https://api.royaleapi.com/",
+                 max_tags_per_request: int = MAX_TAGS_PER_REQUEST, max_workers: int = 4,
+                 cache_backend: Callable[..., BaseCache] = MemoryCache, cache_models: bool = False,
+                 json_loads: Callable[[bytes], Any] = json_loads, lazy_models: bool = False,
+                 rate_limit: Optional[float] = None, rate_limit_burst: Optional[int] = None,
+                 retry_policy: Optional[RetryPolicy] = None, max_connections: int = 100,
+                 max_connections_per_host: Optional[int] = None, keep_alive: bool = True, tcp_nodelay: bool = True,
+                 tcp_keepalive: Optional[int] = None, thread_safe: bool = False, conditional_requests: bool = True,
+                 compression: bool = True, stale_while_revalidate: int = 0, refresh_ahead: float = 0,
+                 metrics: Optional[Metrics] = None, transport: Optional[BaseTransport or AsyncBaseTransport] = None):
+        assert stale_while_revalidate >= 0 and 0 <= refresh_ahead < 1
+        assert max_tags_per_request > 0 and max_workers > 0 and max_connections > 0
         self._dev_key = self._validate_token(dev_key)
-        self.session = requests.Session()
         self._cache = None
-        self.session.headers = {"auth": self._dev_key, **(headers or {})}
+        self._headers = {"auth": self._dev_key, "Accept-Encoding": ACCEPT_ENCODING if compression else "identity",
+                         **(headers or {})}
         self.api_base_url = api_base_url
+        self.max_tags_per_request = max_tags_per_request
+        self.max_workers = max_workers
+        self.json_loads = json_loads
+        self.lazy_models = lazy_models  # Nested objects are built on their first access
+        # Requests per second, shared by every client using the same dev key
+        self.rate_limiter = RateLimiter.shared(self._dev_key, rate_limit, rate_limit_burst) if rate_limit else None
+        self.retry_policy = retry_policy  # Each request is only tried once without one
+        self.metrics = metrics  # Nothing is recorded without one, see stats()
+        # The connection options are those of the default transport, a given transport is used as it is
+        self.max_connections = max_connections
+        # Enough connections for every worker by default, so that none is opened and dropped again on each batch
+        self.max_connections_per_host = max_connections_per_host or max(10, max_workers)
+        self.keep_alive = keep_alive
+        self.tcp_nodelay = tcp_nodelay
+        self.tcp_keepalive = tcp_keepalive  # Idle seconds before TCP keep-alive probes are sent, None disables them
+        # Caches, rate limiter and in-flight lookups are always safe to share between threads, thread_safe=True
+        # also gives each thread its own requests Session, which is not thread-safe, over one shared pool
+        self.thread_safe = thread_safe
+        # Seconds expired data is still returned for while it is fetched again in the background
+        self.stale_while_revalidate = stale_while_revalidate
+        # Part of the cache timeout after which hot entries are fetched again in the background, 0 disables it
+        self.refresh_ahead = refresh_ahead
+        if not keep_alive:
+            self._headers["Connection"] = "close"
+        self.transport = transport or self._create_transport()
+        self._models_cache = None
+        self._validators = None
+        self._fetched_at = None
+        self._refreshing = {}  # Cache key -> its background refresh, the task with the async client
+        self._in_flight = {}  # Cache key -> future of the request fetching it, shared by concurrent lookups
+        self._in_flight_lock = threading.Lock()
+        self._lock = threading.Lock()  # For what is created on first use, like the executor
         if use_cache:
             self._cache = {"dynamic": None, "server_info": None, "constants": None}
-            if dynamic_cache_time > 0:
-                self._cache["dynamic"] = ExpiringDict(timeout=dynamic_cache_time, capacity=dynamic_cache_capacity)
-            if server_info_cache_time > 0:
-                self._cache["server_info"] = ExpiringDict(timeout=server_info_cache_time, capacity=3)
-            if constants_cache_time > 0:
-                self._cache["constants"] = ExpiringDict(timeout=constants_cache_time, capacity=2)
+            # The models built from each cached response, returned again by every lookup of it. They are shared
+            # by all callers, so they are frozen: setting an attribute of them, or of the models nested in them,
+            # raises dataclasses.FrozenInstanceError. Only used with backends that store the objects themselves,
+            # as the responses of the others are new objects on each lookup
+            if cache_models:
+                self._models_cache = {"dynamic": None, "server_info": None, "constants": None}
+            if conditional_requests:  # ETag and Last-Modified of the cached responses
+                self._validators = {"dynamic": None, "server_info": None, "constants": None}
+            if stale_while_revalidate or refresh_ahead:  # When the cached responses were fetched, and how often read
+                self._fetched_at = {"dynamic": None, "server_info": None, "constants": None}
+            for cache_type, timeout, capacity in (("dynamic", dynamic_cache_time, dynamic_cache_capacity),
+                                                  ("server_info", server_info_cache_time, 3),
+                                                  ("constants", constants_cache_time, 2)):
+                if timeout > 0:
+                    self._cache[cache_type] = cache_backend(cache_type, timeout=timeout, capacity=capacity)
+                    if cache_models and self._cache[cache_type].stores_objects:
+                        self._models_cache[cache_type] = ExpiringDict(timeout=timeout, capacity=capacity)
+                    if conditional_requests:  # They are only of use once the cached data has expired
+                        self._validators[cache_type] = ExpiringDict(timeout=timeout * VALIDATORS_TIMEOUT_FACTOR,
+                                                                    capacity=capacity)
+                    if self._fetched_at is not None:
+                        self._fetched_at[cache_type] = ExpiringDict(timeout=timeout + stale_while_revalidate,
+                                                                    capacity=capacity)
 
     def __repr__(self):
         return f"{self.__class__.__name__}(use_cache={self._cache is not None})"
 
-    def __enter__(self) -> "RoyaleAPIClient":
-        return self
-
-    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
-                 exc_tb: Optional[TracebackType]) -> None:  # goddamn typing
-        self.close()
+    @abstractmethod
+    def _create_transport(self) -> BaseTransport or AsyncBaseTransport:
+        pass
 
-    def close(self) -> None:
-        self.session.close()
+    @property
+    def session(self) -> Any:  # The session of the default transport
+        return getattr(self.transport, "session", None)
 
     @staticmethod
     def _validate_token(api_token: str) -> str:
@@ -65,36 +135,194 @@ class RoyaleAPIClient:
             raise ValueError("Given argument(s) is/are not a tag nor iterables of them")
         return tags, given_single_tag
 
+    def _cache_enabled(self, use_cache: bool = True, cache_type: str = "dynamic") -> bool:
+        return bool(self._cache and use_cache and self._cache[cache_type] is not None)
+
     def _purge_cache(self, cache_type: str = "dynamic") -> None:
         self._cache[cache_type].purge()
 
     def _fetch_from_cache(self, keys: str or List[str], cache_type: str = "dynamic") -> Dict or List[Dict]:
-        if isinstance(keys, str):
-            return self._cache[cache_type][keys]
-        return [self._cache[cache_type][key] for key in keys]
+        try:
+            if isinstance(keys, str):
+                data = self._cache[cache_type][keys]
+            else:
+                data = [self._cache[cache_type][key] for key in keys]
+        except KeyError:
+            if self.metrics is not None:
+                self.metrics.record_cache_lookup(cache_type, False)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_cache_lookup(cache_type, True, 1 if isinstance(keys, str) else len(keys))
+        return data
 
     def _save_in_cache(self, keys: str or List[str], data: Dict or List[Dict], cache_type: str = "dynamic") -> None:
+        cache = self._cache[cache_type]
+        timeout = cache.timeout + self.stale_while_revalidate if self.stale_while_revalidate else None
         if isinstance(keys, str) or len(keys) == 1:
-            self._cache[cache_type][(keys if isinstance(keys, str) else keys[0])] = data  # it has to work like that smh
+            cache.set((keys if isinstance(keys, str) else keys[0]), data, timeout)  # it has to work like that smh
             return
         for k, v in zip(keys, data):
-            self._cache[cache_type][k] = v
+            cache.set(k, v, timeout)
+
+    def _get_cached(self, keys: str or List[str], use_cache: bool,
+                    cache_type: str = "dynamic") -> Dict or List[Dict]:
+        # Raises KeyError if caching is disabled or any of the keys is missing
+        if not self._cache_enabled(use_cache, cache_type):
+            raise KeyError(keys)
+        self._purge_cache(cache_type)
+        return self._fetch_from_cache(keys, cache_type)
+
+    def _get_cached_partially(self, tags: List[str], keys: List[str], use_cache: bool,
+                              cache_type: str = "dynamic") -> Tuple[Dict[str, Any], List[str], List[str]]:
+        # Returns the cached entries along with the tags and keys that still have to be requested
+        if not self._cache_enabled(use_cache, cache_type):
+            return {}, tags, keys
+        self._purge_cache(cache_type)
+        found = {}
+        missing_tags, missing_keys = [], []
+        for tag, key in zip(tags, keys):
+            try:
+                found[key] = self._fetch_from_cache(key, cache_type)
+            except KeyError:
+                missing_tags.append(tag)
+                missing_keys.append(key)
+        return found, missing_tags, missing_keys
 
-    def _request(self, endpoint: str, params: Optional[Dict[Any, Any]] = None,
-                 return_text: bool = False, timeout: Optional[int] = None) -> Dict or List[Dict]:
-        endpoint = requests.utils.quote(endpoint)
-        try:
-            response = self.session.get(f"{self.api_base_url}{endpoint}", params=params, timeout=timeout)
-        except (ConnectTimeout, ReadTimeout, ConnectionError) as e:
-            raise RequestTimeout(str(e)) from None
-        return self._parse(response, return_text)
+    @staticmethod
+    def _merge_cached(keys: List[str], found: Dict[str, Any], missing_keys: List[str],
+                      fetched: Dict or List[Dict]) -> Dict or List[Dict]:
+        if missing_keys:
+            found.update(zip(missing_keys, [fetched] if len(missing_keys) == 1 else fetched))
+        data = [found[key] for key in keys]
+        return data[0] if len(data) == 1 else data
+
+    def _get_validators(self, key: Optional[str],
+                        cache_type: str = "dynamic") -> Optional[Tuple[Optional[str], Optional[str], Any]]:
+        # ETag, Last-Modified and the data they validate
+        if key is None or self._validators is None or self._validators[cache_type] is None:
+            return None
+        return self._validators[cache_type].get(key)
+
+    def _request_headers(self, validators: Optional[Tuple[Optional[str], Optional[str], Any]]) -> Dict[str, str]:
+        if validators is None:
+            return self._headers
+        headers = dict(self._headers)
+        etag, last_modified, _ = validators
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _save_validators(self, key: Optional[str], cache_type: str, headers: Mapping[str, str], data: Any) -> None:
+        if key is None or self._validators is None or self._validators[cache_type] is None:
+            return
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if etag or last_modified:
+            self._validators[cache_type][key] = (etag, last_modified, data)
+
+    def _not_modified(self, key: str, cache_type: str, validators: Tuple[Optional[str], Optional[str], Any]) -> Any:
+        # A 304 response, the data is not parsed again and the caller caches it with a new timeout
+        self._validators[cache_type][key] = validators
+        if self.rate_limiter is not None:
+            self.rate_limiter.succeeded()
+        return validators[2]
+
+    @staticmethod
+    def _check_fetched(fetched: List[Any], keys: List[Any]) -> List[Any]:
+        # A batch response must hold one object per requested key
+        if not isinstance(fetched, list) or len(fetched) != len(keys):
+            raise ServerResponseInvalid(f"Expected {len(keys)} objects in the response")
+        return fetched
+
+    def _cache_fetched(self, keys: List[str], data: Dict or List[Dict], cache_type: str = "dynamic") -> List[Any]:
+        # Caches a response and splits it into one entry per key, a response missing some of them is not cached
+        if len(keys) > 1:
+            self._check_fetched(data, keys)
+        self._set_cached(keys, data, cache_type)
+        if self._fetched_at is not None and self._fetched_at[cache_type] is not None:
+            now = time.monotonic()
+            for key in keys:
+                self._fetched_at[cache_type][key] = [now, 0]  # Fetch time, reads since
+        return [data] if len(keys) == 1 else data
+
+    def _revalidate(self, key: str, cache_type: str, refresh: Callable[[], Any]) -> None:
+        # Called when cached data is read. Data older than the cache timeout, which is only kept during the grace
+        # window, and hot data read after refresh_ahead of the timeout are fetched again in the background
+        if self._fetched_at is None or self._fetched_at[cache_type] is None:
+            return
+        entry = self._fetched_at[cache_type].get(key)
+        if entry is None:  # Cached by another process sharing the cache backend
+            return
+        entry[1] += 1
+        age = time.monotonic() - entry[0]
+        timeout = self._cache[cache_type].timeout
+        if age >= timeout or (self.refresh_ahead and age >= timeout * self.refresh_ahead and
+                              entry[1] >= HOT_KEY_READS):
+            self._refresh_in_background(key, refresh)
+
+    @abstractmethod
+    def _refresh_in_background(self, key: str, refresh: Callable[[], Any]) -> None:
+        pass
+
+    def _set_cached(self, keys: str or List[str], data: Dict or List[Dict], cache_type: str = "dynamic") -> None:
+        if self._cache_enabled(cache_type=cache_type):
+            self._save_in_cache(keys, data, cache_type)
+
+    def _all_cached(self, keys: List[str], use_cache: bool, cache_type: str = "dynamic") -> bool:
+        if not self._cache_enabled(use_cache, cache_type):
+            return False
+        self._purge_cache(cache_type)
+        return all(k in self._cache[cache_type] for k in keys)
+
+    def _build(self, de_json: Callable[[Any, "BaseRoyaleAPIClient"], Any], key: str, data: Any,
+               cache_type: str = "dynamic") -> Any:
+        if self.metrics is None:
+            return self._build_model(de_json, key, data, cache_type)
+        started = time.perf_counter()
+        obj = self._build_model(de_json, key, data, cache_type)
+        self._record_build(de_json, started)
+        return obj
+
+    def _build_model(self, de_json: Callable[[Any, "BaseRoyaleAPIClient"], Any], key: str, data: Any,
+                     cache_type: str = "dynamic") -> Any:
+        if self._models_cache is None or self._models_cache[cache_type] is None:
+            return de_json(data, self)
+        models_cache = self._models_cache[cache_type]
+        entry = models_cache.get(key)
+        # The model is only reused if it was built from the very object that is cached now, a fetch replaces it
+        if entry is not None and entry[0] is data:
+            return entry[1]
+        obj = de_json(data, self)
+        _freeze(obj)
+        models_cache[key] = (data, obj)
+        return obj
+
+    def _build_each(self, de_json: Callable[[Any, "BaseRoyaleAPIClient"], Any], keys: List[str],
+                    data: Dict or List[Dict], cache_type: str = "dynamic") -> List[Any]:
+        return [self._build(de_json, key, d, cache_type) for key, d in zip(keys, [data] if len(keys) == 1 else data)]
+
+    def _chunk_tags(self, tags: List[str]) -> List[List[str]]:
+        size = self.max_tags_per_request
+        return [tags[i:i + size] for i in range(0, len(tags), size)]
+
+    @staticmethod
+    def _merge_chunks(results: List[Dict or List[Dict]]) -> List[Dict]:
+        # A batch of one tag comes back as a single object instead of a list
+        return list(chain(*([r] if isinstance(r, dict) else r for r in results)))
+
+    def _url(self, endpoint: str) -> str:
+        return f"{self.api_base_url}{quote(endpoint)}"
 
     @staticmethod
-    def _parse(response: requests.Response, return_text: bool = False) -> str or Dict or List[Dict]:
-        if return_text:
-            return response.text
+    def _params(params: Optional[Dict[Any, Any]]) -> Dict[Any, Any]:
+        return {k: v for k, v in (params or {}).items() if v is not None}
+
+    def _parse(self, content: bytes, return_text: bool = False) -> str or Dict or List[Dict]:
         try:
-            data = json.loads(response.content.decode("utf-8"))
+            if return_text:
+                return content.decode("utf-8")
+            data = self.json_loads(content)
         except (ValueError, UnicodeDecodeError):
             raise ServerResponseInvalid("Invalid server response") from None
         if isinstance(data, dict) and "error" in data:
@@ -105,109 +333,442 @@ class RoyaleAPIClient:
             raise RoyaleAPIError(message) from None
         return data
 
+    @staticmethod
+    def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+        value = headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:  # An HTTP date
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _handle_response(self, content: bytes, headers: Mapping[str, str],
+                         return_text: bool = False) -> str or Dict or List[Dict]:
+        try:
+            data = self._parse(content, return_text)
+        except TooManyRequests as e:
+            e.retry_after = self._retry_after(headers)
+            if self.rate_limiter is not None:
+                self.rate_limiter.limited(e.retry_after)
+            raise
+        if self.rate_limiter is not None:
+            self.rate_limiter.succeeded()
+        return data
+
+    def _record_request(self, endpoint: str, started: float, received: Optional[float] = None,
+                        headers: Optional[Mapping[str, str]] = None, content: bytes = b"",
+                        error: Optional[BaseException] = None, not_modified: bool = False) -> None:
+        # started and received are perf_counter() values from when the request was sent and its response read,
+        # the time since is spent decoding it
+        if self.metrics is None:
+            return
+        now = time.perf_counter()
+        size = int((headers or {}).get("Content-Length") or len(content))  # As sent, so compressed if it was
+        self.metrics.record_request(RequestRecord(endpoint_template(endpoint), (received or now) - started,
+                                                  now - received if received else 0.0, size, not_modified, error))
+
+    def _build_streamed(self, de_json: Callable[[Any, "BaseRoyaleAPIClient"], Any], data: Any) -> Any:
+        if self.metrics is None:
+            return de_json(data, self)
+        started = time.perf_counter()
+        obj = de_json(data, self)
+        self._record_build(de_json, started)
+        return obj
+
+    def _record_build(self, de_json: Callable[[Any, "BaseRoyaleAPIClient"], Any], started: float) -> None:
+        self.metrics.record_build(getattr(de_json, "__self__", de_json).__name__, time.perf_counter() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        # What the metrics recorded, with the evictions counted by the cache backends
+        stats = self.metrics.stats() if self.metrics is not None else {"endpoints": {}, "models": {}, "cache": {}}
+        for cache_type, cache in (self._cache or {}).items():
+            if cache is not None:
+                stats["cache"].setdefault(cache_type, {"hits": 0, "misses": 0})["evictions"] = cache.evictions
+        return stats
+
+    @staticmethod
+    def _feed(parser: JSONArrayParser, chunk: Optional[bytes] = None) -> List[Any]:
+        # Elements completed by a chunk of a streamed response, chunk=None once the response has been read
+        try:
+            return parser.close() if chunk is None else parser.feed(chunk)
+        except ValueError:
+            raise ServerResponseInvalid("Invalid server response") from None
+
+
+class _StreamRecord:
+    # Records a streamed response for the metrics once it is over, with the latency until its headers
+    # and the time spent parsing its chunks as they came in
+    def __init__(self, client: BaseRoyaleAPIClient, endpoint: str) -> None:
+        self.client = client
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.latency = None
+        self.decode_time = 0.0
+        self.size = 0
+        self.content_length = None
+        self.error = None
+
+    def received(self, headers: Mapping[str, str]) -> None:
+        self.latency = time.perf_counter() - self.started
+        self.content_length = headers.get("Content-Length")
+
+    def feed(self, parser: JSONArrayParser, chunk: Optional[bytes] = None) -> List[Any]:
+        if self.client.metrics is None:
+            return self.client._feed(parser, chunk)
+        started = time.perf_counter()
+        try:
+            return self.client._feed(parser, chunk)
+        finally:
+            self.size += len(chunk or b"")
+            self.decode_time += time.perf_counter() - started
+
+    def done(self) -> None:
+        if self.client.metrics is None:
+            return
+        latency = self.latency if self.latency is not None else time.perf_counter() - self.started
+        size = int(self.content_length or self.size)
+        self.client.metrics.record_request(RequestRecord(endpoint_template(self.endpoint), latency, self.decode_time,
+                                                         size, False, self.error))
+
+
+class RoyaleAPIClient(BaseRoyaleAPIClient):
+    _executor: Optional[ThreadPoolExecutor] = None  # Created on the first request that has to be split into batches
+
+    def _create_transport(self) -> RequestsTransport:
+        return RequestsTransport(pool_size=min(self.max_connections, self.max_connections_per_host),
+                                 thread_safe=self.thread_safe, tcp_nodelay=self.tcp_nodelay,
+                                 tcp_keepalive=self.tcp_keepalive)
+
+    def _refresh_in_background(self, key: str, refresh: Callable[[], Any]) -> None:
+        with self._in_flight_lock:
+            if key in self._refreshing or key in self._in_flight:
+                return
+            self._refreshing[key] = None
+
+        def run() -> None:
+            try:
+                refresh()
+            except Exception:  # The data is fetched again on the next lookup once the grace window is over
+                pass
+            finally:
+                with self._in_flight_lock:
+                    self._refreshing.pop(key, None)
+
+        self._get_executor().submit(run)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def __enter__(self) -> "RoyaleAPIClient":
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException],
+                 exc_tb: Optional[TracebackType]) -> None:  # goddamn typing
+        self.close()
+
+    def close(self) -> None:
+        self.transport.close()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _request(self, endpoint: str, params: Optional[Dict[Any, Any]] = None, return_text: bool = False,
+                 timeout: Optional[int] = None, cache_key: Optional[str] = None,
+                 cache_type: str = "dynamic") -> Dict or List[Dict]:
+        # With the cache key of the response, the request is conditional if it has been fetched before
+        def send() -> Dict or List[Dict]:
+            return self._send(endpoint, params, return_text, timeout, cache_key, cache_type)
+
+        return send() if self.retry_policy is None else self.retry_policy.call(send, endpoint)
+
+    def _send(self, endpoint: str, params: Optional[Dict[Any, Any]] = None, return_text: bool = False,
+              timeout: Optional[int] = None, cache_key: Optional[str] = None,
+              cache_type: str = "dynamic") -> Dict or List[Dict]:
+        validators = self._get_validators(cache_key, cache_type)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            response = self.transport.get(self._url(endpoint), self._params(params), self._request_headers(validators),
+                                          timeout)
+        except RequestTimeout as e:
+            self._record_request(endpoint, started, error=e)
+            raise
+        received = time.perf_counter()
+        if response.status == 304 and validators is not None:
+            self._record_request(endpoint, started, received, response.headers, not_modified=True)
+            return self._not_modified(cache_key, cache_type, validators)
+        try:
+            data = self._handle_response(response.content, response.headers, return_text)
+        except RoyaleAPIError as e:
+            self._record_request(endpoint, started, received, response.headers, response.content, e)
+            raise
+        self._record_request(endpoint, started, received, response.headers, response.content)
+        self._save_validators(cache_key, cache_type, response.headers, data)
+        return data
+
+    def _stream(self, endpoint: str, params: Optional[Dict[Any, Any]] = None,
+                timeout: Optional[int] = None) -> Iterator[Dict]:
+        # Recorded with the latency until the response headers, and the time spent parsing its chunks
+        parser = JSONArrayParser(self._parse)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        stream = _StreamRecord(self, endpoint)
+        try:
+            with self.transport.stream(self._url(endpoint), self._params(params), self._headers,
+                                       timeout) as response:
+                stream.received(response.headers)
+                if response.status >= 400:  # Error bodies are small and read whole
+                    data = self._handle_response(response.read(), response.headers)
+                    yield from ([data] if isinstance(data, dict) else data)
+                    return
+                for chunk in response.iter_chunks():
+                    yield from stream.feed(parser, chunk)
+            yield from stream.feed(parser)
+        except RoyaleAPIError as e:
+            stream.error = e
+            raise
+        finally:  # Also when the caller stops iterating early
+            stream.done()
+
+    def _request_with_tags(self, endpoint: str, tags: List[str], params: Optional[Dict[Any, Any]] = None,
+                           timeout: Optional[int] = None) -> Dict or List[Dict]:
+        chunks = self._chunk_tags(tags)
+        if len(chunks) == 1:
+            return self._request(endpoint.format(",".join(tags)), params=params, timeout=timeout)
+        results = self._get_executor().map(
+            lambda chunk: self._request(endpoint.format(",".join(chunk)), params=params, timeout=timeout), chunks)
+        return self._merge_chunks(results)
+
+    def _single_flight(self, keys: List[str], fetch: Callable[[List[int]], List[Any]]) -> List[Any]:
+        # Only the keys that no other thread is already fetching are passed to fetch(), by index,
+        # the others wait for the request in flight and share its result or exception
+        owned, futures = [], []
+        with self._in_flight_lock:
+            for i, key in enumerate(keys):
+                future = self._in_flight.get(key)
+                if future is None:
+                    future = self._in_flight[key] = Future()
+                    owned.append(i)
+                futures.append(future)
+        if owned:
+            fetched, error = None, None
+            try:
+                fetched = self._check_fetched(fetch(owned), owned)
+            except BaseException as e:
+                error = e
+                raise
+            finally:  # Every owned key is resolved, or its waiters and the later lookups of it would hang
+                with self._in_flight_lock:
+                    for j, i in enumerate(owned):
+                        future = self._in_flight.pop(keys[i])
+                        if error is None:
+                            future.set_result(fetched[j])
+                        else:
+                            future.set_exception(error)
+        return [future.result() for future in futures]
+
     def _get_methods_base(self, endpoint: str, key: str, use_cache: bool, cache_type: str = "dynamic",
                           return_text: bool = False, timeout: Optional[int] = None, **kwargs) -> Dict or List[Dict]:
+        def fetch(_: List[int]) -> List[Any]:
+            data = self._request(endpoint, params=kwargs, return_text=return_text, timeout=timeout,
+                                 cache_key=key, cache_type=cache_type)
+            return self._cache_fetched([key], data, cache_type)
+
         try:
-            assert self._cache and use_cache and self._cache[cache_type] is not None
-            self._purge_cache(cache_type)
-            data = self._fetch_from_cache(key, cache_type)
-        except (AssertionError, KeyError):
-            data = self._request(endpoint, params=kwargs, return_text=return_text, timeout=timeout)
-            if self._cache and self._cache[cache_type] is not None:
-                self._save_in_cache(key, data, cache_type)
+            data = self._get_cached(key, use_cache, cache_type)
+        except KeyError:
+            data = self._single_flight([key], fetch)[0]
+        else:
+            self._revalidate(key, cache_type, lambda: self._single_flight([key], fetch))
         return data
 
     def _get_methods_with_tags_base(self, endpoint: str, tags: List[str], keys: List[str],
                                     use_cache: bool, cache_type: str = "dynamic",
                                     timeout: Optional[int] = None, **kwargs) -> Dict or List[Dict]:
+        def fetch(tags_to_fetch: List[str], keys_to_fetch: List[str]) -> List[Any]:
+            if len(tags_to_fetch) == 1:  # Only the response for a single tag can be requested conditionally
+                data = self._request(endpoint.format(tags_to_fetch[0]), params=kwargs, timeout=timeout,
+                                     cache_key=keys_to_fetch[0], cache_type=cache_type)
+            else:
+                data = self._request_with_tags(endpoint, tags_to_fetch, params=kwargs, timeout=timeout)
+            return self._cache_fetched(keys_to_fetch, data, cache_type)
+
+        def refresh(tag: str, key: str) -> Callable[[], List[Any]]:
+            return lambda: self._single_flight([key], lambda _: fetch([tag], [key]))
+
+        found, missing_tags, missing_keys = self._get_cached_partially(tags, keys, use_cache, cache_type)
+        if self._fetched_at is not None:
+            for tag, key in zip(tags, keys):
+                if key in found:
+                    self._revalidate(key, cache_type, refresh(tag, key))
+        fetched = None
+        if missing_tags:
+            fetched = self._single_flight(missing_keys, lambda indexes: fetch([missing_tags[i] for i in indexes],
+                                                                              [missing_keys[i] for i in indexes]))
+            fetched = fetched[0] if len(fetched) == 1 else fetched
+        return self._merge_cached(keys, found, missing_keys, fetched)
+
+    def _iter_methods_base(self, endpoint: str, key: str, use_cache: bool, de_json: Callable[[Dict, Any], Any],
+                           timeout: Optional[int] = None, **kwargs) -> Iterator[Any]:
+        # Streamed responses are not cached, as that would mean holding all of them in memory
         try:
-            assert self._cache and use_cache and self._cache[cache_type] is not None
-            self._purge_cache(cache_type)
-            data = self._fetch_from_cache(keys, cache_type)
-            if len(data) == 1:
-                data = data[0]
-        except (AssertionError, KeyError):
-            endpoint = endpoint.format(",".join(tags))
-            data = self._request(endpoint, params=kwargs, timeout=timeout)
-            if self._cache and self._cache[cache_type] is not None:
-                self._save_in_cache(keys, data, cache_type)
-        return data
+            data = self._get_cached(key, use_cache)
+        except KeyError:
+            data = self._stream(endpoint, params=kwargs, timeout=timeout)
+        for obj in ([data] if isinstance(data, dict) else data):
+            yield self._build_streamed(de_json, obj)
+
+    @staticmethod
+    def _get_chunk(get: Callable[[List[str]], List[Any]], chunk: List[str]) -> List[BulkResult]:
+        given, valid, results = split_valid(chunk)
+        if not valid:
+            return results
+        try:
+            return results + [BulkResult(tag, obj, None) for tag, obj in zip(given, get(valid))]
+        except RoyaleAPIError as e:
+            if len(valid) == 1 or not isinstance(e, TAG_ERRORS):
+                return results + [BulkResult(tag, None, e) for tag in given]
+        for tag, valid_tag in zip(given, valid):  # Only the tags causing the error are reported with it
+            try:
+                results.append(BulkResult(tag, get([valid_tag])[0], None))
+            except RoyaleAPIError as e:
+                results.append(BulkResult(tag, None, e))
+        return results
+
+    def _get_many(self, get: Callable[[List[str]], List[Any]], tags: Iterable[str], concurrency: Optional[int],
+                  on_progress: Optional[Callable[[BulkProgress], Any]]) -> Iterator[BulkResult]:
+        # Batches are requested by a pool of their own, so that the executor stays free for background refreshes.
+        # Twice as many batches as workers are submitted ahead, the tags are never all read into memory
+        concurrency = concurrency or self.max_workers
+        assert concurrency > 0
+        tracker = BulkTracker(tags, on_progress)
+        chunks = chunk_tags(tags, self.max_tags_per_request)
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        pending = set()
+        try:
+            while True:
+                for chunk in islice(chunks, 2 * concurrency - len(pending)):
+                    pending.add(executor.submit(self._get_chunk, get, chunk))
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from tracker.update(future.result())
+        finally:  # Also when the caller stops iterating early
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
 
     def get_player(self, player_tags: str or List[str], *args: str, use_cache: bool = True,
                    timeout: Optional[int] = None) -> Player or List[Player]:
         tags, given_single_tag = self._tag_check(player_tags, args)
         keys = [f"p{tag}" for tag in tags]
         data = self._get_methods_with_tags_base("player/{}", tags, keys, use_cache, timeout=timeout)
-        return Player.de_json(data, self) if given_single_tag else Player.de_list(data, self)
+        return (self._build(Player.de_json, keys[0], data) if given_single_tag
+                else self._build_each(Player.de_json, keys, data))
+
+    def get_players_many(self, player_tags: Iterable[str], use_cache: bool = True, timeout: Optional[int] = None,
+                         concurrency: Optional[int] = None,
+                         on_progress: Optional[Callable[[BulkProgress], Any]] = None) -> Iterator[BulkResult]:
+        return self._get_many(lambda tags: self.get_player(tags, use_cache=use_cache, timeout=timeout),
+                              player_tags, concurrency, on_progress)
 
     def get_player_chests(self, player_tags: str or List[str], *args: str, use_cache: bool = True,
                           timeout: Optional[int] = None) -> ChestCycle or List[ChestCycle]:
         tags, given_single_tag = self._tag_check(player_tags, args)
         keys = [f"pc{tag}" for tag in tags]
         data = self._get_methods_with_tags_base("player/{}/chests", tags, keys, use_cache, timeout=timeout)
-        return ChestCycle.de_json(data, self) if given_single_tag else ChestCycle.de_list(data, self)
+        return (self._build(ChestCycle.de_json, keys[0], data) if given_single_tag
+                else self._build_each(ChestCycle.de_json, keys, data))
 
     def get_player_battles(self, player_tags: str or List[str], *args: str, use_cache: bool = True,
-                           timeout: Optional[int] = None) -> List[Battle]:
+                           timeout: Optional[int] = None, columns: bool = False) -> List[Battle] or BattleColumns:
         tags = self._tag_check(player_tags, args)[0]
         keys = [f"pb{tag}" for tag in tags]
-        if self._cache and self._cache["dynamic"]:
-            self._purge_cache()
         # Different as all battles of diff players are merged into same list if multiple players are provided
         if len(tags) == 1:
             data = self._get_methods_with_tags_base("player/{}/battle", tags, keys, use_cache, timeout=timeout)
-        elif self._cache and self._cache["dynamic"] is not None and all(k in self._cache["dynamic"] for k in keys):
+            return BattleColumns(data) if columns else self._build(Battle.de_list, keys[0], data)
+        if self._all_cached(keys, use_cache):
             data = list(chain(*self._fetch_from_cache(keys)))
         else:
-            data = self._request(f"player/{','.join(tags)}/battle", timeout=timeout)
-        return Battle.de_list(data, self)
+            data = self._merge_chunks([self._request_with_tags("player/{}/battle", tags, timeout=timeout)])
+        return BattleColumns(data) if columns else Battle.de_list(data, self)
 
     def get_clan(self, clan_tags: str or List[str], *args: str, use_cache: bool = True,
                  timeout: Optional[int] = None) -> Clan or List[Clan]:
         tags, given_single_tag = self._tag_check(clan_tags, args)
         keys = [f"c{tag}" for tag in tags]
         data = self._get_methods_with_tags_base("clan/{}", tags, keys, use_cache, timeout=timeout)
-        return Clan.de_json(data, self) if given_single_tag else Clan.de_list(data, self)
+        return (self._build(Clan.de_json, keys[0], data) if given_single_tag
+                else self._build_each(Clan.de_json, keys, data))
+
+    def get_clans_many(self, clan_tags: Iterable[str], use_cache: bool = True, timeout: Optional[int] = None,
+                       concurrency: Optional[int] = None,
+                       on_progress: Optional[Callable[[BulkProgress], Any]] = None) -> Iterator[BulkResult]:
+        return self._get_many(lambda tags: self.get_clan(tags, use_cache=use_cache, timeout=timeout),
+                              clan_tags, concurrency, on_progress)
 
     def get_clan_battles(self, clan_tag: str, battle_type: str = ClanBattleType.CLANMATE, use_cache: bool = True,
-                         timeout: Optional[int] = None) -> List[Battle]:
+                         timeout: Optional[int] = None, columns: bool = False) -> List[Battle] or BattleColumns:
         if battle_type not in (ClanBattleType.ALL, ClanBattleType.CLANMATE, ClanBattleType.WAR):
             raise ValueError("Invalid battle type")
         tag = validate_tag(clan_tag)
         key = f"cb{battle_type[0].lower()}{tag}"
         data = self._get_methods_with_tags_base("clan/{}/battle", [tag], [key], use_cache,
                                                 timeout=timeout, type=battle_type)
-        return Battle.de_list(data, self)
+        return BattleColumns(data) if columns else self._build(Battle.de_list, key, data)
+
+    def iter_clan_battles(self, clan_tag: str, battle_type: str = ClanBattleType.CLANMATE, use_cache: bool = True,
+                          timeout: Optional[int] = None) -> Iterator[Battle]:
+        if battle_type not in (ClanBattleType.ALL, ClanBattleType.CLANMATE, ClanBattleType.WAR):
+            raise ValueError("Invalid battle type")
+        tag = validate_tag(clan_tag)
+        key = f"cb{battle_type[0].lower()}{tag}"
+        return self._iter_methods_base(f"clan/{tag}/battle", key, use_cache, Battle.de_json,
+                                       timeout=timeout, type=battle_type)
 
     def get_clan_war(self, clan_tag: str, use_cache: bool = True, timeout: Optional[int] = None) -> ClanWar:
         tag = validate_tag(clan_tag)
         key = f"cw{tag}"
         data = self._get_methods_with_tags_base("clan/{}/war", [tag], [key], use_cache, timeout=timeout)
-        return ClanWar.de_json(data, self)
+        return self._build(ClanWar.de_json, key, data)
 
     def get_clan_war_log(self, clan_tag: str, use_cache: bool = True, timeout: Optional[int] = None) -> List[ClanWar]:
         tag = validate_tag(clan_tag)
         key = f"cwl{tag}"
         data = self._get_methods_with_tags_base("clan/{}/warlog", [tag], [key], use_cache, timeout=timeout)
-        return ClanWar.de_list(data, self)
+        return self._build(ClanWar.de_list, key, data)
 
     def get_clan_history(self, clan_tag: str, use_cache: bool = True, timeout: Optional[int] = None) -> Dict[str, Clan]:
         tag = validate_tag(clan_tag)
         key = f"ch{tag}"
         data = self._get_methods_with_tags_base("clan/{}/history", [tag], [key], use_cache, timeout=timeout)
-        return {k: Clan.de_json(v, self) for k, v in data.items()}
+        return self._build(lambda d, client: {k: Clan.de_json(v, client) for k, v in d.items()}, key, data)
 
     def get_clan_tracking(self, clan_tags: str or List[str], *args: str, use_cache: bool = True,
                           timeout: Optional[int] = None) -> ClanTracking or List[ClanTracking]:
         tags, given_single_tag = self._tag_check(clan_tags, args)
         keys = [f"ct{tag}" for tag in tags]
         data = self._get_methods_with_tags_base("clan/{}/tracking", tags, keys, use_cache, timeout=timeout)
-        return ClanTracking.de_json(data, self) if given_single_tag else ClanTracking.de_list(data, self)
+        return (self._build(ClanTracking.de_json, keys[0], data) if given_single_tag
+                else self._build_each(ClanTracking.de_json, keys, data))
 
     def track_clan(self, clan_tags: str or List[str], *args: str, timeout: Optional[int] = None) -> bool:
         tags = self._tag_check(clan_tags, args)[0]
-        data = self._request(f"clan/{','.join(tags)}/track", timeout=timeout)
-        return data["success"]
+        data = self._request_with_tags("clan/{}/track", tags, timeout=timeout)
+        return all(d["success"] for d in self._merge_chunks([data]))
 
     def search_clans(self, name: Optional[str] = None, min_score: Optional[int] = None,
                      min_members: Optional[int] = None, max_members: Optional[int] = None,
@@ -226,14 +787,15 @@ class RoyaleAPIClient:
                   "maxMembers": max_members, "locationId": location_id}
         key = f"cs?n={name}&ms={min_score}&mim={min_members}&mam={max_members}&li={location_id}"
         data = self._get_methods_base("clan/search", key, use_cache, timeout=timeout, **kwargs)
-        return Clan.de_list(data, self)
+        return self._build(Clan.de_list, key, data)
 
     def get_tournament(self, tournament_tags: str or List[str], *args: str, use_cache: bool = True,
                        timeout: Optional[int] = None) -> Tournament:
         tags, given_single_tag = self._tag_check(tournament_tags, args)
         keys = [f"t{tag}" for tag in tags]
         data = self._get_methods_with_tags_base("tournament/{}", tags, keys, use_cache, timeout=timeout)
-        return Tournament.de_json(data, self) if given_single_tag else Tournament.de_list(data, self)
+        return (self._build(Tournament.de_json, keys[0], data) if given_single_tag
+                else self._build_each(Tournament.de_json, keys, data))
 
     def get_known_tournaments(self, filter_1k: bool = False, filter_open: bool = False, filter_full: bool = False,
                               filter_in_prep: bool = False, filter_joinable: bool = False, use_cache: bool = True,
@@ -247,13 +809,27 @@ class RoyaleAPIClient:
         }
         key = f"tk?1k={filter_1k}&o={filter_open}&f={filter_full}&p={filter_in_prep}&j={filter_joinable}"
         data = self._get_methods_base("tournament/known", key, use_cache, timeout=timeout, **kwargs)
-        return Tournament.de_list(data, self)
+        return self._build(Tournament.de_list, key, data)
+
+    def iter_known_tournaments(self, filter_1k: bool = False, filter_open: bool = False, filter_full: bool = False,
+                               filter_in_prep: bool = False, filter_joinable: bool = False, use_cache: bool = True,
+                               timeout: Optional[int] = None) -> Iterator[Tournament]:
+        kwargs = {
+            "1k": int(filter_1k),
+            "open": int(filter_open),
+            "full": int(filter_full),
+            "inprep": int(filter_in_prep),
+            "joinable": int(filter_joinable)
+        }
+        key = f"tk?1k={filter_1k}&o={filter_open}&f={filter_full}&p={filter_in_prep}&j={filter_joinable}"
+        return self._iter_methods_base("tournament/known", key, use_cache, Tournament.de_json, timeout=timeout,
+                                       **kwargs)
 
     def search_tournaments(self, name: str, use_cache: bool = True, timeout: Optional[int] = None) -> List[Tournament]:
         assert name, "Parameter 'name' cannot be empty"
         key = f"ts?n={name}"
         data = self._get_methods_base("tournament/search", key, use_cache, timeout=timeout, name=name)
-        return Tournament.de_list(data, self)
+        return self._build(Tournament.de_list, key, data)
 
     def get_top_players(self, location_key: str = None, use_cache: bool = True,
                         timeout: Optional[int] = None) -> List[Player]:
@@ -263,7 +839,16 @@ class RoyaleAPIClient:
             endpoint += "/" + location_key
         key = f"tp?lk={location_key}"
         data = self._get_methods_base(endpoint, key, use_cache, timeout=timeout)
-        return Player.de_list(data, self)
+        return self._build(Player.de_list, key, data)
+
+    def iter_top_players(self, location_key: str = None, use_cache: bool = True,
+                         timeout: Optional[int] = None) -> Iterator[Player]:
+        assert location_key is None or len(location_key) == 2, "Parameter 'location_key' is not valid"  # Countries only
+        endpoint = "top/player"
+        if location_key:
+            endpoint += "/" + location_key
+        key = f"tp?lk={location_key}"
+        return self._iter_methods_base(endpoint, key, use_cache, Player.de_json, timeout=timeout)
 
     def get_top_clans(self, location_key: str = None, use_cache: bool = True,
                       timeout: Optional[int] = None) -> List[Clan]:
@@ -274,7 +859,7 @@ class RoyaleAPIClient:
             endpoint += "/" + location_key
         key = f"tc?lk={location_key}"
         data = self._get_methods_base(endpoint, key, use_cache, timeout=timeout)
-        return Clan.de_list(data, self)
+        return self._build(Clan.de_list, key, data)
 
     def get_top_war_clans(self, location_key: str = None, use_cache: bool = True,
                           timeout: Optional[int] = None) -> List[Clan]:
@@ -285,27 +870,39 @@ class RoyaleAPIClient:
             endpoint += "/" + location_key
         key = f"tw?lk={location_key}"
         data = self._get_methods_base(endpoint, key, use_cache, timeout=timeout)
-        return Clan.de_list(data, self)
+        return self._build(Clan.de_list, key, data)
 
     def get_popular_players(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Player]:
         key = "pp"
         data = self._get_methods_base("popular/player", key, use_cache, timeout=timeout)
-        return Player.de_list(data, self)
+        return self._build(Player.de_list, key, data)
+
+    def iter_popular_players(self, use_cache: bool = True, timeout: Optional[int] = None) -> Iterator[Player]:
+        return self._iter_methods_base("popular/player", "pp", use_cache, Player.de_json, timeout=timeout)
 
     def get_popular_clans(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Clan]:
         key = "pc"
         data = self._get_methods_base("popular/clan", key, use_cache, timeout=timeout)
-        return Clan.de_list(data, self)
+        return self._build(Clan.de_list, key, data)
+
+    def iter_popular_clans(self, use_cache: bool = True, timeout: Optional[int] = None) -> Iterator[Clan]:
+        return self._iter_methods_base("popular/clan", "pc", use_cache, Clan.de_json, timeout=timeout)
 
     def get_popular_tournaments(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Tournament]:
         key = "pt"
         data = self._get_methods_base("popular/tournament", key, use_cache, timeout=timeout)
-        return Tournament.de_list(data, self)
+        return self._build(Tournament.de_list, key, data)
+
+    def iter_popular_tournaments(self, use_cache: bool = True, timeout: Optional[int] = None) -> Iterator[Tournament]:
+        return self._iter_methods_base("popular/tournament", "pt", use_cache, Tournament.de_json, timeout=timeout)
 
     def get_popular_decks(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[Deck]:
         key = "pd"
         data = self._get_methods_base("popular/deck", key, use_cache, timeout=timeout)
-        return Deck.de_list(data, self)
+        return self._build(Deck.de_list, key, data)
+
+    def iter_popular_decks(self, use_cache: bool = True, timeout: Optional[int] = None) -> Iterator[Deck]:
+        return self._iter_methods_base("popular/deck", "pd", use_cache, Deck.de_json, timeout=timeout)
 
     def get_version(self, use_cache: bool = True, timeout: Optional[int] = None) -> str:
         return self._get_methods_base("version", "v", use_cache, cache_type="server_info",
@@ -317,7 +914,7 @@ class RoyaleAPIClient:
 
     def get_status(self, use_cache: bool = True, timeout: Optional[int] = None) -> ServerStatus:
         data = self._get_methods_base("status", "s", use_cache, cache_type="server_info", timeout=timeout)
-        return ServerStatus.de_json(data, self)
+        return self._build(ServerStatus.de_json, "s", data, cache_type="server_info")
 
     def get_endpoints(self, use_cache: bool = True, timeout: Optional[int] = None) -> List[str]:
         return self._get_methods_base("endpoints", "e", use_cache, cache_type="constants", timeout=timeout)
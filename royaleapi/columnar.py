@@ -0,0 +1,103 @@
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    import numpy
+except ImportError:  # Optional dependency, only needed by BattleColumns.to_numpy
+    numpy = None
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Optional dependency, only needed by BattleColumns.to_arrow and to_parquet
+    pyarrow = None
+
+TEAM_SIZE = 2  # Players per side in a 2v2 battle, sides of 1v1 battles are padded
+DECK_SIZE = 8
+TAG_LENGTH = 12
+
+# Each row is one battle seen from the team, the player or clan members whose battles were requested.
+# Missing players are padded with "" tags and decks of 0 card ids
+BATTLE_DTYPE = [("utc_time", "i8"), ("battle_type", "U16"), ("mode", "U32"), ("team_size", "i1"), ("result", "i1"),
+                ("team_crowns", "i1"), ("opponent_crowns", "i1"), ("team_trophy_change", "i2"),
+                ("opponent_trophy_change", "i2"), ("team_tags", f"U{TAG_LENGTH}", (TEAM_SIZE,)),
+                ("opponent_tags", f"U{TAG_LENGTH}", (TEAM_SIZE,)), ("team_cards", "i4", (TEAM_SIZE, DECK_SIZE)),
+                ("opponent_cards", "i4", (TEAM_SIZE, DECK_SIZE))]
+BATTLE_COLUMNS = tuple(column[0] for column in BATTLE_DTYPE)
+
+_NO_DECK = (0,) * DECK_SIZE
+
+
+class BattleColumns:
+    # Battles converted from the API responses straight to rows of plain values, without building the models, to be
+    # turned into arrays in one go. Decks are kept as card ids, card_keys and card_elixir map them to the card data
+    def __init__(self, battles: Iterable[Dict[str, Any]] = ()) -> None:
+        self.rows: List[Tuple[Any, ...]] = []
+        self.card_keys: Dict[int, str] = {}
+        self.card_elixir: Dict[int, int] = {}
+        self.extend(battles)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(battles={len(self.rows)})"
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _side(self, players: List[Dict[str, Any]]) -> Tuple[int, Tuple[str, ...], Tuple[Tuple[int, ...], ...]]:
+        tags, decks = [], []
+        card_keys, card_elixir = self.card_keys, self.card_elixir
+        for player in players[:TEAM_SIZE]:
+            tags.append(player["tag"])
+            deck = []
+            for card in (player.get("deck") or ())[:DECK_SIZE]:
+                deck.append(card["id"])
+                card_keys[card["id"]] = card["key"]
+                card_elixir[card["id"]] = card.get("elixir") or 0
+            decks.append(tuple(deck) + _NO_DECK[len(deck):])
+        padding = TEAM_SIZE - len(tags)
+        trophy_change = (players[0].get("trophyChange") or 0) if players else 0
+        return trophy_change, tuple(tags) + ("",) * padding, tuple(decks) + (_NO_DECK,) * padding
+
+    def extend(self, battles: Iterable[Dict[str, Any]]) -> None:
+        # Battles as sent by the API, e.g. the responses of several get_player_battles calls chained together
+        append = self.rows.append
+        for data in battles:
+            team_trophy_change, team_tags, team_cards = self._side(data.get("team") or [])
+            opponent_trophy_change, opponent_tags, opponent_cards = self._side(data.get("opponent") or [])
+            append((data["utcTime"], data.get("type") or "", (data.get("mode") or {}).get("name") or "",
+                    data.get("teamSize") or 0, data.get("winner") or 0, data.get("teamCrowns") or 0,
+                    data.get("opponentCrowns") or 0, team_trophy_change, opponent_trophy_change, team_tags,
+                    opponent_tags, team_cards, opponent_cards))
+
+    def columns(self) -> Dict[str, Tuple[Any, ...]]:
+        if not self.rows:
+            return {name: () for name in BATTLE_COLUMNS}
+        return dict(zip(BATTLE_COLUMNS, zip(*self.rows)))
+
+    def to_numpy(self) -> "numpy.ndarray":
+        # A structured array, e.g. wins = battles["team_crowns"] > battles["opponent_crowns"]
+        if numpy is None:
+            raise ImportError("numpy is required for BattleColumns.to_numpy(), "
+                              "install it with 'pip install clashroyaleapi[columnar]'")
+        return numpy.array(self.rows, dtype=BATTLE_DTYPE)
+
+    def to_arrow(self) -> "pyarrow.Table":
+        # The same columns as to_numpy(), card_keys and card_elixir are saved as JSON in the schema metadata
+        if pyarrow is None:
+            raise ImportError("pyarrow is required for BattleColumns.to_arrow(), "
+                              "install it with 'pip install clashroyaleapi[columnar]'")
+        tags = pyarrow.list_(pyarrow.string(), TEAM_SIZE)
+        cards = pyarrow.list_(pyarrow.list_(pyarrow.int32(), DECK_SIZE), TEAM_SIZE)
+        schema = pyarrow.schema([("utc_time", pyarrow.int64()), ("battle_type", pyarrow.string()),
+                                 ("mode", pyarrow.string()), ("team_size", pyarrow.int8()),
+                                 ("result", pyarrow.int8()), ("team_crowns", pyarrow.int8()),
+                                 ("opponent_crowns", pyarrow.int8()), ("team_trophy_change", pyarrow.int16()),
+                                 ("opponent_trophy_change", pyarrow.int16()), ("team_tags", tags),
+                                 ("opponent_tags", tags), ("team_cards", cards), ("opponent_cards", cards)],
+                                metadata={"card_keys": json.dumps(self.card_keys),
+                                          "card_elixir": json.dumps(self.card_elixir)})
+        return pyarrow.table({name: list(column) for name, column in self.columns().items()}, schema=schema)
+
+    def to_parquet(self, path: str, **kwargs) -> None:
+        # kwargs are passed to pyarrow.parquet.write_table, e.g. compression="zstd"
+        table = self.to_arrow()  # Raises the ImportError first if pyarrow is not installed
+        pyarrow.parquet.write_table(table, path, **kwargs)
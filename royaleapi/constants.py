@@ -1,4 +1,10 @@
 VALID_TAG_CHARS = "0289CGJLPQRUVY"
+MAX_TAGS_PER_REQUEST = 7  # Larger tag lists are split into batches of this size
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read at a time by the iter_* methods
+VALIDATORS_TIMEOUT_FACTOR = 10  # ETags are kept this many times longer than the cached responses
+HOT_KEY_READS = 2  # Reads of a cached response before refresh_ahead applies to it
+# Upper bounds in seconds of the request latency histogram buckets, slower requests are counted in a last one
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
 
 
 class Chest:
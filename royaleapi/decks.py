@@ -0,0 +1,208 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from royaleapi.columnar import DECK_SIZE, BattleColumns
+from royaleapi.models import Card, Deck
+
+try:
+    import numpy
+except ImportError:  # Optional dependency, needed by everything in this module
+    numpy = None
+
+WORD_BITS = 64
+CARD_CAPACITY = 256  # Cards a CardIndex holds by default, about twice as many as the game has
+
+# Number of set bits of every byte, for numpy versions without bitwise_count
+_BYTE_BITS = None if numpy is None else numpy.array([bin(i).count("1") for i in range(256)], dtype=numpy.uint8)
+
+
+def _require_numpy() -> None:
+    if numpy is None:
+        raise ImportError("numpy is required for royaleapi.decks, "
+                          "install it with 'pip install clashroyaleapi[columnar]'")
+
+
+def popcount(words: "numpy.ndarray") -> "numpy.ndarray":
+    # Set bits of each row of uint64 words
+    if hasattr(numpy, "bitwise_count"):
+        return numpy.bitwise_count(words).sum(axis=-1, dtype=numpy.int64)
+    return _BYTE_BITS[words.view(numpy.uint8)].sum(axis=-1, dtype=numpy.int64)
+
+
+class CardIndex:
+    # Card id -> column of the card in a DeckSet, cards get the next column the first time they are seen so that
+    # a few words hold any deck whatever the card ids are. Share one between DeckSets to compare their decks, the
+    # width of their bitsets comes from the capacity so it stays the same however many cards are added later
+    def __init__(self, capacity: int = CARD_CAPACITY) -> None:
+        assert capacity > 0
+        self.capacity = capacity
+        self.words = -(-capacity // WORD_BITS)
+        self.card_ids: List[int] = []
+        self.columns: Dict[int, int] = {}
+        self.elixir: Dict[int, float] = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(cards={len(self.card_ids)})"
+
+    def __len__(self) -> int:
+        return len(self.card_ids)
+
+    def add(self, card_id: int, elixir: Optional[float] = None) -> int:
+        column = self.columns.get(card_id)
+        if column is None:
+            if len(self.card_ids) >= self.capacity:
+                raise ValueError(f"The index is full, create it with a capacity above {self.capacity}")
+            column = self.columns[card_id] = len(self.card_ids)
+            self.card_ids.append(card_id)
+        if elixir is not None:
+            self.elixir[card_id] = elixir
+        return column
+
+    def encode(self, card_ids: "numpy.ndarray") -> "numpy.ndarray":
+        # Same shape array of columns, -1 where the card id is 0 (no card)
+        card_ids = numpy.asarray(card_ids, dtype=numpy.int64)
+        unique, inverse = numpy.unique(card_ids, return_inverse=True)
+        columns = numpy.array([self.add(int(card_id)) if card_id else -1 for card_id in unique], dtype=numpy.int32)
+        return columns[inverse].reshape(card_ids.shape)
+
+    def elixir_table(self) -> "numpy.ndarray":
+        # Elixir of every column, NaN if unknown
+        return numpy.array([self.elixir.get(card_id, numpy.nan) for card_id in self.card_ids], dtype=numpy.float64)
+
+
+class DeckGroups(NamedTuple):
+    first: "numpy.ndarray"  # Index of the first deck of each distinct deck
+    inverse: "numpy.ndarray"  # Distinct deck of each deck, an index into first and counts
+    counts: "numpy.ndarray"  # Decks equal to each distinct deck
+
+
+class DeckSet:
+    # Decks as rows of card columns (-1 for a missing card) and as bitsets of those columns packed in uint64 words.
+    # Card order does not matter to the bitsets, so equal decks have equal rows of words
+    def __init__(self, card_ids: Any, index: Optional[CardIndex] = None) -> None:
+        _require_numpy()
+        card_ids = numpy.asarray(card_ids, dtype=numpy.int64)
+        assert card_ids.ndim == 2, "card_ids must be an array of decks"
+        self.index = CardIndex() if index is None else index
+        self.columns = self.index.encode(card_ids)
+        self.bits = numpy.zeros((len(self.columns), self.index.words), dtype=numpy.uint64)
+        rows = numpy.arange(len(self.columns))
+        for slot in self.columns.T:  # Cards of a deck are distinct, so every slot sets a different bit of its row
+            has_card = slot >= 0
+            column = slot[has_card].astype(numpy.uint64)
+            self.bits[rows[has_card], column // WORD_BITS] |= numpy.left_shift(numpy.uint64(1), column % WORD_BITS)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(decks={len(self)}, cards={len(self.index)})"
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    @classmethod
+    def from_decks(cls, decks: Iterable[Deck or List[Card]], index: Optional[CardIndex] = None) -> "DeckSet":
+        # Deck models, or lists of Card models such as Player.deck
+        index = CardIndex() if index is None else index
+        rows = []
+        for deck in decks:
+            cards = deck.cards if isinstance(deck, Deck) else deck
+            for card in cards:
+                index.add(card.card_id, card.elixir)
+            rows.append([card.card_id for card in cards[:DECK_SIZE]] + [0] * (DECK_SIZE - len(cards)))
+        return cls(numpy.array(rows, dtype=numpy.int64).reshape(-1, DECK_SIZE), index)
+
+    @classmethod
+    def from_battles(cls, battles: BattleColumns or "numpy.ndarray", opponents: bool = True,
+                     index: Optional[CardIndex] = None) -> "DeckSet":
+        # Every deck played in the battles, in battle order with the opponents' decks after the team's.
+        # The padding of 1v1 battles is left out, so rows only match battles if all of them are 1v1 or 2v2
+        index = CardIndex() if index is None else index
+        if isinstance(battles, BattleColumns):
+            for card_id, elixir in battles.card_elixir.items():
+                index.add(card_id, elixir)
+            battles = battles.to_numpy()
+        card_ids = battles["team_cards"].reshape(-1, DECK_SIZE)
+        if opponents:
+            card_ids = numpy.concatenate([card_ids, battles["opponent_cards"].reshape(-1, DECK_SIZE)])
+        return cls(card_ids[card_ids.any(axis=1)], index)
+
+    def card_ids(self, deck: int) -> List[int]:
+        return [self.index.card_ids[column] for column in self.columns[deck] if column >= 0]
+
+    def average_elixir(self) -> "numpy.ndarray":
+        # Of every deck, NaN if the elixir of one of its cards is unknown
+        has_card = self.columns >= 0
+        elixir = numpy.where(has_card, self.index.elixir_table()[self.columns.clip(0)], 0)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return elixir.sum(axis=1) / has_card.sum(axis=1)
+
+    def _bits_of(self, deck: int or "numpy.ndarray") -> "numpy.ndarray":
+        if isinstance(deck, (int, numpy.integer)):
+            return self.bits[deck]
+        bits = numpy.asarray(deck, numpy.uint64)
+        if bits.shape != (self.index.words,):
+            raise ValueError(f"Expected a row of {self.index.words} words, made with the same index")
+        return bits
+
+    def shared_cards(self, deck: int or "numpy.ndarray") -> "numpy.ndarray":
+        # Cards every deck has in common with the given one, a deck of this set or a row of bits of the same index
+        return popcount(self.bits & self._bits_of(deck))
+
+    def similarity(self, deck: int or "numpy.ndarray") -> "numpy.ndarray":
+        # Jaccard similarity of every deck with the given one, 1.0 for the same cards
+        bits = self._bits_of(deck)
+        shared = popcount(self.bits & bits)
+        union = popcount(self.bits | bits)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return numpy.where(union > 0, shared / union, 1.0)
+
+    def similar(self, deck: int or "numpy.ndarray", min_shared: int = DECK_SIZE - 1) -> "numpy.ndarray":
+        # Indexes of the decks sharing at least min_shared cards with the given one, the most similar first
+        shared = self.shared_cards(deck)
+        indexes = numpy.flatnonzero(shared >= min_shared)
+        return indexes[numpy.argsort(-shared[indexes], kind="stable")]
+
+    def groups(self) -> DeckGroups:
+        # Equal decks, whatever the order of their cards. The distinct decks are self.columns[groups.first]
+        _, first, inverse, counts = numpy.unique(self.bits, axis=0, return_index=True, return_inverse=True,
+                                                 return_counts=True)
+        return DeckGroups(first, inverse.reshape(-1), counts)
+
+    def unique(self) -> "DeckSet":
+        # The distinct decks in the order they first appear, with the same index
+        first = numpy.sort(self.groups().first)
+        deck_set = DeckSet.__new__(DeckSet)
+        deck_set.index, deck_set.columns, deck_set.bits = self.index, self.columns[first], self.bits[first]
+        return deck_set
+
+
+class CardStats(NamedTuple):
+    card_ids: "numpy.ndarray"  # Sorted
+    usage: "numpy.ndarray"  # Decks the card was played in
+    wins: "numpy.ndarray"  # Those decks that won the battle, draws are not wins
+
+    @property
+    def win_rate(self) -> "numpy.ndarray":
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            return self.wins / self.usage
+
+    def to_dict(self) -> Dict[int, Dict[str, Any]]:
+        return {int(card_id): {"usage": int(usage), "wins": int(wins), "win_rate": float(wins / usage)}
+                for card_id, usage, wins in zip(self.card_ids, self.usage, self.wins)}
+
+
+def card_stats(battles: BattleColumns or "numpy.ndarray", opponents: bool = True) -> CardStats:
+    # Usage and wins of every card played in the battles, those of the opponents' decks included if opponents is true
+    _require_numpy()
+    if isinstance(battles, BattleColumns):
+        battles = battles.to_numpy()
+    won = battles["team_crowns"] > battles["opponent_crowns"]
+    slots = battles["team_cards"][0].size if len(battles) else 0  # Cards per side of a battle
+    card_ids, wins = [battles["team_cards"].reshape(-1)], [numpy.repeat(won, slots)]
+    if opponents:
+        lost = battles["opponent_crowns"] > battles["team_crowns"]
+        card_ids.append(battles["opponent_cards"].reshape(-1))
+        wins.append(numpy.repeat(lost, slots))
+    card_ids, wins = numpy.concatenate(card_ids), numpy.concatenate(wins)
+    played = card_ids != 0
+    unique, inverse = numpy.unique(card_ids[played], return_inverse=True)
+    return CardStats(unique, numpy.bincount(inverse, minlength=len(unique)),
+                     numpy.bincount(inverse, weights=wins[played], minlength=len(unique)).astype(numpy.int64))
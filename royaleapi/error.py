@@ -41,7 +41,7 @@ class ClanNotTracked(RequestError):
 
 
 class TooManyRequests(RequestError):
-    pass
+    retry_after = None  # Seconds to wait before the next request, when the server said so
 
 
 class ServiceUnavailable(RoyaleAPIError):
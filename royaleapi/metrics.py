@@ -0,0 +1,131 @@
+import re
+import threading
+from bisect import bisect_left
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence
+
+from royaleapi.constants import LATENCY_BUCKETS
+
+_TAGS = re.compile(r"(?<=/)[0289CGJLPQRUVY,]{3,}(?=/|$)")  # Validated tags are upper case, endpoint names are not
+_LOCATION = re.compile(r"^(top/\w+/)[^/]+")
+
+
+def endpoint_template(endpoint: str) -> str:
+    # "clan/2CCCP,8QQQ/battle" -> "clan/{}/battle", "top/clan/FR" -> "top/clan/{}"
+    return _LOCATION.sub(r"\1{}", _TAGS.sub("{}", endpoint))
+
+
+class RequestRecord(NamedTuple):
+    endpoint: str  # Template, e.g. "player/{}"
+    latency: float  # Seconds until the response was read
+    decode_time: float  # Seconds spent parsing the response
+    bytes_received: int
+    not_modified: bool  # A 304 response to a conditional request
+    error: Optional[BaseException]  # None if the request succeeded
+
+
+class Histogram:
+    # Counts of the observed values per bucket, the last bucket holding the values above the largest bound
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        # Upper bound of the bucket holding the q-quantile, the largest bound if it is in the last bucket
+        assert 0 <= q <= 1
+        if not self.count:
+            return None
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= q * self.count:
+                return bound
+        return self.bounds[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {str(bound): n for bound, n in zip(self.bounds, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {"count": self.count, "sum": self.sum, "buckets": buckets,
+                "p50": self.quantile(0.5), "p99": self.quantile(0.99)}
+
+
+class EndpointStats:
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_received = 0
+        self.decode_time = 0.0
+        self.latency = Histogram(bounds)
+        self.errors: Dict[str, int] = {}  # RoyaleAPIError subclass name -> count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "not_modified": self.not_modified, "bytes_received": self.bytes_received,
+                "decode_time": self.decode_time, "latency": self.latency.to_dict(), "errors": dict(self.errors)}
+
+
+class Metrics:
+    # Collects what a client does, pass one to the client to enable it. It can be shared by several clients and
+    # threads. on_request and on_cache_lookup are called for every request and cache lookup, to export them
+    def __init__(self, on_request: Optional[Callable[[RequestRecord], Any]] = None,
+                 on_cache_lookup: Optional[Callable[[str, bool], Any]] = None,
+                 latency_buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.on_request = on_request
+        self.on_cache_lookup = on_cache_lookup  # Called with the cache type and whether the key was found
+        self.latency_buckets = latency_buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(endpoints={len(self.endpoints)})"
+
+    def reset(self) -> None:
+        with self._lock:
+            self.endpoints: Dict[str, EndpointStats] = {}  # Endpoint template -> its stats
+            self.models: Dict[str, Dict[str, Any]] = {}  # Model name -> count and time of the ones built
+            self.cache: Dict[str, Dict[str, int]] = {}  # Cache type -> hits and misses
+
+    def record_request(self, record: RequestRecord) -> None:
+        with self._lock:
+            stats = self.endpoints.get(record.endpoint)
+            if stats is None:
+                stats = self.endpoints[record.endpoint] = EndpointStats(self.latency_buckets)
+            stats.requests += 1
+            stats.not_modified += record.not_modified
+            stats.bytes_received += record.bytes_received
+            stats.decode_time += record.decode_time
+            stats.latency.observe(record.latency)
+            if record.error is not None:
+                name = type(record.error).__name__
+                stats.errors[name] = stats.errors.get(name, 0) + 1
+        if self.on_request is not None:
+            self.on_request(record)
+
+    def record_build(self, model: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.models.get(model)
+            if stats is None:
+                stats = self.models[model] = {"built": 0, "time": 0.0}
+            stats["built"] += 1
+            stats["time"] += seconds
+
+    def record_cache_lookup(self, cache_type: str, hit: bool, keys: int = 1) -> None:
+        with self._lock:
+            stats = self.cache.get(cache_type)
+            if stats is None:
+                stats = self.cache[cache_type] = {"hits": 0, "misses": 0}
+            stats["hits" if hit else "misses"] += keys
+        if self.on_cache_lookup is not None:
+            self.on_cache_lookup(cache_type, hit)
+
+    def stats(self) -> Dict[str, Any]:
+        # A snapshot made of plain dicts, ready to be serialized
+        with self._lock:
+            return {"endpoints": {endpoint: stats.to_dict() for endpoint, stats in self.endpoints.items()},
+                    "models": {model: dict(stats) for model, stats in self.models.items()},
+                    "cache": {cache_type: dict(stats) for cache_type, stats in self.cache.items()}}
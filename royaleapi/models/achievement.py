@@ -1,13 +1,13 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class Achievement(CRObject):
     name: str
     stars: int = field(compare=False)
@@ -19,5 +19,4 @@ class Achievement(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Achievement"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        return cls(**data)
+        return cls._deserialize(data, client)
@@ -1,14 +1,16 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class Arena(CRObject):
+    _aliases = {"id": "arena_id"}
+
     name: str
     arena: str = field(default=None, compare=False)
     arena_id: str = field(default=None, compare=False)
@@ -18,7 +20,4 @@ class Arena(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Arena"]:
         if not data or data["name"] == "unknown":
             return None
-        if "id" in data:
-            data["arena_id"] = data.pop("id")
-        data = super(Arena, cls).de_json(data, client)
-        return cls(**data)
+        return cls._deserialize(data, client)
@@ -1,27 +1,253 @@
+import os
 from abc import ABCMeta
-from typing import Dict, List, Any, TYPE_CHECKING
+from dataclasses import dataclass, fields, FrozenInstanceError, MISSING
+from typing import Callable, Dict, Iterable, List, Tuple, Any, TYPE_CHECKING
 
-from royaleapi.utils import camel_to_snake
+from royaleapi.utils import camel_to_snake, snake_to_camel, add_snake_case_names, SNAKE_CASE_CACHE_SIZE
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
+# Keys sent by the API that the models rename, their snake_case forms do not come from any field name
+API_KEY_ALIASES = ("arenaID", "clanChestPoints", "createdDate", "creator", "currentDeck", "currentPlayers", "decklink",
+                   "donations", "expLevel", "id", "leagueStatistics", "members", "previousRank", "type", "winner")
+add_snake_case_names(API_KEY_ALIASES)
+
+# Build option: with ROYALEAPI_SLOTS=1 set before royaleapi is imported, models use __slots__ instead of __dict__,
+# which takes several times less memory per object but forbids setting attributes that are not fields
+USE_SLOTS = os.environ.get("ROYALEAPI_SLOTS", "") not in ("", "0")
+
+_REQUIRED = object()
+_set_attribute = object.__setattr__  # Bypasses CRObject.__setattr__ while an object is built
+_deserializers: Dict[Tuple[type, int], Callable[[Dict[str, Any], "RoyaleAPIClient"], "CRObject"]] = {}
+
+
+def _compile_deserializer(cls: type, aliases: Dict[str, str],
+                          ignored_keys: Tuple[str, ...]) -> Callable[[Dict[str, Any], "RoyaleAPIClient"], "CRObject"]:
+    # Builds an object in one pass over the data, giving the same result as renaming the keys and calling cls(**data)
+    template = {}  # Field order is kept so that to_dict() and stringify() do not change
+    factories = []
+    required = []
+    for f in fields(cls):
+        if f.default is not MISSING:
+            template[f.name] = f.default
+        elif f.default_factory is not MISSING:
+            template[f.name] = None
+            factories.append((f.name, f.default_factory))
+        else:
+            template[f.name] = _REQUIRED
+            required.append(f.name)
+    has_client = "client" in template
+    slotted = "__slots__" in cls.__dict__
+    post_init = getattr(cls, "__post_init__", None)
+    key_names = {}  # Key sent by the API -> field name, or None if the key is ignored
+
+    def field_name(key: str) -> str or None:
+        name = camel_to_snake(key)
+        name = aliases.get(name, name)
+        if name in ignored_keys:
+            name = None
+        elif name not in template or name == "client":
+            raise TypeError(f"__init__() got an unexpected keyword argument '{name}'")
+        if len(key_names) < SNAKE_CASE_CACHE_SIZE:
+            key_names[key] = name
+        return name
+
+    def deserialize(data: Dict[str, Any], client: "RoyaleAPIClient") -> "CRObject":
+        values = template.copy()
+        for name, factory in factories:
+            values[name] = factory()
+        for key, value in data.items():
+            try:
+                name = key_names[key]
+            except KeyError:
+                name = field_name(key)
+            if name is not None:
+                values[name] = value
+        for name in required:
+            if values[name] is _REQUIRED:
+                raise TypeError(f"__init__() missing required argument: '{name}'")
+        if has_client:
+            values["client"] = client
+        obj = object.__new__(cls)
+        if slotted:
+            for name, value in values.items():
+                _set_attribute(obj, name, value)
+        else:
+            _set_attribute(obj, "__dict__", values)
+        if post_init is not None:
+            obj.__post_init__()
+        return obj
+
+    return deserialize
+
+
+def _freeze(value: Any) -> None:
+    # Makes models, with those nested in them or held in lists, reject setting and deleting their attributes
+    if isinstance(value, CRObject):
+        value._freeze()
+    elif isinstance(value, list):
+        for item in value:
+            _freeze(item)
+
+
+class _Lazy:
+    # Raw data of a nested field, built on first access
+    __slots__ = ("build", "value", "derived")
+
+    def __init__(self, build: Callable[..., Any], value: Any, derived: bool = False) -> None:
+        self.build = build
+        self.value = value
+        self.derived = derived  # Built from the object itself, with build(obj, value), instead of build(value, client)
+
+
+class _LazyField:
+    # Data descriptor installed on a model class the first time one of its objects is built lazily, the value stays
+    # in the instance __dict__ so that the field order, and so to_dict() and stringify(), do not change.
+    # Threads reading a field at the same time may both build it, the object keeps one of the equal results
+    def __init__(self, name: str, default: Any) -> None:
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj: Any, cls: type = None) -> Any:
+        if obj is None:
+            if self.default is MISSING:
+                raise AttributeError(self.name)
+            return self.default
+        try:
+            value = obj.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        if value.__class__ is _Lazy:
+            built = value.build(obj, value.value) if value.derived else value.build(value.value, obj.client)
+            value = obj.__dict__[self.name] = built
+            if getattr(obj, "_frozen", False):
+                _freeze(value)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        obj.__dict__[self.name] = value
+
+
+def _add_slots(cls: type) -> type:
+    # Same as dataclass(slots=True) on Python 3.10+, the class has to be created again with __slots__
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict = {k: v for k, v in cls.__dict__.items() if k not in field_names + ("__dict__", "__weakref__")}
+    cls_dict["__slots__"] = field_names
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
+
+def crdataclass(cls: type = None, **kwargs: Any) -> type or Callable[[type], type]:
+    # dataclass() for models, honouring the ROYALEAPI_SLOTS build option
+    def wrap(c: type) -> type:
+        c = dataclass(c, **kwargs)
+        return _add_slots(c) if USE_SLOTS else c
+
+    return wrap if cls is None else wrap(cls)
+
+
 class CRObject(metaclass=ABCMeta):
+    __slots__ = ("_frozen",)  # Set by _freeze(), a slot so that slotted models still have no __dict__ at all
+
+    # snake_case keys sent by the API that are renamed or dropped by the compiled deserializer
+    _aliases: Dict[str, str] = {}
+    _ignored_keys: Tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        add_snake_case_names(snake_to_camel(name) for name in cls.__dict__.get("__annotations__", {}))
+
     def __eq__(self, other: Any) -> bool:  # CRObjects that do not implement __eq__ fall back to this
         if self.__class__ is other.__class__:
             raise ValueError("The two objects are not comparable!")
         return NotImplemented
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise FrozenInstanceError(f"cannot assign to field '{name}', the object is shared by the models cache")
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if getattr(self, "_frozen", False):
+            raise FrozenInstanceError(f"cannot delete field '{name}', the object is shared by the models cache")
+        object.__delattr__(self, name)
+
     def __getitem__(self, item: str) -> Any:
-        return self.__dict__[item]
+        try:
+            value = self.__dict__[item]
+        except AttributeError:  # Slotted model
+            if item in self.__slots__:
+                return getattr(self, item)
+            raise KeyError(item) from None
+        return getattr(self, item) if value.__class__ is _Lazy else value
+
+    def _items(self) -> Iterable[Tuple[str, Any]]:
+        try:
+            items = self.__dict__.items()
+        except AttributeError:  # Slotted model
+            return ((name, getattr(self, name)) for name in self.__slots__)
+        return ((k, getattr(self, k) if v.__class__ is _Lazy else v) for k, v in items)
+
+    def _freeze(self) -> None:
+        # Fields that are still lazy are frozen once they are built
+        _set_attribute(self, "_frozen", True)
+        try:
+            values = self.__dict__.values()
+        except AttributeError:  # Slotted model
+            values = [getattr(self, name) for name in self.__slots__]
+        for value in values:
+            if value.__class__ is not _Lazy:
+                _freeze(value)
+
+    def _is_lazy(self) -> bool:
+        # Slotted models have nowhere to keep the raw data, they are always built eagerly
+        return getattr(self.client, "lazy_models", False) and hasattr(self, "__dict__")
+
+    def _install_lazy_fields(self, names: Iterable[str]) -> None:
+        cls = self.__class__
+        for name in names:
+            if cls.__dict__.get(name).__class__ is not _LazyField:
+                setattr(cls, name, _LazyField(name, cls.__dataclass_fields__[name].default))
+
+    def _build_nested(self, **builders: Callable[[Any, "RoyaleAPIClient"], Any]) -> None:
+        # Turns the raw data of nested fields into objects, or with lazy_models enabled, on their first access
+        if not self._is_lazy():
+            client = self.client
+            try:
+                values = self.__dict__
+            except AttributeError:  # Slotted model
+                for name, build in builders.items():
+                    _set_attribute(self, name, build(getattr(self, name), client))
+                return
+            for name, build in builders.items():
+                values[name] = build(values[name], client)
+            return
+        self._install_lazy_fields(builders)
+        values = self.__dict__
+        for name, build in builders.items():
+            value = values[name]
+            values[name] = _Lazy(build, value) if value else build(value, self.client)
+
+    def _derive_nested(self, **builders: Callable[["CRObject", Any], Any]) -> None:
+        # Same as _build_nested() for fields computed from other nested fields, with build(self, value)
+        if not self._is_lazy():
+            for name, build in builders.items():
+                _set_attribute(self, name, build(self, getattr(self, name)))
+            return
+        self._install_lazy_fields(builders)
+        values = self.__dict__
+        for name, build in builders.items():
+            values[name] = _Lazy(build, values[name], derived=True)
 
     def to_dict(self, _pretty_format: bool = False) -> Dict[str, Any]:
         if _pretty_format:
-            return {**self.__dict__, "_": self.__class__.__name__}
+            return {**dict(self._items()), "_": self.__class__.__name__}
         else:
             data = {}
-            for k, v in self.__dict__.items():
+            for k, v in self._items():
                 if k != "client" and v not in (None, []):
                     if isinstance(v, CRObject):
                         data[k] = v.to_dict()
@@ -38,6 +264,16 @@ class CRObject(metaclass=ABCMeta):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Dict[str, Any] or "CRObject":
         return {camel_to_snake(x): data[x] for x in data.copy()}
 
+    @classmethod
+    def _deserialize(cls, data: Dict[str, Any], client: "RoyaleAPIClient",
+                     aliases: Dict[str, str] = None) -> "CRObject":
+        aliases = cls._aliases if aliases is None else aliases
+        try:
+            deserializer = _deserializers[cls, id(aliases)]
+        except KeyError:
+            deserializer = _deserializers[cls, id(aliases)] = _compile_deserializer(cls, aliases, cls._ignored_keys)
+        return deserializer(data, client)
+
     @classmethod
     def de_list(cls, data: List[Dict[str, Any]], client: "RoyaleAPIClient") -> List[Dict[str, Any] or "CRObject"]:
         return [] if not data else [cls.de_json(obj, client) for obj in ([data] if isinstance(data, dict) else data)]
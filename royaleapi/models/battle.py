@@ -1,9 +1,9 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from datetime import datetime
 from typing import List, Tuple, Dict, Optional, Any, TYPE_CHECKING
 
 from royaleapi.models.arena import Arena
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.battle_mode import BattleMode
 from royaleapi.models.player import Player
 
@@ -11,8 +11,10 @@ if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class Battle(CRObject):
+    _aliases = {"type": "battle_type", "winner": "result"}
+
     battle_type: str = field(compare=False)
     challenge_type: Optional[str] = field(compare=False)
     mode: BattleMode = field(compare=False)
@@ -31,10 +33,7 @@ class Battle(CRObject):
     client: Optional["RoyaleAPIClient"] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        self.mode = BattleMode.de_json(self.mode, self.client)
-        self.team = Player.de_list(self.team, self.client)
-        self.opponent = Player.de_list(self.opponent, self.client)
-        self.arena = Arena.de_json(self.arena, self.client)
+        self._build_nested(mode=BattleMode.de_json, team=Player.de_list, opponent=Player.de_list, arena=Arena.de_json)
 
     def datetime(self, *args, **kwargs) -> datetime:
         return datetime.fromtimestamp(self.utc_time, *args, **kwargs)
@@ -53,9 +52,4 @@ class Battle(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Battle"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "type" in data:
-            data["battle_type"] = data.pop("type")
-        if "winner" in data:
-            data["result"] = data.pop("winner")
-        return cls(client=client, **data)
+        return cls._deserialize(data, client)
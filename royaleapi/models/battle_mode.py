@@ -1,14 +1,16 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class BattleMode(CRObject):
+    _aliases = {"id": "mode_id"}
+
     name: str
     mode_id: Optional[int] = None
     deck: Optional[str] = None
@@ -21,7 +23,4 @@ class BattleMode(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["BattleMode"]:
         if not data:
             return None
-        if "id" in data:
-            data["mode_id"] = data.pop("id")
-        data = super().de_json(data, client)
-        return cls(**data)
+        return cls._deserialize(data, client)
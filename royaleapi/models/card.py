@@ -1,14 +1,16 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class Card(CRObject):
+    _aliases = {"type": "card_type", "id": "card_id"}
+
     key: str
     name: str = field(compare=False)
     elixir: int = field(compare=False)
@@ -33,9 +35,4 @@ class Card(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Card"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "type" in data:
-            data["card_type"] = data.pop("type")
-        if "id" in data:
-            data["card_id"] = data.pop("id")
-        return cls(**data)
+        return cls._deserialize(data, client)
@@ -1,13 +1,12 @@
-from dataclasses import dataclass
 from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass(eq=False)
+@crdataclass(eq=False)
 class ChestCycle(CRObject):
     upcoming: List[str]
     mega_lightning: int
@@ -20,5 +19,4 @@ class ChestCycle(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["ChestCycle"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        return cls(**data)
+        return cls._deserialize(data, client)
@@ -1,8 +1,8 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
 from royaleapi.constants import ClanRole
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.clan_badge import ClanBadge
 from royaleapi.models.clan_tracking import ClanTracking
 from royaleapi.models.location import Location
@@ -15,8 +15,11 @@ if TYPE_CHECKING:
     from royaleapi.models.player import Player
 
 
-@dataclass
+@crdataclass
 class Clan(CRObject):
+    _aliases = {"type": "clan_type", "donations": "total_donations"}
+    _player_aliases = {"type": "clan_type", "donations": "player_donations"}
+
     # All endpoints except history
     tag: Optional[str] = None
     name: Optional[str] = field(default=None, compare=False)
@@ -69,15 +72,22 @@ class Clan(CRObject):
 
     def __post_init__(self) -> None:
         from royaleapi.models.player import Player  # I did not want to do this
-        self.badge = ClanBadge.de_json(self.badge, self.client)
-        self.location = Location.de_json(self.location, self.client)
-        self.members = Player.de_list(self.members, self.client)
-        self.tracking = ClanTracking.de_json(self.tracking, self.client)
-        self.popularity = Popularity.de_json(self.popularity, self.client)
-        if self.members:
-            self.leader = [p for p in self.members if p.role == ClanRole.LEADER][0]
-            self.co_leaders = [p for p in self.members if p.role == ClanRole.CO_LEADER]
-            self.elders = [p for p in self.members if p.role == ClanRole.ELDER]
+        self._build_nested(badge=ClanBadge.de_json, location=Location.de_json, members=Player.de_list,
+                           tracking=ClanTracking.de_json, popularity=Popularity.de_json)
+        self._derive_nested(leader=Clan._find_leader, co_leaders=Clan._find_co_leaders, elders=Clan._find_elders)
+
+    # The roles are taken from the members, the values sent by the API are kept when there are no members
+    @staticmethod
+    def _find_leader(clan: "Clan", value: Any) -> Any:
+        return [p for p in clan.members if p.role == ClanRole.LEADER][0] if clan.members else value
+
+    @staticmethod
+    def _find_co_leaders(clan: "Clan", value: Any) -> Any:
+        return [p for p in clan.members if p.role == ClanRole.CO_LEADER] if clan.members else value
+
+    @staticmethod
+    def _find_elders(clan: "Clan", value: Any) -> Any:
+        return [p for p in clan.members if p.role == ClanRole.ELDER] if clan.members else value
 
     def get_clan(self, *args, **kwargs) -> "Clan":
         return self.client.get_clan(self.tag, *args, **kwargs)
@@ -104,12 +114,6 @@ class Clan(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Clan"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "type" in data:
-            data["clan_type"] = data.pop("type")
-        if "donations" in data:
-            if "role" in data:  # Clan object is from "player" endpoint
-                data["player_donations"] = data.pop("donations")
-            else:  # Clan object is from "clan" endpoint
-                data["total_donations"] = data.pop("donations")
-        return cls(client=client, **data)
+        if "role" in data:  # Clan object is from "player" endpoint
+            return cls._deserialize(data, client, cls._player_aliases)
+        return cls._deserialize(data, client)  # Clan object is from "clan" endpoint
@@ -1,14 +1,16 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class ClanBadge(CRObject):
+    _aliases = {"id": "badge_id"}
+
     name: str = field(compare=False)
     category: str = field(compare=False)
     badge_id: int
@@ -18,7 +20,4 @@ class ClanBadge(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["ClanBadge"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "id" in data:
-            data["badge_id"] = data.pop("id")
-        return cls(**data)
+        return cls._deserialize(data, client)
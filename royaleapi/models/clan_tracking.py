@@ -1,13 +1,12 @@
-from dataclasses import dataclass
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass(eq=False)
+@crdataclass(eq=False)
 class ClanTracking(CRObject):
     active: bool
     available: bool
@@ -23,5 +22,4 @@ class ClanTracking(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["ClanTracking"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        return cls(**data)
+        return cls._deserialize(data, client)
@@ -1,9 +1,9 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from datetime import datetime
 from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
 from royaleapi.constants import ClanWarState
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.clan import Clan
 from royaleapi.models.player import Player
 
@@ -11,8 +11,10 @@ if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass(eq=False)
+@crdataclass(eq=False)
 class ClanWar(CRObject):
+    _aliases = {"created_date": "end_time"}
+
     # Clan war endpoint only
     state: Optional[str] = None
 
@@ -38,9 +40,7 @@ class ClanWar(CRObject):
     client: Optional["RoyaleAPIClient"] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
-        self.clan = Clan.de_json(self.clan, self.client)
-        self.participants = Player.de_list(self.participants, self.client)
-        self.standings = Clan.de_list(self.standings, self.client)
+        self._build_nested(clan=Clan.de_json, participants=Player.de_list, standings=Clan.de_list)
 
     def end_datetime(self, *args, **kwargs) -> datetime:
         if self.state == ClanWarState.NOT_IN_WAR:
@@ -59,7 +59,4 @@ class ClanWar(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["ClanWar"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "created_date" in data:
-            data["end_time"] = data.pop("created_date")
-        return cls(client=client, **data)
+        return cls._deserialize(data, client)
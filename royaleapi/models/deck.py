@@ -1,17 +1,18 @@
-from collections import Counter
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
 from royaleapi import utils
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.card import Card
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass(eq=False)
+@crdataclass(eq=False)
 class Deck(CRObject):
+    _aliases = {"decklink": "deck_link"}
+
     # This object is specifically for the deck popularity endpoint
     cards: List[Card]
     deck_link: str
@@ -20,12 +21,12 @@ class Deck(CRObject):
     client: Optional["RoyaleAPIClient"] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
-        self.cards = Card.de_list(self.cards, self.client)
+        self._build_nested(cards=Card.de_list)
 
     def __eq__(self, other):
-        # Order of cards does not matter
+        # Order of cards does not matter, sorted keys compare like Counters of them without building any
         if self.__class__ is other.__class__:
-            return Counter([i.key for i in self.cards]) == Counter([i.key for i in other.cards])
+            return sorted([i.key for i in self.cards]) == sorted([i.key for i in other.cards])
         return NotImplemented
 
     def average_elixir(self) -> float:
@@ -35,7 +36,4 @@ class Deck(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Deck"]:
         if not data:
             return None
-        if "decklink" in data:
-            data["deck_link"] = data.pop("decklink")
-        data = super().de_json(data, client)
-        return cls(**data)
+        return cls._deserialize(data, client)
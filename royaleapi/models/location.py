@@ -1,13 +1,13 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class Location(CRObject):
     name: str
     is_country: bool = field(compare=False)
@@ -17,5 +17,4 @@ class Location(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Location"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        return cls(**data)
+        return cls._deserialize(data, client)
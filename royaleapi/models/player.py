@@ -1,9 +1,9 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
 from royaleapi.models.achievement import Achievement
 from royaleapi.models.arena import Arena
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.card import Card
 from royaleapi.models.chest_cycle import ChestCycle
 from royaleapi.models.clan import Clan
@@ -17,8 +17,12 @@ if TYPE_CHECKING:
     from royaleapi.models.battle import Battle
 
 
-@dataclass
+@crdataclass
 class Player(CRObject):
+    _aliases = {"league_statistics": "league_stats", "current_deck": "deck", "exp_level": "level",
+                "creator": "is_creator", "previous_rank": "previous_clan_rank"}
+    _ignored_keys = ("clan_chest_points",)
+
     tag: str
     name: str = field(compare=False)
 
@@ -66,15 +70,9 @@ class Player(CRObject):
     client: Optional["RoyaleAPIClient"] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        self.deck = Card.de_list(self.deck, self.client)
-        self.arena = Arena.de_json(self.arena, self.client)
-        self.clan = Clan.de_json(self.clan, self.client)
-        self.stats = PlayerStats.de_json(self.stats, self.client)
-        self.games = PlayerGames.de_json(self.games, self.client)
-        self.league_stats = PlayerLeagueStats.de_json(self.league_stats, self.client)
-        self.cards = Card.de_list(self.cards, self.client)
-        self.achievements = Achievement.de_list(self.achievements, self.client)
-        self.popularity = Popularity.de_json(self.popularity, self.client)
+        self._build_nested(deck=Card.de_list, arena=Arena.de_json, clan=Clan.de_json, stats=PlayerStats.de_json,
+                           games=PlayerGames.de_json, league_stats=PlayerLeagueStats.de_json, cards=Card.de_list,
+                           achievements=Achievement.de_list, popularity=Popularity.de_json)
 
     def get_player(self, *args, **kwargs) -> "Player":
         return self.client.get_player(self.tag, *args, **kwargs)
@@ -89,17 +87,4 @@ class Player(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Player"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "league_statistics" in data:
-            data["league_stats"] = data.pop("league_statistics")
-        if "current_deck" in data:
-            data["deck"] = data.pop("current_deck")
-        if "exp_level" in data:
-            data["level"] = data.pop("exp_level")
-        if "creator" in data:
-            data["is_creator"] = data.pop("creator")
-        if "previous_rank" in data:
-            data["previous_clan_rank"] = data.pop("previous_rank")
-        if "clan_chest_points" in data:
-            del data["clan_chest_points"]
-        return cls(client=client, **data)
+        return cls._deserialize(data, client)
@@ -1,14 +1,15 @@
-from dataclasses import dataclass
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass(eq=False)
+@crdataclass(eq=False)
 class PlayerLeagueSeason(CRObject):
+    _aliases = {"id": "season_id"}
+
     trophies: int
     rank: Optional[int] = None
 
@@ -22,7 +23,4 @@ class PlayerLeagueSeason(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["PlayerLeagueSeason"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "id" in data:
-            data["season_id"] = data.pop("id")
-        return cls(**data)
+        return cls._deserialize(data, client)
@@ -1,14 +1,14 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.player_league_season import PlayerLeagueSeason
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass(eq=False)
+@crdataclass(eq=False)
 class PlayerLeagueStats(CRObject):
     current_season: PlayerLeagueSeason
     previous_season: Optional[PlayerLeagueSeason] = None
@@ -17,13 +17,11 @@ class PlayerLeagueStats(CRObject):
     client: Optional["RoyaleAPIClient"] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
-        self.current_season = PlayerLeagueSeason.de_json(self.current_season, self.client)
-        self.previous_season = PlayerLeagueSeason.de_json(self.previous_season, self.client)
-        self.best_season = PlayerLeagueSeason.de_json(self.best_season, self.client)
+        self._build_nested(current_season=PlayerLeagueSeason.de_json, previous_season=PlayerLeagueSeason.de_json,
+                           best_season=PlayerLeagueSeason.de_json)
 
     @classmethod
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["PlayerLeagueStats"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        return cls(client=client, **data)
+        return cls._deserialize(data, client)
@@ -1,14 +1,14 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from typing import Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.card import Card
 
 if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass(eq=False)
+@crdataclass(eq=False)
 class PlayerStats(CRObject):
     clan_cards_collected: int
     tournament_cards_won: int
@@ -24,11 +24,10 @@ class PlayerStats(CRObject):
     client: Optional["RoyaleAPIClient"] = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
-        self.favorite_card = Card.de_json(self.favorite_card, self.client)
+        self._build_nested(favorite_card=Card.de_json)
 
     @classmethod
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["PlayerStats"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        return cls(client=client, **data)
+        return cls._deserialize(data, client)
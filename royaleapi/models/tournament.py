@@ -1,8 +1,8 @@
-from dataclasses import dataclass, field
+from dataclasses import field
 from datetime import datetime
 from typing import List, Dict, Optional, Any, TYPE_CHECKING
 
-from royaleapi.models.base import CRObject
+from royaleapi.models.base import CRObject, crdataclass
 from royaleapi.models.player import Player
 from royaleapi.models.popularity import Popularity
 
@@ -10,8 +10,10 @@ if TYPE_CHECKING:
     from royaleapi.client import RoyaleAPIClient
 
 
-@dataclass
+@crdataclass
 class Tournament(CRObject):
+    _aliases = {"current_players": "player_count", "members": "players"}
+
     tag: str
     name: str = field(compare=False)
     open: bool = field(compare=False)
@@ -36,9 +38,7 @@ class Tournament(CRObject):
     client: Optional["RoyaleAPIClient"] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self) -> None:
-        self.creator = Player.de_json(self.creator, self.client)
-        self.players = Player.de_list(self.players, self.client)
-        self.popularity = Popularity.de_json(self.popularity, self.client)
+        self._build_nested(creator=Player.de_json, players=Player.de_list, popularity=Popularity.de_json)
 
     def create_datetime(self, *args, **kwargs) -> datetime:
         return datetime.fromtimestamp(self.create_time, *args, **kwargs)
@@ -68,9 +68,4 @@ class Tournament(CRObject):
     def de_json(cls, data: Dict[str, Any], client: "RoyaleAPIClient") -> Optional["Tournament"]:
         if not data:
             return None
-        data = super().de_json(data, client)
-        if "current_players" in data:
-            data["player_count"] = data.pop("current_players")
-        if "members" in data:
-            data["players"] = data.pop("members")
-        return cls(client=client, **data)
+        return cls._deserialize(data, client)
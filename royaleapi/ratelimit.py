@@ -0,0 +1,64 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    # Token bucket shared by every thread and task, so by every client, using the same dev key.
+    # Each 429 halves the rate and pauses all requests for the retry-after time, successes slowly bring it back up
+    _shared: Dict[str, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate: float, burst: Optional[int] = None, min_rate: Optional[float] = None) -> None:
+        assert rate > 0 and (burst is None or burst > 0)
+        self.max_rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(rate={self.rate:g}, max_rate={self.max_rate:g}, burst={self.burst})"
+
+    @classmethod
+    def shared(cls, key: str, rate: float, burst: Optional[int] = None) -> "RateLimiter":
+        # The first client created for a key sets the limits
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(rate, burst)
+            return cls._shared[key]
+
+    def reserve(self) -> float:
+        # Takes a token, and returns how long to wait before it can be used
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._blocked_until)
+            self._tokens = min(self.burst, self._tokens + (start - self._updated) * self.rate) - 1
+            self._updated = start
+            return start - now + (-self._tokens / self.rate if self._tokens < 0 else 0)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def limited(self, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0)
+            pause = retry_after if retry_after is not None else 1 / self.rate
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+
+    def succeeded(self) -> None:
+        if self.rate < self.max_rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 32)
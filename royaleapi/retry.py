@@ -0,0 +1,86 @@
+import asyncio
+import random
+import time
+from itertools import count
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Tuple, Type
+
+from royaleapi.error import RequestTimeout, ServiceUnavailable, TooManyRequests
+
+RETRY_EXCEPTIONS = (RequestTimeout, ServiceUnavailable, TooManyRequests)
+
+
+class RetryAttempt(NamedTuple):
+    endpoint: str
+    attempt: int  # Starts at 1
+    duration: float  # Seconds spent on the attempt
+    error: Optional[BaseException]  # None if the attempt succeeded
+    delay: Optional[float]  # Seconds before the next attempt, None if there is none
+
+
+class RetryPolicy:
+    # Exponential backoff with full jitter, a TooManyRequests retry-after hint is waited for at least.
+    # No attempt is started if the overall deadline would be passed while waiting for it
+    def __init__(self, max_attempts: int = 3, exceptions: Tuple[Type[BaseException], ...] = RETRY_EXCEPTIONS,
+                 backoff: float = 0.5, max_backoff: float = 30, jitter: bool = True, deadline: Optional[float] = None,
+                 on_attempt: Optional[Callable[[RetryAttempt], Any]] = None) -> None:
+        assert max_attempts > 0 and backoff >= 0 and max_backoff >= 0 and (deadline is None or deadline > 0)
+        self.max_attempts = max_attempts
+        self.exceptions = exceptions
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.deadline = deadline
+        self.on_attempt = on_attempt
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(max_attempts={self.max_attempts}, deadline={self.deadline})"
+
+    def _next_delay(self, attempt: int, error: BaseException, started: float) -> Optional[float]:
+        if attempt >= self.max_attempts or not isinstance(error, self.exceptions):
+            return None
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if self.deadline is not None and time.monotonic() + delay - started >= self.deadline:
+            return None
+        return delay
+
+    def _report(self, endpoint: str, attempt: int, attempt_started: float, error: Optional[BaseException],
+                delay: Optional[float]) -> None:
+        if self.on_attempt is not None:
+            self.on_attempt(RetryAttempt(endpoint, attempt, time.monotonic() - attempt_started, error, delay))
+
+    def call(self, func: Callable[[], Any], endpoint: str = "") -> Any:
+        started = time.monotonic()
+        for attempt in count(1):
+            attempt_started = time.monotonic()
+            try:
+                result = func()
+            except Exception as e:
+                delay = self._next_delay(attempt, e, started)
+                self._report(endpoint, attempt, attempt_started, e, delay)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            else:
+                self._report(endpoint, attempt, attempt_started, None, None)
+                return result
+
+    async def call_async(self, func: Callable[[], Awaitable[Any]], endpoint: str = "") -> Any:
+        started = time.monotonic()
+        for attempt in count(1):
+            attempt_started = time.monotonic()
+            try:
+                result = await func()
+            except Exception as e:
+                delay = self._next_delay(attempt, e, started)
+                self._report(endpoint, attempt, attempt_started, e, delay)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            else:
+                self._report(endpoint, attempt, attempt_started, None, None)
+                return result
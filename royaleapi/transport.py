@@ -0,0 +1,488 @@
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectTimeout, ReadTimeout, ConnectionError, ChunkedEncodingError
+
+from royaleapi.constants import STREAM_CHUNK_SIZE
+from royaleapi.error import RequestTimeout
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed by AiohttpTransport
+    aiohttp = None
+
+
+class Response(NamedTuple):
+    status: int
+    headers: Mapping[str, str]
+    content: bytes
+
+
+class StreamedResponse(metaclass=ABCMeta):
+    # Returned by BaseTransport.stream(), the body is only read as it is iterated
+    status: int
+    headers: Mapping[str, str]
+
+    def __enter__(self) -> "StreamedResponse":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @abstractmethod
+    def read(self) -> bytes:
+        pass
+
+    @abstractmethod
+    def iter_chunks(self) -> Iterator[bytes]:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class BaseTransport(metaclass=ABCMeta):
+    # Does all the I/O of RoyaleAPIClient, connection errors and timeouts are raised as RequestTimeout
+    @abstractmethod
+    def get(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+            timeout: Optional[float] = None) -> Response:
+        pass
+
+    @abstractmethod
+    def stream(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+               timeout: Optional[float] = None) -> StreamedResponse:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncStreamedResponse(metaclass=ABCMeta):
+    # Returned by AsyncBaseTransport.stream(), the request is sent when it is entered with async with
+    status: int
+    headers: Mapping[str, str]
+
+    async def __aenter__(self) -> "AsyncStreamedResponse":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @abstractmethod
+    async def read(self) -> bytes:
+        pass
+
+    @abstractmethod
+    def iter_chunks(self) -> AsyncIterator[bytes]:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class AsyncBaseTransport(metaclass=ABCMeta):
+    # Does all the I/O of AsyncRoyaleAPIClient, connection errors and timeouts are raised as RequestTimeout
+    @abstractmethod
+    async def get(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+                  timeout: Optional[float] = None) -> Response:
+        pass
+
+    @abstractmethod
+    def stream(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+               timeout: Optional[float] = None) -> AsyncStreamedResponse:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+def socket_options(tcp_nodelay: bool = True, tcp_keepalive: Optional[int] = None) -> List[Tuple[int, int, int]]:
+    options = []
+    if tcp_nodelay:
+        options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1))
+    if tcp_keepalive:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        for name in ("TCP_KEEPIDLE", "TCP_KEEPINTVL"):  # Linux only
+            if hasattr(socket, name):
+                options.append((socket.IPPROTO_TCP, getattr(socket, name), tcp_keepalive))
+    return options
+
+
+class _SocketOptionsAdapter(HTTPAdapter):
+    # HTTPAdapter that applies TCP options to every connection it opens
+    def __init__(self, socket_options: List[Tuple[int, int, int]], **kwargs: Any) -> None:
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _RequestsStream(StreamedResponse):
+    def __init__(self, response: requests.Response) -> None:
+        self._response = response
+        self.status = response.status_code
+        self.headers = response.headers
+
+    def read(self) -> bytes:
+        try:
+            return self._response.content
+        except (ConnectionError, ChunkedEncodingError) as e:
+            raise RequestTimeout(str(e)) from None
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        except (ConnectionError, ChunkedEncodingError) as e:
+            raise RequestTimeout(str(e)) from None
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class RequestsTransport(BaseTransport):
+    # The default transport of RoyaleAPIClient. In thread-safe mode the adapter, so the connection pool, is shared
+    # by one session per thread, and threads wait for a free connection instead of opening one that is dropped
+    # once the pool is full
+    def __init__(self, pool_size: int = 10, thread_safe: bool = False, tcp_nodelay: bool = True,
+                 tcp_keepalive: Optional[int] = None) -> None:
+        self.thread_safe = thread_safe
+        self._adapter = _SocketOptionsAdapter(socket_options(tcp_nodelay, tcp_keepalive), pool_block=thread_safe,
+                                              pool_maxsize=pool_size)
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()  # For the sessions of the threads
+        self.session = self._new_session()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(thread_safe={self.thread_safe})"
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers = {}  # The client sends all of its headers with each request
+        session.mount("http://", self._adapter)
+        session.mount("https://", self._adapter)
+        return session
+
+    def _get_session(self) -> requests.Session:
+        if not self.thread_safe:
+            return self.session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def get(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+            timeout: Optional[float] = None) -> Response:
+        try:
+            response = self._get_session().get(url, params=params, headers=headers, timeout=timeout)
+        except (ConnectTimeout, ReadTimeout, ConnectionError) as e:
+            raise RequestTimeout(str(e)) from None
+        return Response(response.status_code, response.headers, response.content)
+
+    def stream(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+               timeout: Optional[float] = None) -> StreamedResponse:
+        try:
+            return _RequestsStream(self._get_session().get(url, params=params, headers=headers, timeout=timeout,
+                                                           stream=True))
+        except (ConnectTimeout, ReadTimeout, ConnectionError) as e:
+            raise RequestTimeout(str(e)) from None
+
+    def close(self) -> None:
+        self.session.close()
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
+            self._local = threading.local()
+
+
+class _AiohttpStream(AsyncStreamedResponse):
+    # Like with requests, the timeout applies to each read instead of the whole response
+    def __init__(self, session: "aiohttp.ClientSession", url: str, params: Dict[str, Any],
+                 headers: Mapping[str, str], timeout: Optional[float] = None) -> None:
+        self._request = lambda: session.get(url, params=params, headers=headers,
+                                            timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout))
+        self._response = None
+
+    async def __aenter__(self) -> "_AiohttpStream":
+        try:
+            self._response = await self._request()
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            raise RequestTimeout(str(e)) from None
+        self.status = self._response.status
+        self.headers = self._response.headers
+        return self
+
+    async def read(self) -> bytes:
+        try:
+            return await self._response.read()
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+            raise RequestTimeout(str(e)) from None
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                yield chunk
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+            raise RequestTimeout(str(e)) from None
+
+    async def close(self) -> None:
+        if self._response is not None:
+            self._response.release()
+
+
+class AiohttpTransport(AsyncBaseTransport):
+    # The default transport of AsyncRoyaleAPIClient. aiohttp always sets TCP_NODELAY and has no option for
+    # TCP keep-alive probes
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, keep_alive: bool = True) -> None:
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncRoyaleAPIClient, "
+                              "install it with 'pip install clashroyaleapi[async]'")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.session = None  # aiohttp.ClientSession has to be created inside the running event loop
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(limit={self.limit}, limit_per_host={self.limit_per_host})"
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def get(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+                  timeout: Optional[float] = None) -> Response:
+        try:
+            async with self._get_session().get(url, params=params, headers=headers,
+                                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                return Response(response.status, response.headers, await response.read())
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            raise RequestTimeout(str(e)) from None
+
+    def stream(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+               timeout: Optional[float] = None) -> AsyncStreamedResponse:
+        return _AiohttpStream(self._get_session(), url, params, headers, timeout)
+
+    async def close(self) -> None:
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class FixtureStore:
+    # Responses saved as files under directory, one per endpoint and query, e.g. player/2PP.json and
+    # clan/2CCCP/battle@type=all.json. Responses to several tags are saved as one file per tag, and put together
+    # again when they are loaded. Battle logs of several tags are one list merging the battles of all of them, so
+    # they are saved as they are, or put together from the logs of each tag. Files are read once and kept in memory
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._contents: Dict[str, Optional[bytes]] = {}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(directory={self.directory!r})"
+
+    def path(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        query = "@" + urlencode(sorted(params.items())) if params else ""
+        return os.path.join(self.directory, *endpoint.strip("/").split("/")) + query + ".json"
+
+    @staticmethod
+    def _split_tags(endpoint: str) -> Tuple[int, List[str]]:
+        # Index of the path segment holding several tags and the tags, -1 if there is none
+        parts = endpoint.split("/")
+        for i, part in enumerate(parts):
+            if "," in part:
+                return i, part.split(",")
+        return -1, []
+
+    @staticmethod
+    def _merged(endpoint: str) -> bool:
+        return endpoint.rstrip("/").endswith("/battle")
+
+    @staticmethod
+    def _with_tag(endpoint: str, index: int, tag: str) -> str:
+        parts = endpoint.split("/")
+        parts[index] = tag
+        return "/".join(parts)
+
+    def _read(self, path: str) -> Optional[bytes]:
+        if path not in self._contents:
+            try:
+                with open(path, "rb") as f:
+                    self._contents[path] = f.read()
+            except FileNotFoundError:
+                self._contents[path] = None
+        return self._contents[path]
+
+    def _write(self, path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+        self._contents[path] = content
+
+    def load(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+        # None if the response, or the response for any of the tags, was never saved
+        content = self._read(self.path(endpoint, params))
+        index, tags = self._split_tags(endpoint)
+        if content is not None or index < 0:
+            return content
+        parts = [self._read(self.path(self._with_tag(endpoint, index, tag), params)) for tag in tags]
+        if any(part is None for part in parts):
+            return None
+        if self._merged(endpoint):  # The inside of every list, leaving out the empty ones
+            parts = [part for part in (part.strip()[1:-1].strip() for part in parts) if part]
+        return b"[" + b",".join(parts) + b"]"
+
+    def save(self, endpoint: str, content: bytes or Any, params: Optional[Dict[str, Any]] = None) -> None:
+        # Takes the body of a response, or the data to serialize as one
+        data = None
+        if not isinstance(content, bytes):
+            data, content = content, json.dumps(content).encode()
+        index, tags = self._split_tags(endpoint)
+        if index >= 0 and not self._merged(endpoint):
+            data = json.loads(content) if data is None else data
+            if isinstance(data, list) and len(data) == len(tags) and all(isinstance(part, dict) for part in data):
+                for tag, part in zip(tags, data):
+                    self._write(self.path(self._with_tag(endpoint, index, tag), params), json.dumps(part).encode())
+                return
+        self._write(self.path(endpoint, params), content)
+
+    def respond(self, endpoint: str, params: Dict[str, Any], headers: Mapping[str, str]) -> Response:
+        # The saved response like the API would send it, with an ETag so that conditional requests work
+        content = self.load(endpoint, params)
+        if content is None:
+            body = json.dumps({"error": True, "status": 404, "message": f"No fixture for {endpoint}"}).encode()
+            return Response(404, {"Content-Type": "application/json", "Content-Length": str(len(body))}, body)
+        etag = '"' + hashlib.md5(content).hexdigest() + '"'
+        if headers.get("If-None-Match") == etag:
+            return Response(304, {"ETag": etag}, b"")
+        return Response(200, {"Content-Type": "application/json", "Content-Length": str(len(content)),
+                              "ETag": etag}, content)
+
+
+class _BufferedStream(StreamedResponse):
+    def __init__(self, response: Response) -> None:
+        self._response = response
+        self.status = response.status
+        self.headers = response.headers
+
+    def read(self) -> bytes:
+        return self._response.content
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        content = self._response.content
+        for i in range(0, len(content), STREAM_CHUNK_SIZE):
+            yield content[i:i + STREAM_CHUNK_SIZE]
+
+
+class _AsyncBufferedStream(AsyncStreamedResponse):
+    def __init__(self, respond: Any) -> None:
+        self._respond = respond  # Coroutine function returning the Response
+        self._response = None
+
+    async def __aenter__(self) -> "_AsyncBufferedStream":
+        self._response = await self._respond()
+        self.status = self._response.status
+        self.headers = self._response.headers
+        return self
+
+    async def read(self) -> bytes:
+        return self._response.content
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        content = self._response.content
+        for i in range(0, len(content), STREAM_CHUNK_SIZE):
+            yield content[i:i + STREAM_CHUNK_SIZE]
+
+
+def _endpoint(url: str, prefix: str) -> str:
+    path = unquote(urlparse(url).path).lstrip("/")
+    return path[len(prefix):] if prefix and path.startswith(prefix) else path
+
+
+class ReplayTransport(BaseTransport):
+    # Serves the responses of a FixtureStore without any network, a missing one is answered like the API does with
+    # a 404. Given a transport to record from, requests are sent through it instead and the successful responses
+    # saved. latency is added to every request to simulate a round trip, prefix is the path of api_base_url if any
+    def __init__(self, store: FixtureStore or str, record: Optional[BaseTransport] = None, latency: float = 0.0,
+                 prefix: str = "") -> None:
+        self.store = FixtureStore(store) if isinstance(store, str) else store
+        self.record = record
+        self.latency = latency
+        self.prefix = prefix
+        self.requests = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(store={self.store!r}, record={self.record is not None})"
+
+    def get(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+            timeout: Optional[float] = None) -> Response:
+        self.requests += 1
+        endpoint = _endpoint(url, self.prefix)
+        if self.record is not None:
+            response = self.record.get(url, params, headers, timeout)
+            if response.status == 200:
+                self.store.save(endpoint, response.content, params)
+            return response
+        if self.latency:
+            time.sleep(self.latency)
+        return self.store.respond(endpoint, params, headers)
+
+    def stream(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+               timeout: Optional[float] = None) -> StreamedResponse:
+        return _BufferedStream(self.get(url, params, headers, timeout))
+
+    def close(self) -> None:
+        if self.record is not None:
+            self.record.close()
+
+
+class AsyncReplayTransport(AsyncBaseTransport):
+    # ReplayTransport for AsyncRoyaleAPIClient, records from an async transport
+    def __init__(self, store: FixtureStore or str, record: Optional[AsyncBaseTransport] = None, latency: float = 0.0,
+                 prefix: str = "") -> None:
+        self.store = FixtureStore(store) if isinstance(store, str) else store
+        self.record = record
+        self.latency = latency
+        self.prefix = prefix
+        self.requests = 0
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(store={self.store!r}, record={self.record is not None})"
+
+    async def get(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+                  timeout: Optional[float] = None) -> Response:
+        self.requests += 1
+        endpoint = _endpoint(url, self.prefix)
+        if self.record is not None:
+            response = await self.record.get(url, params, headers, timeout)
+            if response.status == 200:
+                self.store.save(endpoint, response.content, params)
+            return response
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.store.respond(endpoint, params, headers)
+
+    def stream(self, url: str, params: Dict[str, Any], headers: Mapping[str, str],
+               timeout: Optional[float] = None) -> AsyncStreamedResponse:
+        return _AsyncBufferedStream(lambda: self.get(url, params, headers, timeout))
+
+    async def close(self) -> None:
+        if self.record is not None:
+            await self.record.close()
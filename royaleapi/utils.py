@@ -1,51 +1,223 @@
+import codecs
+import heapq
+import json
 import re
+import sys
+import threading
 import time
 from collections import OrderedDict
-from statistics import mean
-from typing import List, Tuple, Generator, Any, Optional, TYPE_CHECKING
+from itertools import count
+from statistics import StatisticsError
+from typing import List, Tuple, Dict, Generator, Iterable, Callable, Any, Optional, TYPE_CHECKING
 
 from royaleapi.constants import VALID_TAG_CHARS
 from royaleapi.error import InvalidTag
 
+try:
+    import orjson
+except ImportError:  # Optional dependency, the fastest JSON decoder
+    orjson = None
+try:
+    import ujson
+except ImportError:  # Optional dependency, used if orjson is not installed
+    ujson = None
+try:
+    import brotli
+except ImportError:  # Optional dependency, requests and aiohttp can only decode brotli responses with it
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
 if TYPE_CHECKING:
     from royaleapi.models import Card
 
 FIRST_CAP_REGEX = re.compile("(.)([A-Z][a-z]+)")
 ALL_CAP_REGEX = re.compile("([a-z0-9])([A-Z])")
+SNAKE_CASE_CACHE_SIZE = 4096  # Stops unexpected keys from growing the table forever
+
+_snake_case_names: Dict[str, str] = {}
 
 
-def camel_to_snake(string) -> str:
+def _camel_to_snake(string: str) -> str:
     return ALL_CAP_REGEX.sub(r"\1_\2", FIRST_CAP_REGEX.sub(r"\1_\2", string)).lower()
 
 
+def camel_to_snake(string: str) -> str:
+    # The regexes only run the first time a key is seen
+    try:
+        return _snake_case_names[string]
+    except KeyError:
+        snake = sys.intern(_camel_to_snake(string))
+        if len(_snake_case_names) < SNAKE_CASE_CACHE_SIZE:
+            _snake_case_names[sys.intern(string)] = snake
+        return snake
+
+
+def snake_to_camel(string: str) -> str:
+    first, *rest = string.split("_")
+    return first + "".join(word.capitalize() for word in rest)
+
+
+def add_snake_case_names(strings: Iterable[str]) -> None:
+    # Fills the camel_to_snake table ahead of time, the results are the same as the regexes would give
+    for string in strings:
+        camel_to_snake(string)
+
+
+def _get_json_loads() -> Callable[[bytes], Any]:
+    # Every decoder here parses bytes directly and raises a ValueError subclass on invalid JSON
+    if orjson is not None:
+        return orjson.loads
+    if ujson is not None:
+        return ujson.loads
+    return json.loads  # Also accepts bytes, and raises UnicodeDecodeError on invalid UTF-8
+
+
+json_loads = _get_json_loads()
+
+# Content encodings the HTTP libraries can decode, the smallest one first
+ACCEPT_ENCODING = "br, gzip" if brotli is not None else "gzip"
+
+_json_decoder = json.JSONDecoder()
+_WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+
+
+class JSONArrayParser:
+    # Push parser for a JSON array received in chunks, feed() returns the elements completed by each chunk so that
+    # only one element has to be held in memory. A body that is not an array (an error) is decoded whole by close()
+    _START, _FIRST, _ELEMENT, _NEXT, _END = range(5)
+
+    def __init__(self, loads: Callable[[bytes], Any] = json_loads) -> None:
+        self.loads = loads
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = self._START
+        self._is_array = None
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        self._buffer += self._text_decoder.decode(chunk)
+        return self._elements(final=False) if self._is_array is not False else []
+
+    def close(self) -> List[Any]:
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        if self._is_array is False:
+            data = self.loads(self._buffer.encode("utf-8"))
+            return data if isinstance(data, list) else [data]
+        elements = self._elements(final=True)
+        if self._state != self._END:
+            raise ValueError("Truncated JSON array")
+        return elements
+
+    def _elements(self, final: bool) -> List[Any]:
+        elements = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            pos = _WHITESPACE_REGEX.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self._state == self._START:
+                self._is_array = char == "["
+                if not self._is_array:
+                    return []  # The whole buffer is kept for close()
+                self._state = self._FIRST
+                pos += 1
+            elif self._state == self._NEXT or self._state == self._FIRST and char == "]":
+                if char not in ",]":
+                    raise ValueError(f"Expecting ',' delimiter at position {pos}")
+                self._state = self._ELEMENT if char == "," else self._END
+                pos += 1
+            elif self._state == self._END:
+                raise ValueError(f"Extra data at position {pos}")
+            else:
+                try:
+                    element, end = _json_decoder.raw_decode(buffer, pos)
+                except ValueError:
+                    if final:
+                        raise
+                    break  # The element is not complete yet
+                if not final and not isinstance(element, (dict, list, str)):
+                    # A number can go on in the next chunk, also after the part decoded so far as in "2." or "1e",
+                    # so it is only complete once a delimiter follows
+                    delimiter = _WHITESPACE_REGEX.match(buffer, end).end()
+                    if delimiter == len(buffer) or buffer[delimiter] not in ",]":
+                        break
+                elements.append(element)
+                self._state = self._NEXT
+                pos = end
+        self._buffer = buffer[pos:]
+        return elements
+
+
 def is_iterable(obj: Any) -> bool:
     return isinstance(obj, (list, tuple, dict, set, Generator))
 
 
 def validate_tag(tag: str) -> str:
+    if not isinstance(tag, str):
+        raise InvalidTag
     tag = tag.lstrip("#").upper().replace("O", "0")
-    if not isinstance(tag, str) or tag == "" or len(tag) < 3 or any([c for c in tag if c not in VALID_TAG_CHARS]):
+    if tag == "" or len(tag) < 3 or any([c for c in tag if c not in VALID_TAG_CHARS]):
         raise InvalidTag
     return tag
 
 
 def average_elixir(cards: List["Card"]) -> float:
-    return float(mean([c.elixir for c in cards]))
+    if not cards:  # Raised like statistics.mean did
+        raise StatisticsError("average_elixir requires at least one card")
+    return sum([c.elixir for c in cards]) / len(cards)  # As exact as statistics.mean for ints, many times faster
 
 
 class ExpiringDict(OrderedDict):
-    # Users should purge the dict themselves if they access client cache or use this dict for other purposes
+    # Entries are kept in least recently used order, expired entries are dropped lazily when read
+    # and purge() only pops the entries that have expired from a heap ordered by expiry time.
+    # Reads change the order, so every method holds a lock and it can be shared between threads
     def __init__(self, *args: Any, timeout: int = 300, capacity: Optional[int] = None, **kwargs: Any) -> None:
         assert timeout > 0 and (isinstance(capacity, int) or capacity is None)
-        super().__init__(*args, **kwargs)
         self.timeout = timeout
         self.capacity = capacity
+        self._expiry_heap = []  # (expiry time, insertion counter, key), may hold entries that were overwritten
+        self._counter = count()
+        self._lock = threading.RLock()
+        self.evictions = 0  # Entries dropped because they expired or the capacity was reached
+        super().__init__(*args, **kwargs)
 
     def __getitem__(self, key: Any) -> Any:
-        return super().__getitem__(key)[0]
+        with self._lock:
+            value, expiry_time = super().__getitem__(key)
+            if expiry_time <= time.monotonic():
+                super().__delitem__(key)
+                self.evictions += 1
+                raise KeyError(key)
+            self.move_to_end(key)
+            return value
 
     def __setitem__(self, key: Any, value: Any) -> None:
-        super().__setitem__(key, (value, time.time()))
+        self.set(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            super().__delitem__(key)
+
+    def __contains__(self, key: Any) -> bool:
+        try:
+            return super().__getitem__(key)[1] > time.monotonic()  # A single lookup, which is atomic
+        except KeyError:
+            return False
+
+    def set(self, key: Any, value: Any, timeout: Optional[int] = None) -> None:
+        expiry_time = time.monotonic() + (timeout or self.timeout)
+        with self._lock:
+            super().__setitem__(key, (value, expiry_time))
+            self.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (expiry_time, next(self._counter), key))
+            if self.capacity and len(self) > self.capacity:
+                super().__delitem__(next(iter(self)))
+                self.evictions += 1
+            if len(self._expiry_heap) > 2 * len(self) + 64:
+                self._rebuild_expiry_heap()
 
     def get(self, key: Any, default: Optional[Any] = None) -> Any:
         try:
@@ -54,20 +226,34 @@ class ExpiringDict(OrderedDict):
             return default
 
     def items(self) -> Generator[Tuple[Any, Any], None, None]:
-        return ((k, v) for k, (v, _) in super().items())
+        with self._lock:  # A snapshot, other threads may change the dict while the caller iterates
+            items = list(super().items())
+        return ((k, v) for k, (v, _) in items)
 
     def values(self) -> Generator[Any, None, None]:
-        return (v for v, _ in super().values())
+        return (v for _, v in self.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._expiry_heap = []
 
     def purge(self) -> None:
-        if self.capacity:
-            overflowing = max(0, len(self) - self.capacity)
-            for _ in range(overflowing):
-                self.popitem(last=False)
-        limit = time.time() - self.timeout
-        to_del = []
-        for key, (_, set_time) in super().items():
-            if set_time <= limit:
-                to_del.append(key)
-        for key in to_del:
-            del self[key]
+        heap = self._expiry_heap
+        now = time.monotonic()
+        if not heap or heap[0][0] > now:  # Nothing has expired, no need to wait for the lock
+            return
+        with self._lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= now:
+                expiry_time, _, key = heapq.heappop(heap)
+                try:
+                    if super().__getitem__(key)[1] == expiry_time:  # Skip keys that were set again since
+                        super().__delitem__(key)
+                        self.evictions += 1
+                except KeyError:
+                    pass
+
+    def _rebuild_expiry_heap(self) -> None:
+        self._expiry_heap = [(expiry_time, next(self._counter), k) for k, (_, expiry_time) in super().items()]
+        heapq.heapify(self._expiry_heap)
@@ -7,7 +7,7 @@ setup(
     name="clashroyaleapi",
     python_requies=">=3.6",
     version="0.2.2",
-    description="A sync Python 3.6+ wrapper for RoyaleAPI.",
+    description="A sync and async Python 3.6+ wrapper for RoyaleAPI.",
     long_description=long_description,
     long_description_content_type="text/markdown",
     classifiers=[
@@ -25,11 +25,16 @@ setup(
     author="Tr-Jono",
     author_email="omgthisissouseless@gmail.com",
     license="GNU General Public License v3.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=("benchmarks", "benchmarks.*")),
     install_requires=[
         "dataclasses; python_version<'3.7'",
         "requests"
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "columnar": ["numpy", "pyarrow"],
+        "speedups": ["orjson", "brotli"]
+    },
     include_package_data=True,
     zip_safe=False
 )
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks import fixtures
+from royaleapi import AsyncRoyaleAPIClient, RoyaleAPIClient
+from royaleapi.bulk import split_valid
+from royaleapi.error import InvalidTag, NotFound
+from royaleapi.transport import AsyncBaseTransport, BaseTransport, Response, _endpoint
+
+TAGS = [fixtures.tag(n) for n in range(10)]
+MISSING = TAGS[3]
+GIVEN = TAGS[:5] + ["#!!", 12345, None] + TAGS[5:]  # The invalid ones are never requested
+BATCH_SIZE = 4
+
+
+class MissingPlayerTransport(BaseTransport):
+    # Like the API, a batch holding a tag that does not exist fails whole with a 404
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, params, headers, timeout=None):
+        tags = _endpoint(url, "").split("/")[1].split(",")
+        self.requested.append(tags)
+        if MISSING in tags:
+            body = json.dumps({"error": True, "status": 404, "message": "Not found"}).encode()
+            return Response(404, {"Content-Type": "application/json"}, body)
+        data = [{"tag": tag, "name": f"Player {tag}"} for tag in tags]
+        data = data[0] if len(tags) == 1 else data
+        return Response(200, {"Content-Type": "application/json"}, json.dumps(data).encode())
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+class AsyncMissingPlayerTransport(AsyncBaseTransport):
+    def __init__(self):
+        self.sync = MissingPlayerTransport()
+
+    async def get(self, url, params, headers, timeout=None):
+        return self.sync.get(url, params, headers, timeout)
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+def check_results(results):
+    assert len(results) == len(GIVEN)
+    by_tag = {repr(result.tag): result for result in results}
+    for tag in GIVEN:
+        result = by_tag[repr(tag)]
+        if tag == MISSING:
+            assert isinstance(result.error, NotFound) and result.result is None
+        elif tag in TAGS:
+            assert result.error is None and result.result.tag == tag
+        else:
+            assert isinstance(result.error, InvalidTag) and result.result is None
+
+
+def test_one_bad_tag_does_not_fail_the_batch():
+    transport = MissingPlayerTransport()
+    client = RoyaleAPIClient("key", max_tags_per_request=BATCH_SIZE, transport=transport)
+    check_results(list(client.get_players_many(GIVEN, use_cache=False, concurrency=1)))
+    assert [MISSING] in transport.requested  # Its batch was requested again tag by tag
+    assert all(tag in TAGS for tags in transport.requested for tag in tags)
+
+
+def test_one_bad_tag_does_not_fail_the_batch_async():
+    async def main():
+        transport = AsyncMissingPlayerTransport()
+        client = AsyncRoyaleAPIClient("key", max_tags_per_request=BATCH_SIZE, transport=transport)
+        results = [result async for result in client.get_players_many(GIVEN, use_cache=False, concurrency=1)]
+        await client.close()
+        return results
+
+    check_results(asyncio.run(main()))
+
+
+@pytest.mark.parametrize("tag", [None, 12345, b"2PP", ["2PP"]])
+def test_split_valid_reports_non_str_tags_as_invalid(tag):
+    given, valid, invalid = split_valid(["2PP", tag])
+    assert given == ["2PP"] and valid == ["2PP"]
+    assert len(invalid) == 1 and invalid[0].tag is tag and isinstance(invalid[0].error, InvalidTag)
@@ -0,0 +1,49 @@
+import re
+
+from royaleapi.cache import NetworkCache
+
+
+def glob_to_regex(pattern):
+    # Redis glob: * and ? are wildcards, a backslash escapes the next character
+    parts, chars = [], iter(pattern)
+    for char in chars:
+        if char == "\\":
+            parts.append(re.escape(next(chars)))
+        else:
+            parts.append({"*": ".*", "?": "."}.get(char, re.escape(char)))
+    return re.compile("".join(parts) + r"\Z")
+
+
+class DictStore:
+    # Enough of the redis-py client for NetworkCache, expiry left out
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*"):
+        regex = glob_to_regex(match)
+        return [key for key in list(self.data) if regex.match(key)]
+
+
+def test_network_cache_clear_only_deletes_its_namespace():
+    store = DictStore()
+    dynamic, constants = NetworkCache("dynamic", client=store), NetworkCache("constants", client=store)
+    other = NetworkCache("dynamic", client=store, prefix="other[1]")
+    for i in range(1200):  # More than one batch of deletes
+        dynamic[f"p{i}"] = {"tag": i}
+    constants["cards"] = [1, 2]
+    other["p0"] = {"tag": 0}
+    dynamic.clear()
+    assert "p0" not in dynamic and "p1199" not in dynamic
+    assert constants["cards"] == [1, 2] and other["p0"] == {"tag": 0}
+    other.clear()
+    assert "p0" not in other and "cards" in constants
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from benchmarks import fixtures
+from royaleapi import RoyaleAPIClient
+from royaleapi.client import BaseRoyaleAPIClient
+from royaleapi.transport import BaseTransport, Response, _endpoint
+
+
+def test_incomplete_client_fails_when_created():
+    class NoTransport(BaseRoyaleAPIClient):
+        def _refresh_in_background(self, key, refresh):
+            pass
+
+    with pytest.raises(TypeError, match="_create_transport"):
+        NoTransport("key")
+
+
+def test_client_without_background_refresh_fails_when_created():
+    class NoRefresh(BaseRoyaleAPIClient):
+        def _create_transport(self):
+            pass
+
+    with pytest.raises(TypeError, match="_refresh_in_background"):
+        NoRefresh("key")
+
+
+class PlayersTransport(BaseTransport):
+    # Answers every player request and records the tags of each one
+    def __init__(self):
+        self.requested = []
+
+    def get(self, url, params, headers, timeout=None):
+        tags = _endpoint(url, "").split("/")[1].split(",")
+        self.requested.append(tags)
+        data = [{"tag": tag, "name": f"Player {tag}"} for tag in tags]
+        data = data[0] if len(tags) == 1 else data
+        return Response(200, {"Content-Type": "application/json"}, json.dumps(data).encode())
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+def test_partial_cache_hit_only_requests_missing_tags():
+    a, b, c, d = (fixtures.tag(n) for n in range(4))
+    transport = PlayersTransport()
+    client = RoyaleAPIClient("key", use_cache=True, transport=transport)
+    client.get_player([c, a])
+    transport.requested.clear()
+
+    players = client.get_player([b, a, d, b, c, a])
+    assert [player.tag for player in players] == [b, a, d, b, c, a]
+    assert transport.requested == [[b, d]]  # Once each, in the order first given
+    assert [player.tag for player in client.get_player([d, c, b])] == [d, c, b]
+    assert transport.requested == [[b, d]]
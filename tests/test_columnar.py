@@ -0,0 +1,40 @@
+import pytest
+
+from benchmarks import fixtures
+from royaleapi import columnar
+from royaleapi.columnar import BATTLE_DTYPE, DECK_SIZE, TEAM_SIZE, BattleColumns
+
+
+@pytest.mark.skipif(columnar.pyarrow is not None, reason="pyarrow is installed")
+def test_to_parquet_without_pyarrow_raises_import_error(tmp_path):
+    with pytest.raises(ImportError, match="pyarrow is required"):
+        BattleColumns().to_parquet(str(tmp_path / "battles.parquet"))
+
+
+def test_to_numpy_matches_source_battles():
+    numpy = pytest.importorskip("numpy")
+    battles = fixtures.battle_log(5)
+    battles.append(dict(fixtures.battle(5), type="clanMate2v2", teamSize=2, winner=0, mode={"name": "2v2"},
+                        team=[fixtures.battle_player(20), fixtures.battle_player(21)],
+                        opponent=[fixtures.battle_player(22), fixtures.battle_player(23)]))
+    array = BattleColumns(battles).to_numpy()
+    assert array.dtype == numpy.dtype(BATTLE_DTYPE) and len(array) == len(battles)
+    assert array["team_cards"].dtype == numpy.int32
+    assert array["team_cards"].shape == (len(battles), TEAM_SIZE, DECK_SIZE)
+
+    def side(players):  # Padded to TEAM_SIZE players like the array
+        padding = TEAM_SIZE - len(players)
+        tags = [player["tag"] for player in players] + [""] * padding
+        decks = [[card["id"] for card in player["deck"]] for player in players] + [[0] * DECK_SIZE] * padding
+        return tags, decks
+
+    for row, battle in zip(array, battles):
+        assert row["utc_time"] == battle["utcTime"] and row["battle_type"] == battle["type"]
+        assert row["mode"] == battle["mode"]["name"] and row["team_size"] == battle["teamSize"]
+        assert row["result"] == battle["winner"]
+        assert (row["team_crowns"], row["opponent_crowns"]) == (battle["teamCrowns"], battle["opponentCrowns"])
+        assert row["team_trophy_change"] == battle["team"][0]["trophyChange"]
+        assert row["opponent_trophy_change"] == battle["opponent"][0]["trophyChange"]
+        for prefix, players in (("team", battle["team"]), ("opponent", battle["opponent"])):
+            tags, decks = side(players)
+            assert row[f"{prefix}_tags"].tolist() == tags and row[f"{prefix}_cards"].tolist() == decks
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from royaleapi import RoyaleAPIClient, utils
+from royaleapi.constants import VALIDATORS_TIMEOUT_FACTOR
+from royaleapi.metrics import Metrics
+from royaleapi.transport import BaseTransport, Response
+
+TAG = "2PP"
+CACHE_TIME = 60
+ETAG = '"v1"'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+class ETagTransport(BaseTransport):
+    # Sends the player once, then 304 with an empty body to every request for the same version of it
+    def __init__(self):
+        self.conditional = []  # If-None-Match of each request
+
+    def get(self, url, params, headers, timeout=None):
+        self.conditional.append(headers.get("If-None-Match"))
+        if headers.get("If-None-Match") == ETAG:
+            return Response(304, {"ETag": ETAG}, b"")
+        body = json.dumps({"tag": TAG, "name": "Player"}).encode()
+        return Response(200, {"Content-Type": "application/json", "ETag": ETAG}, body)
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(utils, "time", clock)  # The clock of the cache and validators
+    return clock
+
+
+def test_not_modified_reuses_payload_and_refreshes_validators(clock):
+    transport, metrics = ETagTransport(), Metrics()
+    client = RoyaleAPIClient("key", use_cache=True, dynamic_cache_time=CACHE_TIME, metrics=metrics,
+                             transport=transport)
+    expected = client.get_player(TAG).to_dict()
+    payload = client._validators["dynamic"][f"p{TAG}"][2]
+
+    clock.now += CACHE_TIME + 1  # The cached response has expired, its ETag has not
+    assert client.get_player(TAG).to_dict() == expected
+    assert client._fetch_from_cache(f"p{TAG}") is payload  # Cached again without parsing anything
+    assert transport.conditional == [None, ETAG]
+
+    # Past the timeout of the first ETag, the 304 response has kept it for another full timeout
+    clock.now += CACHE_TIME * VALIDATORS_TIMEOUT_FACTOR - CACHE_TIME
+    assert client.get_player(TAG).to_dict() == expected
+    assert transport.conditional == [None, ETAG, ETAG]
+
+    stats = metrics.stats()["endpoints"]["player/{}"]
+    assert stats["requests"] == 3 and stats["not_modified"] == 2 and not stats["errors"]
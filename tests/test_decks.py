@@ -0,0 +1,28 @@
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from royaleapi.decks import CardIndex, DeckSet  # noqa: E402
+
+DECK = [26000000 + i for i in range(8)]
+
+
+def test_deck_sets_sharing_a_growing_index_stay_comparable():
+    index = CardIndex()
+    first = DeckSet([DECK], index)
+    new_cards = [[26000100 + 8 * n + i for i in range(8)] for n in range(20)]  # 160 more cards, a third word
+    later = DeckSet(new_cards + [DECK[::-1]], index)
+    assert first.bits.shape[1] == later.bits.shape[1]
+    assert later.similarity(first.bits[0])[-1] == 1.0
+    assert first.shared_cards(later.bits[-1])[0] == 8
+
+
+def test_bits_of_another_width_are_rejected():
+    deck_set = DeckSet([DECK], CardIndex(capacity=64))
+    with pytest.raises(ValueError):
+        deck_set.similarity(DeckSet([DECK]).bits[0])
+
+
+def test_full_index_raises():
+    with pytest.raises(ValueError):
+        DeckSet([DECK], CardIndex(capacity=4))
@@ -0,0 +1,99 @@
+from dataclasses import fields
+
+import pytest
+
+from benchmarks import fixtures
+from royaleapi import RoyaleAPIClient, models
+from royaleapi.models import CRObject
+from royaleapi.models.base import USE_SLOTS, _Lazy
+from royaleapi.utils import camel_to_snake
+
+WAR_CLAN = {"tag": fixtures.tag(1, 6), "name": "Clan", "badge": fixtures.badge(), "participants": 20,
+            "battlesPlayed": 30, "wins": 15, "crowns": 25, "warTrophies": 2800, "warTrophiesChange": 100}
+WAR_PLAYER = {"tag": fixtures.tag(2), "name": "Player", "cardsEarned": 1200, "battlesPlayed": 1, "wins": 1,
+              "collectionDayBattlesPlayed": 3}
+
+# Model, name of the method building it and the data, together they hold every model of royaleapi.models
+PAYLOADS = [("Player", "de_json", dict(fixtures.player(), popularity={"hits": "120", "hitsPerDayAvg": "4.5"})),
+            ("Player", "de_list", fixtures.leaderboard(20)),
+            ("Clan", "de_json", dict(fixtures.clan(members=10), popularity={"hits": 10, "hitsPerDayAvg": 0.5})),
+            ("Battle", "de_list", fixtures.battle_log(5)),
+            ("Tournament", "de_json", fixtures.tournament(players=5)),
+            ("Deck", "de_json", {"cards": fixtures.deck(0), "decklink": "https://link", "popularity": 12}),
+            # No upcoming chests, to_dict() only takes lists of models
+            ("ChestCycle", "de_json", {"upcoming": [], "megaLightning": 300, "magical": 12, "legendary": 80,
+                                       "epic": 20, "giant": 5}),
+            ("ClanWar", "de_json", {"state": "warDay", "warEndTime": 1550000000, "clan": WAR_CLAN,
+                                    "participants": [WAR_PLAYER], "standings": [WAR_CLAN]}),
+            ("ClanWar", "de_list", [{"createdDate": 1550000000, "seasonNumber": 3, "participants": [WAR_PLAYER],
+                                     "standings": [WAR_CLAN]}]),
+            ("ClanTracking", "de_json", {"tag": fixtures.tag(1, 6), "active": True, "available": True,
+                                         "snapshotCount": 12}),
+            ("ServerStatus", "de_json", {"env": "prod", "serverTime": "now", "serverVersion": "1.0",
+                                         "nodeVersion": "v10", "host": "host", "uptime": 12.5, "uptimeHuman": "12s",
+                                         "freeMemory": "1 GB", "memoryUsage": "2 GB"})]
+
+
+def reflective_deserialize(cls, data, client, aliases=None):
+    # The path the compiled deserializers replaced: rename the keys one by one and call the dataclass __init__
+    aliases = cls._aliases if aliases is None else aliases
+    values = {}
+    for key, value in data.items():
+        name = camel_to_snake(key)
+        name = aliases.get(name, name)
+        if name not in cls._ignored_keys:
+            values[name] = value
+    if "client" in {f.name for f in fields(cls)}:
+        values["client"] = client
+    return cls(**values)
+
+
+def build_all():
+    return [getattr(getattr(models, model), method)(data, None) for model, method, data in PAYLOADS]
+
+
+def model_classes(value, found):
+    if isinstance(value, list):
+        for item in value:
+            model_classes(item, found)
+    elif isinstance(value, CRObject):
+        found.add(value.__class__.__name__)
+        for _, item in value._items():
+            model_classes(item, found)
+    return found
+
+
+def test_payloads_cover_every_model():
+    assert model_classes(build_all(), set()) == set(models.__all__) - {"CRObject"}
+
+
+@pytest.mark.parametrize("model, method, data", PAYLOADS, ids=[f"{m}.{f}" for m, f, _ in PAYLOADS])
+def test_compiled_deserializer_matches_reflective_path(monkeypatch, model, method, data):
+    build = getattr(getattr(models, model), method)
+    compiled = build(data, None)
+    monkeypatch.setattr(CRObject, "_deserialize", classmethod(reflective_deserialize))
+    reflective = build(data, None)
+    compiled, reflective = (objs if method == "de_list" else [objs] for objs in (compiled, reflective))
+    assert [obj.to_dict() for obj in compiled] == [obj.to_dict() for obj in reflective]
+    assert [obj.stringify() for obj in compiled] == [obj.stringify() for obj in reflective]
+    assert repr(compiled) == repr(reflective)
+
+
+@pytest.mark.skipif(USE_SLOTS, reason="slotted models are always built eagerly")
+def test_lazy_fields_are_built_on_first_access():
+    player = models.Player.de_json(fixtures.player(), RoyaleAPIClient("key", lazy_models=True))
+    assert all(player.__dict__[name].__class__ is _Lazy for name in ("clan", "cards", "deck", "stats"))
+    clan = player.clan
+    assert isinstance(clan, models.Clan) and player.__dict__["clan"] is clan and player.clan is clan
+    assert clan.__dict__["badge"].__class__ is _Lazy  # Nested models of a built field are lazy too
+    assert player.__dict__["cards"].__class__ is _Lazy
+
+
+@pytest.mark.parametrize("model, method, data", PAYLOADS, ids=[f"{m}.{f}" for m, f, _ in PAYLOADS])
+def test_lazy_models_match_eager_models(model, method, data):
+    def serialize(serializer, lazy_models):  # Every serializer gets objects whose lazy fields are not built yet
+        objs = getattr(getattr(models, model), method)(data, RoyaleAPIClient("key", lazy_models=lazy_models))
+        return [serializer(obj) for obj in (objs if method == "de_list" else [objs])]
+
+    for serializer in (CRObject.to_dict, CRObject.stringify, repr):
+        assert serialize(serializer, True) == serialize(serializer, False)
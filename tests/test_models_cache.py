@@ -0,0 +1,39 @@
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from benchmarks import fixtures
+from royaleapi import RoyaleAPIClient
+from royaleapi.transport import FixtureStore, ReplayTransport
+
+TAG = fixtures.tag(1)
+
+
+def make_client(tmp_path, cache_models=True, **kwargs):
+    store = FixtureStore(str(tmp_path))
+    store.save(f"player/{TAG}", dict(fixtures.player(), tag=TAG))
+    return RoyaleAPIClient("key", use_cache=True, cache_models=cache_models, transport=ReplayTransport(store), **kwargs)
+
+
+@pytest.mark.parametrize("lazy_models", [False, True])
+def test_cached_models_reject_mutation(tmp_path, lazy_models):
+    client = make_client(tmp_path, lazy_models=lazy_models)
+    player = client.get_player(TAG)
+    expected = player.to_dict()
+    assert client.get_player(TAG) is player
+    with pytest.raises(FrozenInstanceError):
+        player.name = "Changed"
+    with pytest.raises(FrozenInstanceError):
+        del player.trophies
+    with pytest.raises(FrozenInstanceError):
+        player.clan.name = "Changed"  # Also once built on first access with lazy_models
+    with pytest.raises(FrozenInstanceError):
+        player.cards[0].level = 1
+    assert client.get_player(TAG).to_dict() == expected
+
+
+def test_models_are_mutable_without_cache_models(tmp_path):
+    client = make_client(tmp_path, cache_models=False)
+    player = client.get_player(TAG)
+    player.name = player.clan.name = "Changed"
+    assert client.get_player(TAG).name != "Changed"
@@ -0,0 +1,113 @@
+import asyncio
+import json
+
+import pytest
+
+from royaleapi import AsyncRoyaleAPIClient, RoyaleAPIClient
+from royaleapi.error import (BadRequest, InternalServerError, NotFound, RequestTimeout, ServerResponseInvalid,
+                             ServerUnderMaintenance, TooManyRequests, Unauthorized)
+from royaleapi.retry import RetryPolicy
+from royaleapi.transport import AsyncBaseTransport, BaseTransport, Response
+
+TAG = "2PP"
+OK = Response(200, {"Content-Type": "application/json"}, json.dumps({"tag": TAG, "name": "Player"}).encode())
+
+
+def error(status, headers=None):
+    body = json.dumps({"error": True, "status": status, "message": f"Error {status}"}).encode()
+    return Response(status, dict(headers or {}, **{"Content-Type": "application/json"}), body)
+
+
+class ScriptedTransport(BaseTransport):
+    # Answers each request with the next response, or raises it if it is an exception
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def get(self, url, params, headers, timeout=None):
+        self.requests += 1
+        response = self.responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+class AsyncScriptedTransport(AsyncBaseTransport):
+    def __init__(self, *responses):
+        self.sync = ScriptedTransport(*responses)
+
+    async def get(self, url, params, headers, timeout=None):
+        return self.sync.get(url, params, headers, timeout)
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+def make_client(transport, **kwargs):
+    attempts = []
+    policy = RetryPolicy(backoff=0, on_attempt=attempts.append, **kwargs)
+    return RoyaleAPIClient("key", retry_policy=policy, transport=transport), attempts
+
+
+def test_retries_until_success():
+    transport = ScriptedTransport(error(503), RequestTimeout("timed out"), OK)
+    client, attempts = make_client(transport)
+    assert client.get_player(TAG, use_cache=False).tag == TAG
+    assert transport.requests == 3
+    assert [type(attempt.error) for attempt in attempts] == [ServerUnderMaintenance, RequestTimeout, type(None)]
+    assert [attempt.attempt for attempt in attempts] == [1, 2, 3]
+
+
+def test_gives_up_after_max_attempts():
+    transport = ScriptedTransport(*[error(500)] * 4)
+    client, attempts = make_client(transport, max_attempts=3)
+    with pytest.raises(InternalServerError):
+        client.get_player(TAG, use_cache=False)
+    assert transport.requests == 3
+    assert attempts[-1].delay is None
+
+
+def test_waits_at_least_retry_after():
+    transport = ScriptedTransport(error(429, {"Retry-After": "0.05"}), OK)
+    client, attempts = make_client(transport)
+    assert client.get_player(TAG, use_cache=False).tag == TAG
+    assert transport.requests == 2
+    assert attempts[0].delay == 0.05
+
+
+def test_does_not_retry_past_deadline():
+    transport = ScriptedTransport(error(429, {"Retry-After": "60"}), OK)
+    client, attempts = make_client(transport, deadline=1)
+    with pytest.raises(TooManyRequests) as e:
+        client.get_player(TAG, use_cache=False)
+    assert e.value.retry_after == 60
+    assert transport.requests == 1 and attempts[0].delay is None
+
+
+@pytest.mark.parametrize("response, exception", [(error(400), BadRequest), (error(401), Unauthorized),
+                                                 (error(404), NotFound),
+                                                 (Response(200, {}, b"<html>"), ServerResponseInvalid)])
+def test_does_not_retry_other_errors(response, exception):
+    transport = ScriptedTransport(response, OK)
+    client, attempts = make_client(transport)
+    with pytest.raises(exception):
+        client.get_player(TAG, use_cache=False)
+    assert transport.requests == 1 and len(attempts) == 1
+
+
+def test_retries_async():
+    async def main():
+        transport = AsyncScriptedTransport(error(503), error(404))
+        attempts = []
+        client = AsyncRoyaleAPIClient("key", retry_policy=RetryPolicy(backoff=0, on_attempt=attempts.append),
+                                      transport=transport)
+        with pytest.raises(NotFound):
+            await client.get_player(TAG, use_cache=False)
+        await client.close()
+        assert transport.sync.requests == 2
+        assert [type(attempt.error) for attempt in attempts] == [ServerUnderMaintenance, NotFound]
+
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from royaleapi import AsyncRoyaleAPIClient, RoyaleAPIClient
+from royaleapi.error import ServerResponseInvalid
+from royaleapi.transport import AsyncBaseTransport, BaseTransport, Response
+
+TAGS = ["2PP", "8QQ"]
+SHORT_BATCH = Response(200, {"Content-Type": "application/json"}, b'[{"tag": "2PP"}]')  # One player for two tags
+
+
+class ShortBatchTransport(BaseTransport):
+    def get(self, url, params, headers, timeout=None):
+        return SHORT_BATCH
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+class AsyncShortBatchTransport(AsyncBaseTransport):
+    async def get(self, url, params, headers, timeout=None):
+        return SHORT_BATCH
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+def test_short_batch_response_fails_every_key():
+    client = RoyaleAPIClient("key", use_cache=True, transport=ShortBatchTransport())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        for _ in range(2):  # The second lookup would wait on the key left in flight by the first one
+            with pytest.raises(ServerResponseInvalid):
+                executor.submit(client.get_player, TAGS).result(timeout=5)
+    assert not client._in_flight
+
+
+def test_short_batch_response_fails_every_key_async():
+    async def main():
+        client = AsyncRoyaleAPIClient("key", use_cache=True, transport=AsyncShortBatchTransport())
+        for _ in range(2):
+            with pytest.raises(ServerResponseInvalid):
+                await asyncio.wait_for(client.get_player(TAGS), timeout=5)
+        assert not client._in_flight
+        await client.close()
+
+    asyncio.run(main())
+
+
+def test_short_fetch_resolves_every_owned_key():
+    client = RoyaleAPIClient("key")
+    with pytest.raises(ServerResponseInvalid):
+        client._single_flight(["a", "b"], lambda owned: [{}])
+    assert not client._in_flight
+    assert client._single_flight(["a", "b"], lambda owned: [1, 2]) == [1, 2]
+
+
+def test_short_fetch_resolves_every_owned_key_async():
+    async def fetch(owned):
+        return [{}]
+
+    async def main():
+        client = AsyncRoyaleAPIClient("key")
+        with pytest.raises(ServerResponseInvalid):
+            await asyncio.wait_for(client._single_flight(["a", "b"], fetch), timeout=5)
+        assert not client._in_flight
+        await client.close()
+
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+import threading
+
+from benchmarks import fixtures
+from royaleapi import RoyaleAPIClient
+from royaleapi.metrics import Metrics
+from royaleapi.ratelimit import RateLimiter
+from royaleapi.transport import FixtureStore, ReplayTransport
+from royaleapi.utils import ExpiringDict
+
+THREADS = 8
+
+
+def run_threads(work):
+    # Starts work(n) in every thread at once and raises the first exception of any of them
+    barrier, errors = threading.Barrier(THREADS), []
+
+    def target(n):
+        barrier.wait()
+        try:
+            work(n)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=target, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def test_expiring_dict_counts_every_eviction():
+    d = ExpiringDict(timeout=3600, capacity=100)
+
+    def work(n):
+        for i in range(1000):
+            d[(n, i)] = i
+            d.get((n, i - 1))
+
+    run_threads(work)
+    assert len(d) == 100
+    assert d.evictions == THREADS * 1000 - 100
+    assert {key for _, _, key in d._expiry_heap} >= set(dict.keys(d))  # Every entry can still be purged
+
+
+def test_rate_limiter_hands_out_every_token_once():
+    limiter = RateLimiter(rate=0.001, burst=10)  # Refills too slowly to matter during the test
+    delays, lock = [], threading.Lock()
+
+    def work(n):
+        taken = [limiter.reserve() for _ in range(100)]
+        with lock:
+            delays.extend(taken)
+
+    run_threads(work)
+    # The n-th token is due (n - burst) / rate seconds from now, a lost update would hand one out twice
+    assert sorted(round(delay * limiter.rate) for delay in delays) == [0] * 10 + list(range(1, THREADS * 100 - 9))
+
+
+def test_shared_client(tmp_path):
+    tags = [fixtures.tag(n) for n in range(12)]
+    store = FixtureStore(str(tmp_path))
+    for tag in tags:
+        store.save(f"player/{tag}", dict(fixtures.player(), tag=tag))
+    metrics = Metrics()
+    client = RoyaleAPIClient("key", use_cache=True, thread_safe=True, metrics=metrics,
+                             transport=ReplayTransport(store, latency=0.01))
+
+    def work(n):
+        for i in range(20):
+            requested = [tags[(n + i + j) % len(tags)] for j in range(1 + (n + i) % 5)]
+            players = client.get_player(requested)
+            assert [player.tag for player in players] == requested
+
+    run_threads(work)
+    stats = metrics.stats()
+    # Concurrent lookups of a tag share one request and the later ones are cache hits, so no tag is fetched twice
+    assert 1 <= sum(endpoint["requests"] for endpoint in stats["endpoints"].values()) <= len(tags)
+    assert not any(endpoint["errors"] for endpoint in stats["endpoints"].values())
+    cache = stats["cache"]["dynamic"]
+    assert cache["misses"] >= len(tags)
+    assert cache["hits"] + cache["misses"] >= sum(1 + (n + i) % 5 for n in range(THREADS) for i in range(20))
+    assert not client._in_flight
+    client.close()
@@ -0,0 +1,59 @@
+import json
+import os
+
+from benchmarks import fixtures
+from royaleapi import RoyaleAPIClient
+from royaleapi.transport import BaseTransport, ReplayTransport, Response, _endpoint
+
+TAGS = [fixtures.tag(1), fixtures.tag(2)]
+PLAYERS = {tag: dict(fixtures.player(n), tag=tag) for n, tag in enumerate(TAGS)}
+CLANS = {tag: dict(fixtures.clan(n), tag=tag) for n, tag in enumerate(TAGS)}
+BATTLES = {tag: [fixtures.battle(n)] for n, tag in enumerate(TAGS)}  # As many battles as tags, not to be split
+
+
+class FakeAPI(BaseTransport):
+    # Answers like the API, several tags get a list of objects or, for battle logs, one list of all their battles
+    def __init__(self):
+        self.requests = 0
+
+    def get(self, url, params, headers, timeout=None):
+        self.requests += 1
+        kind, tags, *rest = _endpoint(url, "").split("/")
+        tags = tags.split(",")
+        if rest:
+            data = [battle for tag in tags for battle in BATTLES[tag]]
+        else:
+            data = [(PLAYERS if kind == "player" else CLANS)[tag] for tag in tags]
+            data = data[0] if len(tags) == 1 else data
+        return Response(200, {"Content-Type": "application/json"}, json.dumps(data).encode())
+
+    def stream(self, url, params, headers, timeout=None):
+        raise NotImplementedError
+
+
+def calls(client):
+    return {"players": [player.to_dict() for player in client.get_player(TAGS, use_cache=False)],
+            "clans": [clan.to_dict() for clan in client.get_clan(TAGS, use_cache=False)],
+            "battles": [battle.to_dict() for battle in client.get_player_battles(*TAGS, use_cache=False)]}
+
+
+def test_replays_recorded_responses_to_several_tags(tmp_path):
+    api = FakeAPI()
+    recorded = calls(RoyaleAPIClient("key", transport=ReplayTransport(str(tmp_path), record=api)))
+    assert api.requests == 3
+    assert os.path.exists(os.path.join(str(tmp_path), "player", TAGS[1] + ".json"))  # Split per tag
+    assert os.path.exists(os.path.join(str(tmp_path), "player", ",".join(TAGS), "battle.json"))  # Saved as it is
+
+    replay = ReplayTransport(str(tmp_path))
+    assert calls(RoyaleAPIClient("key", transport=replay)) == recorded
+    assert replay.requests == 3 and api.requests == 3
+    assert len(recorded["battles"]) == sum(len(battles) for battles in BATTLES.values())
+
+
+def test_merges_battle_logs_recorded_per_tag(tmp_path):
+    api = FakeAPI()
+    client = RoyaleAPIClient("key", transport=ReplayTransport(str(tmp_path), record=api))
+    expected = [battle.to_dict() for tag in TAGS for battle in client.get_player_battles(tag, use_cache=False)]
+
+    client = RoyaleAPIClient("key", transport=ReplayTransport(str(tmp_path)))
+    assert [battle.to_dict() for battle in client.get_player_battles(*TAGS, use_cache=False)] == expected
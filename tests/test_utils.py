@@ -0,0 +1,103 @@
+import json
+from statistics import StatisticsError
+
+import pytest
+
+from royaleapi import utils
+from royaleapi.utils import ExpiringDict, JSONArrayParser, average_elixir
+
+PAYLOADS = [b'[2.5]', b'[1e3]', b'[-12.5e-3, 0, 7E+2, 3.25]', b'[true, false, null]',
+            b' [ {"tag": "2PP", "trophies": 5400.5, "deck": [1, 2]} , "caf\xc3\xa9 \xf0\x9f\x91\x91", [], {} ] ',
+            b'[]', b'{"error": true, "status": 404}']
+
+
+def parse(chunks):
+    parser = JSONArrayParser()
+    elements = []
+    for chunk in chunks:
+        elements += parser.feed(chunk)
+    return elements + parser.close()
+
+
+def expected(payload):
+    data = json.loads(payload)
+    return data if isinstance(data, list) else [data]
+
+
+def test_average_elixir_of_no_cards_raises_statistics_error():
+    with pytest.raises(StatisticsError):
+        average_elixir([])
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_json_array_parser_split_at_every_point(payload):
+    for i in range(len(payload) + 1):
+        assert parse([payload[:i], payload[i:]]) == expected(payload), f"split at {i}"
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_json_array_parser_fed_byte_by_byte(payload):
+    assert parse([payload[i:i + 1] for i in range(len(payload))]) == expected(payload)
+
+
+def test_json_array_parser_rejects_truncated_number():
+    with pytest.raises(ValueError):
+        parse([b'[2.', b'5'])
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(utils, "time", clock)
+    return clock
+
+
+def test_expiring_dict_evicts_least_recently_used():
+    d = ExpiringDict(timeout=60, capacity=3)
+    for key in "abc":
+        d[key] = key
+    assert d["a"] == "a"  # Now the most recently used
+    d["d"] = "d"
+    assert list(d.keys()) == ["c", "a", "d"]
+    d["c"] = "c"  # Setting an existing key moves it to the end without evicting anything
+    d["e"] = "e"
+    assert list(d.keys()) == ["d", "c", "e"]
+    assert d.evictions == 2
+
+
+def test_expiring_dict_enforces_capacity():
+    d = ExpiringDict(timeout=60, capacity=10)
+    for i in range(100):
+        d[i] = i
+        assert len(d) == min(i + 1, 10)
+    assert list(d.keys()) == list(range(90, 100))
+    assert d.evictions == 90
+    assert len(d._expiry_heap) <= 2 * len(d) + 64
+
+
+def test_expiring_dict_purges_expired_entries_from_heap(clock):
+    d = ExpiringDict(timeout=60)
+    d["short"] = 1
+    d.set("long", 2, timeout=600)
+    d["refreshed"] = 3
+    clock.now += 30
+    d["refreshed"] = 4  # Its first entry in the heap is stale once it has been set again
+    clock.now += 40
+    assert "short" not in d and "refreshed" in d
+    d.purge()
+    assert list(d.keys()) == ["long", "refreshed"]
+    assert d.evictions == 1
+    clock.now += 600
+    with pytest.raises(KeyError):
+        d["long"]
+    d.purge()
+    assert len(d) == 0 and not d._expiry_heap
+    assert d.evictions == 3